@@ -0,0 +1,11 @@
+"""Throughput benchmarks for doc_pipeline.
+
+- ``benchmarks.corpus`` generates reproducible synthetic corpora (text-layer PDFs,
+  image-only PDFs, DOCX with large tables, mixed Arabic/English documents).
+- ``benchmarks.run_benchmarks`` runs each pipeline stage and the full
+  ``process_all_documents`` over a corpus and compares against a stored baseline.
+"""
+
+from benchmarks.corpus import generate_corpus, load_manifest
+
+__all__ = ["generate_corpus", "load_manifest"]
@@ -0,0 +1,342 @@
+"""Reproducible synthetic corpora for benchmarking doc_pipeline.
+
+The generator writes four kinds of documents into a ``proposals``/``Reports``
+folder layout that ``process_all_documents`` can consume directly:
+
+- ``text_pdf``: PDFs with a text layer, numbered section headers and ruled tables
+- ``scanned_pdf``: the same pages rasterised to images (no text layer)
+- ``docx``: DOCX files with headings, paragraphs and large tables
+- ``mixed_docx`` / ``mixed_pdf``: Arabic and English paragraphs side by side
+
+Every file is listed in ``corpus_manifest.json`` with its kind, page count and the
+pages that contain tables, so benchmarks can compute pages/sec and table
+detection can be scored against ground truth. The same seed and parameters
+always produce the same text, layout and manifest.
+"""
+
+import argparse
+import json
+import pathlib
+import random
+from datetime import datetime
+
+import fitz
+from docx import Document
+
+MANIFEST_NAME = "corpus_manifest.json"
+FIXED_TIMESTAMP = datetime(2024, 1, 1)
+PDF_DATE = "D:20240101000000Z"
+
+DEFAULTS = {
+    "documents": 12,  # Total files, spread across the enabled kinds
+    "pages": 10,  # Pages per PDF
+    "table_rows": 60,  # Rows per DOCX table
+    "table_page_ratio": 0.3,  # Share of PDF pages that carry a ruled table
+    "scan_dpi": 100,  # Render resolution for image-only PDFs
+    "kinds": ("text_pdf", "scanned_pdf", "docx", "mixed_docx", "mixed_pdf"),
+}
+
+# Fonts with Arabic glyphs, tried in order for mixed-language PDFs
+ARABIC_FONT_CANDIDATES = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansArabic-Regular.ttf",
+    "/usr/share/fonts/noto/NotoSansArabic-Regular.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    "C:/Windows/Fonts/tahoma.ttf",
+)
+
+SECTION_TITLES = (
+    "Executive Summary",
+    "Project Overview",
+    "Scope of Work",
+    "Methodology",
+    "Hydrological Analysis",
+    "Structural Assessment",
+    "Deliverables",
+    "Timeline",
+    "Financial Proposal",
+    "Conclusion",
+)
+
+ENGLISH_WORDS = (
+    "the", "project", "drainage", "catchment", "rainfall", "design", "storm",
+    "culvert", "survey", "analysis", "peak", "discharge", "model", "report",
+    "contractor", "client", "schedule", "review", "structure", "concrete",
+    "channel", "flood", "return", "period", "hydraulic", "capacity", "road",
+    "bridge", "foundation", "soil", "investigation", "approval", "phase", "data",
+)
+
+ARABIC_WORDS = (
+    "المشروع", "تصريف", "الأمطار", "التصميم", "السيول", "تحليل", "الدراسة",
+    "المقاول", "العميل", "الجدول", "الزمني", "المراجعة", "الخرسانة", "القناة",
+    "الفيضان", "الطريق", "الجسر", "التربة", "المرحلة", "البيانات", "التقرير",
+)
+
+TABLE_HEADERS = ("Item", "Description", "Quantity", "Unit", "Rate")
+
+PAGE_WIDTH, PAGE_HEIGHT = fitz.paper_size("a4")
+MARGIN = 56
+LINE_HEIGHT = 14
+
+
+def find_arabic_font():
+    """Return the first font file on this machine that can render Arabic, or None."""
+    for candidate in ARABIC_FONT_CANDIDATES:
+        if pathlib.Path(candidate).is_file():
+            return candidate
+    return None
+
+
+def _sentence(rng, words, min_words=8, max_words=16):
+    count = rng.randint(min_words, max_words)
+    text = " ".join(rng.choice(words) for _ in range(count))
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng, words, sentences=3):
+    return " ".join(_sentence(rng, words) for _ in range(sentences))
+
+
+def _table_rows(rng, rows):
+    data = []
+    for index in range(1, rows + 1):
+        data.append(
+            (
+                str(index),
+                " ".join(rng.choice(ENGLISH_WORDS) for _ in range(3)),
+                str(rng.randint(1, 500)),
+                rng.choice(("m", "m2", "m3", "ton", "LS")),
+                f"{rng.uniform(10, 5000):.2f}",
+            )
+        )
+    return data
+
+
+def _pick_table_pages(rng, pages, ratio):
+    count = max(1, round(pages * ratio)) if pages else 0
+    return sorted(rng.sample(range(1, pages + 1), min(count, pages)))
+
+
+def _wrap(text, max_chars=90):
+    lines, current = [], ""
+    for word in text.split():
+        if current and len(current) + len(word) + 1 > max_chars:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}".strip()
+    if current:
+        lines.append(current)
+    return lines
+
+
+def _draw_table(page, top, rows):
+    """Draw a ruled table starting at ``top`` and return the y after it."""
+    col_widths = (40, 220, 70, 50, 80)
+    row_height = 16
+    left = MARGIN
+    right = left + sum(col_widths)
+    bottom = top + row_height * len(rows)
+    for row_index in range(len(rows) + 1):
+        y = top + row_index * row_height
+        page.draw_line((left, y), (right, y), width=0.6)
+    x = left
+    for width in col_widths + (0,):
+        page.draw_line((x, top), (x, bottom), width=0.6)
+        x += width
+    for row_index, row in enumerate(rows):
+        x = left
+        baseline = top + row_index * row_height + 11
+        for width, cell in zip(col_widths, row):
+            page.insert_text((x + 3, baseline), cell, fontsize=8)
+            x += width
+    return bottom
+
+
+def _write_pdf_page(page, rng, page_num, has_table, arabic_font=None):
+    y = MARGIN
+    title = SECTION_TITLES[(page_num - 1) % len(SECTION_TITLES)]
+    page.insert_text((MARGIN, y), f"{page_num}. {title}", fontsize=13)
+    y += LINE_HEIGHT * 2
+
+    paragraphs = 2 if has_table else 5
+    for _ in range(paragraphs):
+        for line in _wrap(_paragraph(rng, ENGLISH_WORDS)):
+            page.insert_text((MARGIN, y), line, fontsize=10)
+            y += LINE_HEIGHT
+        y += LINE_HEIGHT // 2
+        if arabic_font:
+            for line in _wrap(_paragraph(rng, ARABIC_WORDS, sentences=2), max_chars=70):
+                page.insert_text(
+                    (MARGIN, y), line, fontsize=10, fontname="arabic", fontfile=arabic_font
+                )
+                y += LINE_HEIGHT
+            y += LINE_HEIGHT // 2
+
+    if has_table:
+        rows = [TABLE_HEADERS] + _table_rows(rng, 12)
+        y = _draw_table(page, y + LINE_HEIGHT, rows) + LINE_HEIGHT
+        for line in _wrap(_paragraph(rng, ENGLISH_WORDS, sentences=2)):
+            if y > PAGE_HEIGHT - MARGIN:
+                break
+            page.insert_text((MARGIN, y), line, fontsize=10)
+            y += LINE_HEIGHT
+
+
+def _save_pdf(doc, path):
+    doc.set_metadata({"creationDate": PDF_DATE, "modDate": PDF_DATE, "producer": "benchmarks"})
+    doc.save(str(path), garbage=3, deflate=True, no_new_id=True)
+    doc.close()
+
+
+def build_text_pdf(path, rng, pages, table_pages, arabic_font=None):
+    """Write a PDF with a text layer; tables are drawn on ``table_pages`` (1-based)."""
+    doc = fitz.open()
+    for page_num in range(1, pages + 1):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        _write_pdf_page(page, rng, page_num, page_num in table_pages, arabic_font)
+    _save_pdf(doc, path)
+
+
+def build_scanned_pdf(path, rng, pages, table_pages, dpi):
+    """Write an image-only PDF by rasterising text-layer pages."""
+    source = fitz.open()
+    for page_num in range(1, pages + 1):
+        page = source.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        _write_pdf_page(page, rng, page_num, page_num in table_pages)
+
+    doc = fitz.open()
+    for page in source:
+        pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+        target = doc.new_page(width=page.rect.width, height=page.rect.height)
+        target.insert_image(target.rect, pixmap=pix)
+    source.close()
+    _save_pdf(doc, path)
+
+
+def build_docx(path, rng, table_rows, sections=6, mixed=False):
+    """Write a DOCX with headings, paragraphs and one large table per two sections."""
+    document = Document()
+    for index in range(sections):
+        document.add_heading(SECTION_TITLES[index % len(SECTION_TITLES)], level=1)
+        document.add_paragraph(_paragraph(rng, ENGLISH_WORDS))
+        if mixed:
+            document.add_paragraph(_paragraph(rng, ARABIC_WORDS, sentences=2))
+            document.add_paragraph(
+                f"{_sentence(rng, ENGLISH_WORDS, 4, 6)} {_sentence(rng, ARABIC_WORDS, 4, 6)}"
+            )
+        if index % 2 == 0:
+            table = document.add_table(rows=1, cols=len(TABLE_HEADERS))
+            for cell, header in zip(table.rows[0].cells, TABLE_HEADERS):
+                cell.text = header
+            for row in _table_rows(rng, table_rows):
+                for cell, value in zip(table.add_row().cells, row):
+                    cell.text = value
+    properties = document.core_properties
+    properties.created = FIXED_TIMESTAMP
+    properties.modified = FIXED_TIMESTAMP
+    properties.last_printed = FIXED_TIMESTAMP
+    document.save(str(path))
+
+
+def generate_corpus(output_dir, seed=0, **overrides):
+    """Generate a synthetic corpus and return its manifest.
+
+    Args:
+        output_dir: Directory to create; files go under ``proposals/`` and ``Reports/``
+        seed: Random seed; the same seed and parameters reproduce the same corpus
+        **overrides: Any key from ``DEFAULTS`` (documents, pages, table_rows,
+            table_page_ratio, scan_dpi, kinds)
+
+    Returns:
+        dict: The manifest written to ``corpus_manifest.json``
+    """
+    params = dict(DEFAULTS)
+    unknown = set(overrides) - set(params)
+    if unknown:
+        raise ValueError(f"Unknown corpus parameters: {', '.join(sorted(unknown))}")
+    params.update(overrides)
+    kinds = tuple(params["kinds"])
+
+    arabic_font = find_arabic_font()
+    if "mixed_pdf" in kinds and not arabic_font:
+        # Without an Arabic-capable font the PDF would only contain .notdef boxes
+        kinds = tuple(kind for kind in kinds if kind != "mixed_pdf")
+    if not kinds:
+        raise ValueError("No document kinds to generate")
+
+    output_dir = pathlib.Path(output_dir)
+    folders = {"proposals": output_dir / "proposals", "reports": output_dir / "Reports"}
+    for folder in folders.values():
+        folder.mkdir(parents=True, exist_ok=True)
+
+    rng = random.Random(seed)
+    files = []
+    for index in range(params["documents"]):
+        kind = kinds[index % len(kinds)]
+        folder_name = "proposals" if index % 2 == 0 else "reports"
+        suffix = ".docx" if kind.endswith("docx") else ".pdf"
+        path = folders[folder_name] / f"bench_{index:04d}_{kind}{suffix}"
+        doc_rng = random.Random(rng.random())
+
+        entry = {"path": str(path.relative_to(output_dir)), "kind": kind, "folder": folder_name}
+        if suffix == ".pdf":
+            pages = params["pages"]
+            table_pages = _pick_table_pages(doc_rng, pages, params["table_page_ratio"])
+            if kind == "scanned_pdf":
+                build_scanned_pdf(path, doc_rng, pages, table_pages, params["scan_dpi"])
+            else:
+                font = arabic_font if kind == "mixed_pdf" else None
+                build_text_pdf(path, doc_rng, pages, table_pages, font)
+            entry.update(pages=pages, table_pages=table_pages)
+        else:
+            build_docx(path, doc_rng, params["table_rows"], mixed=kind == "mixed_docx")
+            entry.update(pages=None, table_pages=[])
+        files.append(entry)
+
+    manifest = {
+        "seed": seed,
+        "params": {**params, "kinds": list(kinds)},
+        "arabic_font": arabic_font,
+        "folders": {name: str(folder.relative_to(output_dir)) for name, folder in folders.items()},
+        "files": files,
+    }
+    with open(output_dir / MANIFEST_NAME, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2, ensure_ascii=False)
+    return manifest
+
+
+def load_manifest(corpus_dir):
+    """Load ``corpus_manifest.json`` from a generated corpus directory."""
+    with open(pathlib.Path(corpus_dir) / MANIFEST_NAME, "r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic benchmark corpus")
+    parser.add_argument("output_dir", help="Directory to write the corpus into")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--documents", type=int, default=DEFAULTS["documents"])
+    parser.add_argument("--pages", type=int, default=DEFAULTS["pages"])
+    parser.add_argument("--table-rows", type=int, default=DEFAULTS["table_rows"])
+    parser.add_argument("--scan-dpi", type=int, default=DEFAULTS["scan_dpi"])
+    parser.add_argument(
+        "--kinds", nargs="+", choices=DEFAULTS["kinds"], default=list(DEFAULTS["kinds"])
+    )
+    args = parser.parse_args(argv)
+
+    manifest = generate_corpus(
+        args.output_dir,
+        seed=args.seed,
+        documents=args.documents,
+        pages=args.pages,
+        table_rows=args.table_rows,
+        scan_dpi=args.scan_dpi,
+        kinds=args.kinds,
+    )
+    print(f"Wrote {len(manifest['files'])} documents to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Per-page OCR latency of the available OCR backends.
+
+Renders pages of the scanned PDFs in a synthetic corpus once, then OCRs the same
+images with each backend (pytesseract: one tesseract process per call;
+tesserocr: one in-process engine reused across pages). The OCR result cache is
+bypassed, so every call reaches the engine.
+
+Usage:
+    python -m benchmarks.ocr_backends --pages 20
+    python -m benchmarks.ocr_backends --corpus-dir /tmp/bench_corpus --psm 6 3
+"""
+
+import argparse
+import os
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from benchmarks.corpus import generate_corpus, load_manifest  # noqa: E402
+
+
+def render_scanned_pages(doc_pipeline, corpus_dir, limit):
+    """Render up to ``limit`` pages of the corpus's scanned PDFs at the OCR DPI."""
+    import fitz
+
+    images = []
+    for entry in load_manifest(corpus_dir)["files"]:
+        if entry["kind"] != "scanned_pdf":
+            continue
+        with fitz.open(os.path.join(corpus_dir, entry["path"])) as doc:
+            for page_num in range(len(doc)):
+                if len(images) >= limit:
+                    return images
+                image, _ = doc_pipeline._render_page(doc, page_num, doc_pipeline.CONFIG["OCR_DPI"])
+                images.append(image)
+    return images
+
+
+def time_backend(backend, images, lang, psm_modes):
+    """OCR every image once per PSM mode; returns per-page latencies in seconds."""
+    latencies = []
+    for image in images:
+        start = time.perf_counter()
+        for psm_mode in psm_modes:
+            backend.image_to_data(image, lang, psm_mode)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run_ocr_backend_benchmark(corpus_dir, pages=10, psm_modes=(6,), backends=None):
+    """Measure per-page latency for each OCR backend.
+
+    Returns:
+        dict: backend name -> {pages, first_page_ms, mean_ms, p50_ms, p95_ms,
+        pages_per_sec} or {"skipped": reason}
+    """
+    import doc_pipeline
+
+    backends = backends or list(doc_pipeline.OCR_BACKENDS)
+    results = {"pages": 0, "psm_modes": list(psm_modes), "backends": {}}
+    if not doc_pipeline.is_ocr_enabled():
+        results["backends"] = {name: {"skipped": "OCR not available"} for name in backends}
+        return results
+
+    images = render_scanned_pages(doc_pipeline, corpus_dir, pages)
+    results["pages"] = len(images)
+    try:
+        for name in backends:
+            try:
+                backend = doc_pipeline.create_ocr_backend(name, fallback=False)
+            except Exception as e:
+                results["backends"][name] = {"skipped": f"{type(e).__name__}: {e}"}
+                continue
+            try:
+                latencies = time_backend(backend, images, doc_pipeline.CONFIG["OCR_LANG"], psm_modes)
+            finally:
+                backend.close()
+            if not latencies:
+                results["backends"][name] = {"skipped": "no scanned pages in corpus"}
+                continue
+            ordered = sorted(latencies)
+            total = sum(latencies)
+            results["backends"][name] = {
+                "pages": len(latencies),
+                # The first page includes engine start-up (traineddata loading)
+                "first_page_ms": round(latencies[0] * 1000, 1),
+                "mean_ms": round(statistics.mean(latencies) * 1000, 1),
+                "p50_ms": round(statistics.median(latencies) * 1000, 1),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000, 1),
+                "pages_per_sec": round(len(latencies) / total, 2) if total else None,
+            }
+    finally:
+        for image in images:
+            image.close()
+    return results
+
+
+def print_results(results):
+    print(f"OCR backends ({results['pages']} pages, PSM {results['psm_modes']})")
+    print(f"{'Backend':<13} {'first ms':>9} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'pages/s':>8}")
+    for name, row in results["backends"].items():
+        if "skipped" in row:
+            print(f"{name:<13} skipped: {row['skipped']}")
+            continue
+        print(
+            f"{name:<13} {row['first_page_ms']:>9} {row['mean_ms']:>9} {row['p50_ms']:>9} "
+            f"{row['p95_ms']:>9} {row['pages_per_sec']:>8}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-page latency of OCR backends")
+    parser.add_argument("--corpus-dir", help="Corpus with scanned PDFs (generated when omitted)")
+    parser.add_argument("--pages", type=int, default=10, help="Pages to OCR per backend")
+    parser.add_argument("--psm", type=int, nargs="+", default=[6], help="PSM modes run per page")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="ocr_backend_corpus_") as scratch:
+        corpus_dir = args.corpus_dir
+        if not corpus_dir:
+            corpus_dir = scratch
+            generate_corpus(
+                corpus_dir, seed=args.seed, documents=1, pages=args.pages, kinds=("scanned_pdf",)
+            )
+        results = run_ocr_backend_benchmark(corpus_dir, args.pages, args.psm)
+    print_results(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
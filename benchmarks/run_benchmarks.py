@@ -0,0 +1,447 @@
+"""Benchmark doc_pipeline stages and full processing runs over a synthetic corpus.
+
+Each stage runs in its own child process so the reported peak RSS belongs to that
+stage alone. Results can be saved as a baseline and later runs compared against
+it; a drop in docs/sec (or growth in peak RSS) beyond the tolerance is flagged
+as a regression.
+
+Usage:
+    python -m benchmarks.run_benchmarks --documents 20 --pages 15
+    python -m benchmarks.run_benchmarks --save-baseline
+    python -m benchmarks.run_benchmarks --fail-on-regression
+"""
+
+import argparse
+import json
+import multiprocessing
+import pathlib
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from benchmarks.corpus import DEFAULTS, generate_corpus, load_manifest  # noqa: E402
+
+DEFAULT_BASELINE = pathlib.Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.10  # Relative slowdown/growth reported as a regression
+
+PDF_KINDS = {"text_pdf", "scanned_pdf", "mixed_pdf"}
+DOCX_KINDS = {"docx", "mixed_docx"}
+
+
+def _stage_docx_segments(doc_pipeline, path):
+    return doc_pipeline.extract_docx_segments(path)
+
+
+def _stage_pdf_segments(doc_pipeline, path):
+    return doc_pipeline.extract_pdf_segments(path)
+
+
+def _stage_pdf_tables(doc_pipeline, path):
+    return doc_pipeline.extract_tables_from_pdf(path)
+
+
+def _stage_ocr(doc_pipeline, path):
+    return doc_pipeline.extract_pdf_with_ocr(path)
+
+
+def _stage_ocr_tables(doc_pipeline, path):
+    return doc_pipeline.detect_tables_with_ocr(path)
+
+
+def _stage_pdf_document(doc_pipeline, path):
+    return doc_pipeline.process_pdf_document(path)
+
+
+# Stage name -> (document kinds it runs on, callable(doc_pipeline, path), needs OCR)
+STAGES = {
+    "docx_segments": (DOCX_KINDS, _stage_docx_segments, False),
+    "pdf_segments": (PDF_KINDS, _stage_pdf_segments, False),
+    "pdf_tables": (PDF_KINDS, _stage_pdf_tables, False),
+    "pdf_document": (PDF_KINDS, _stage_pdf_document, False),
+    "ocr": ({"scanned_pdf"}, _stage_ocr, True),
+    "ocr_tables": ({"scanned_pdf"}, _stage_ocr_tables, True),
+}
+FULL_PIPELINE = "process_all_documents"
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process and its reaped children, in MiB."""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    if resource is not None:
+        peak = max(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        )
+        # ru_maxrss is bytes on macOS and KiB elsewhere
+        divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return round(peak / divisor, 1)
+
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return round(getattr(info, "peak_wset", info.rss) / (1024 * 1024), 1)
+
+
+def _configure_pipeline(doc_pipeline, work_dir, use_ocr_cache):
+    """Point every persistent pipeline path at ``work_dir`` so runs never touch the repo."""
+    work_dir = pathlib.Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    doc_pipeline.CONFIG.update(
+        {
+            "DB_PATH": str(work_dir / "processing_tracker.db"),
+            "KB_PATH": str(work_dir / "knowledge_base.json"),
+            "KB_STORE_DIR": str(work_dir / "kb_store"),
+            "SNAPSHOT_DIR": str(work_dir / "snapshots"),
+            "SEARCH_INDEX_PATH": str(work_dir / "search_index.db"),
+            "RUN_REPORT_DIR": str(work_dir / "run_reports"),
+            "OCR_CACHE_PATH": str(work_dir / "ocr_cache.db"),
+            "OCR_CACHE_ENABLED": use_ocr_cache,
+        }
+    )
+    doc_pipeline._ocr_cache = None
+
+
+def _run_stage(stage, corpus_dir, files, work_dir, options, queue):
+    """Child-process body: run one stage over ``files`` and report timings via ``queue``."""
+    import logging
+
+    logging.disable(logging.WARNING)
+    import doc_pipeline
+
+    _configure_pipeline(doc_pipeline, work_dir, options["use_ocr_cache"])
+    corpus_dir = pathlib.Path(corpus_dir)
+    errors = 0
+
+    start = time.perf_counter()
+    if stage == FULL_PIPELINE:
+        manifest = load_manifest(corpus_dir)
+        base_folders = {
+            name: str(corpus_dir / folder) for name, folder in manifest["folders"].items()
+        }
+        metrics = doc_pipeline.PipelineMetrics()
+        knowledge_base = doc_pipeline.process_all_documents(
+            base_folders,
+            force_reprocess=True,
+            workers=options["workers"],
+            page_workers=options["page_workers"],
+            metrics=metrics,
+        )
+        errors = sum(1 for doc in knowledge_base.values() if "error" in doc)
+        stage_seconds = metrics.summary()["stage_seconds"]
+    else:
+        _, func, _ = STAGES[stage]
+        for entry in files:
+            result = func(doc_pipeline, str(corpus_dir / entry["path"]))
+            if isinstance(result, dict) and "Error" in result:
+                errors += 1
+        stage_seconds = None
+    elapsed = time.perf_counter() - start
+
+    queue.put(
+        {
+            "seconds": elapsed,
+            "errors": errors,
+            "peak_rss_mb": peak_rss_mb(),
+            "stage_seconds": stage_seconds,
+        }
+    )
+
+
+def run_stage(stage, corpus_dir, files, work_dir, options):
+    """Run ``stage`` in a fresh process and return its raw measurement."""
+    context = multiprocessing.get_context()
+    queue = context.Queue()
+    process = context.Process(
+        target=_run_stage, args=(stage, str(corpus_dir), files, str(work_dir), options, queue)
+    )
+    process.start()
+    try:
+        result = queue.get(timeout=options["timeout"])
+    except Exception:
+        process.terminate()
+        process.join()
+        return {"error": f"stage {stage} did not finish (exit code {process.exitcode})"}
+    process.join()
+    return result
+
+
+def _rate(count, seconds):
+    if not count or seconds <= 0:
+        return None
+    return round(count / seconds, 3)
+
+
+def run_benchmarks(corpus_dir, stages=None, repeat=1, workers=1, page_workers=1,
+                   use_ocr_cache=False, timeout=1800):
+    """Benchmark each stage over a generated corpus.
+
+    Args:
+        corpus_dir: Directory produced by ``benchmarks.corpus.generate_corpus``
+        stages: Stage names to run (defaults to every stage plus the full pipeline;
+            OCR stages are skipped when Tesseract is unavailable)
+        repeat: Runs per stage; the fastest run is reported
+        workers: Worker processes for the full pipeline run
+        page_workers: Page-level processes for the full pipeline run
+        use_ocr_cache: Keep the OCR result cache enabled (off by default so OCR
+            is measured rather than cache lookups)
+        timeout: Seconds to wait for a single stage run
+
+    Returns:
+        dict: ``{"environment": {...}, "corpus": {...}, "stages": {name: {...}}}``
+    """
+    import doc_pipeline
+
+    corpus_dir = pathlib.Path(corpus_dir)
+    manifest = load_manifest(corpus_dir)
+    ocr_available = doc_pipeline.is_ocr_enabled()
+    stages = list(stages) if stages else list(STAGES) + [FULL_PIPELINE]
+    options = {
+        "workers": workers,
+        "page_workers": page_workers,
+        "use_ocr_cache": use_ocr_cache,
+        "timeout": timeout,
+    }
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="doc_pipeline_bench_") as scratch:
+        for stage in stages:
+            if stage == FULL_PIPELINE:
+                files = manifest["files"]
+            else:
+                kinds, _, needs_ocr = STAGES[stage]
+                if needs_ocr and not ocr_available:
+                    results[stage] = {"skipped": "OCR not available"}
+                    continue
+                files = [entry for entry in manifest["files"] if entry["kind"] in kinds]
+            if not files:
+                results[stage] = {"skipped": "no matching documents"}
+                continue
+
+            runs = []
+            for attempt in range(repeat):
+                # Fresh tracker/index per run so the full pipeline never skips files
+                work_dir = pathlib.Path(scratch) / f"{stage}_{attempt}"
+                runs.append(run_stage(stage, corpus_dir, files, work_dir, options))
+            failed = [run for run in runs if "error" in run]
+            if failed:
+                results[stage] = {"error": failed[0]["error"]}
+                continue
+
+            best = min(runs, key=lambda run: run["seconds"])
+            pages = sum(entry["pages"] or 0 for entry in files)
+            results[stage] = {
+                "documents": len(files),
+                "pages": pages,
+                "seconds": round(best["seconds"], 4),
+                "docs_per_sec": _rate(len(files), best["seconds"]),
+                "pages_per_sec": _rate(pages, best["seconds"]),
+                "peak_rss_mb": max(
+                    (run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None),
+                    default=None,
+                ),
+                "errors": best["errors"],
+            }
+            if best["stage_seconds"]:
+                results[stage]["stage_seconds"] = best["stage_seconds"]
+
+    return {
+        "created_at": datetime.now().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": multiprocessing.cpu_count(),
+            "ocr_available": ocr_available,
+            "workers": workers,
+            "page_workers": page_workers,
+            "repeat": repeat,
+        },
+        "corpus": {"seed": manifest["seed"], "params": manifest["params"]},
+        "stages": results,
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Compare stage results against a baseline.
+
+    Returns:
+        list: One dict per stage present in both runs with the relative change in
+        docs/sec and peak RSS and a ``regression`` flag
+    """
+    comparisons = []
+    for stage, current in results["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous or "docs_per_sec" not in current or "docs_per_sec" not in previous:
+            continue
+        speed_change = None
+        if previous["docs_per_sec"] and current["docs_per_sec"]:
+            speed_change = current["docs_per_sec"] / previous["docs_per_sec"] - 1
+        rss_change = None
+        if previous.get("peak_rss_mb") and current.get("peak_rss_mb"):
+            rss_change = current["peak_rss_mb"] / previous["peak_rss_mb"] - 1
+        regression = (speed_change is not None and speed_change < -tolerance) or (
+            rss_change is not None and rss_change > tolerance
+        )
+        comparisons.append(
+            {
+                "stage": stage,
+                "baseline_docs_per_sec": previous["docs_per_sec"],
+                "docs_per_sec": current["docs_per_sec"],
+                "speed_change": speed_change,
+                "baseline_peak_rss_mb": previous.get("peak_rss_mb"),
+                "peak_rss_mb": current.get("peak_rss_mb"),
+                "rss_change": rss_change,
+                "regression": regression,
+            }
+        )
+    return comparisons
+
+
+def _format_value(value, suffix=""):
+    return "-" if value is None else f"{value}{suffix}"
+
+
+def _format_change(change):
+    return "-" if change is None else f"{change * 100:+.1f}%"
+
+
+def print_results(results, comparisons=None):
+    print("=" * 86)
+    print(f"{'Stage':<24} {'Docs':>5} {'Pages':>6} {'Seconds':>9} {'Docs/s':>9} {'Pages/s':>9} {'Peak MiB':>9} {'Errors':>7}")
+    print("-" * 86)
+    for stage, result in results["stages"].items():
+        if "skipped" in result or "error" in result:
+            print(f"{stage:<24} {result.get('skipped') or result.get('error')}")
+            continue
+        print(
+            f"{stage:<24} {result['documents']:>5} {result['pages']:>6} "
+            f"{result['seconds']:>9.3f} {_format_value(result['docs_per_sec']):>9} "
+            f"{_format_value(result['pages_per_sec']):>9} "
+            f"{_format_value(result['peak_rss_mb']):>9} {result['errors']:>7}"
+        )
+    print("=" * 86)
+
+    if comparisons:
+        print(f"{'Stage':<24} {'Base docs/s':>12} {'Docs/s':>9} {'Change':>8} {'Base MiB':>9} {'MiB':>7} {'Change':>8}")
+        print("-" * 86)
+        for row in comparisons:
+            marker = "  REGRESSION" if row["regression"] else ""
+            print(
+                f"{row['stage']:<24} {_format_value(row['baseline_docs_per_sec']):>12} "
+                f"{_format_value(row['docs_per_sec']):>9} {_format_change(row['speed_change']):>8} "
+                f"{_format_value(row['baseline_peak_rss_mb']):>9} "
+                f"{_format_value(row['peak_rss_mb']):>7} {_format_change(row['rss_change']):>8}{marker}"
+            )
+        print("=" * 86)
+
+
+def create_argument_parser():
+    parser = argparse.ArgumentParser(description="Benchmark doc_pipeline on a synthetic corpus")
+    parser.add_argument(
+        "--corpus-dir",
+        help="Existing corpus to benchmark (generated into a temp dir when omitted)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Corpus seed (default: 0)")
+    parser.add_argument("--documents", type=int, default=DEFAULTS["documents"])
+    parser.add_argument("--pages", type=int, default=DEFAULTS["pages"])
+    parser.add_argument("--table-rows", type=int, default=DEFAULTS["table_rows"])
+    parser.add_argument(
+        "--kinds", nargs="+", choices=DEFAULTS["kinds"], default=list(DEFAULTS["kinds"])
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=list(STAGES) + [FULL_PIPELINE],
+        help="Stages to run (default: all)",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage; best is kept")
+    parser.add_argument("--workers", type=int, default=1, help="Workers for the full pipeline")
+    parser.add_argument("--page-workers", type=int, default=1)
+    parser.add_argument(
+        "--use-ocr-cache", action="store_true", help="Keep the OCR result cache enabled"
+    )
+    parser.add_argument("--output", help="Write the results JSON to this path")
+    parser.add_argument(
+        "--baseline",
+        default=str(DEFAULT_BASELINE),
+        help=f"Baseline JSON to compare against (default: {DEFAULT_BASELINE.name})",
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store these results as the new baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Relative change treated as a regression (default: 0.10)",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit with status 1 when any stage regresses against the baseline",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = create_argument_parser().parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="doc_pipeline_corpus_") as scratch:
+        corpus_dir = args.corpus_dir
+        if not corpus_dir:
+            corpus_dir = scratch
+            print(f"Generating corpus ({args.documents} documents, seed {args.seed})...")
+            generate_corpus(
+                corpus_dir,
+                seed=args.seed,
+                documents=args.documents,
+                pages=args.pages,
+                table_rows=args.table_rows,
+                kinds=args.kinds,
+            )
+        results = run_benchmarks(
+            corpus_dir,
+            stages=args.stages,
+            repeat=args.repeat,
+            workers=args.workers,
+            page_workers=args.page_workers,
+            use_ocr_cache=args.use_ocr_cache,
+        )
+
+    comparisons = None
+    baseline_path = pathlib.Path(args.baseline)
+    if baseline_path.exists() and not args.save_baseline:
+        with open(baseline_path, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)
+        if baseline.get("corpus") != results["corpus"]:
+            print("Warning: baseline was recorded on a different corpus; comparison is indicative only")
+        comparisons = compare_to_baseline(results, baseline, args.tolerance)
+        results["comparison"] = comparisons
+
+    print_results(results, comparisons)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+        print(f"Results written to {args.output}")
+    if args.save_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+        print(f"Baseline saved to {baseline_path}")
+
+    if args.fail_on_regression and comparisons and any(row["regression"] for row in comparisons):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Micro-benchmark for the compiled section-header classifier.
+
+Times the shared SectionClassifier against the per-line logic it replaced
+(pattern loops, an uncompiled numbered-heading regex and nested keyword loops)
+on a synthetic mix of bilingual body text and headers, and checks that both
+give the same answers.
+
+Usage:
+    python -m benchmarks.section_classifier --lines 1000000
+"""
+
+import argparse
+import pathlib
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from src.ingestion.section_classifier import SECTION_TYPE_KEYWORDS, SectionClassifier  # noqa: E402
+
+WORDS = [
+    "drainage", "culvert", "catchment", "runoff", "rainfall", "design", "storm",
+    "channel", "project", "analysis", "المشروع", "تصريف", "الأمطار", "دراسة", "تحليل",
+]
+HEADERS = [
+    "EXECUTIVE SUMMARY", "SCOPE OF WORK", "1. Introduction", "2. Technical Approach",
+    "HYDROLOGICAL ANALYSIS RESULTS", "Section 4", "Bill of Quantities", "ملخص تنفيذي",
+    "جدول الكميات", "3. Team Composition and Staff", "APPENDIX A - DRAWINGS",
+]
+
+
+def generate_lines(count, seed=0, header_ratio=0.05):
+    """Synthetic extracted-text lines: mostly body text with some headers."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        if rng.random() < header_ratio:
+            lines.append(rng.choice(HEADERS))
+        else:
+            lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 14))))
+    return lines
+
+
+def legacy_is_line_header(line, keyword_pattern):
+    """Per-line PDF header check as done before the shared classifier."""
+    if line.isupper() and 10 <= len(line) <= 100 and len(line.split()) >= 2:
+        return True
+    elif keyword_pattern.match(line):
+        return True
+    elif re.match(r"^\d+\.\s+\w+", line):
+        return True
+    return False
+
+
+def legacy_matches_header_patterns(text, header_patterns):
+    for pattern in header_patterns:
+        if pattern.match(text):
+            return True
+    return False
+
+
+def legacy_section_type(title):
+    title_lower = title.lower()
+    for section_type, keywords in SECTION_TYPE_KEYWORDS.items():
+        for keyword in keywords:
+            if keyword in title_lower:
+                return section_type
+    return "other"
+
+
+def _best_time(func, lines, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = [func(line) for line in lines]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_classifier_benchmark(lines=200_000, seed=0, repeat=3):
+    """Time legacy vs compiled classification; returns lines/sec per operation."""
+    import doc_pipeline
+
+    header_patterns = doc_pipeline.CONFIG["HEADER_PATTERNS"]
+    keyword_pattern = doc_pipeline.CONFIG["SECTION_KEYWORDS_PATTERN"]
+    classifier = SectionClassifier(header_patterns, keyword_pattern)
+    sample = generate_lines(lines, seed)
+
+    operations = {
+        "line_header": (
+            lambda line: legacy_is_line_header(line, keyword_pattern),
+            classifier.is_line_header,
+        ),
+        "header_patterns": (
+            lambda line: legacy_matches_header_patterns(line, header_patterns),
+            classifier.matches_header_patterns,
+        ),
+        "section_type": (legacy_section_type, classifier.section_type),
+    }
+
+    results = {"lines": lines, "seed": seed, "operations": {}}
+    for name, (legacy, compiled) in operations.items():
+        legacy_seconds, legacy_result = _best_time(legacy, sample, repeat)
+        compiled_seconds, compiled_result = _best_time(compiled, sample, repeat)
+        if legacy_result != compiled_result:
+            raise AssertionError(f"{name}: compiled classifier disagrees with the legacy logic")
+        results["operations"][name] = {
+            "legacy_lines_per_sec": round(lines / legacy_seconds) if legacy_seconds else None,
+            "compiled_lines_per_sec": round(lines / compiled_seconds) if compiled_seconds else None,
+            "speedup": round(legacy_seconds / compiled_seconds, 2) if compiled_seconds else None,
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the section-header classifier")
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per operation; best is kept")
+    args = parser.parse_args(argv)
+
+    results = run_classifier_benchmark(args.lines, args.seed, args.repeat)
+    print(f"{'Operation':<18} {'legacy lines/s':>15} {'compiled lines/s':>17} {'speedup':>8}")
+    for name, row in results["operations"].items():
+        print(
+            f"{name:<18} {row['legacy_lines_per_sec']:>15,} "
+            f"{row['compiled_lines_per_sec']:>17,} {row['speedup']:>7}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
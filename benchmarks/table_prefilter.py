@@ -0,0 +1,140 @@
+"""Precision/recall and cost of the table-candidate page prefilter.
+
+Runs ``table_candidate_signal`` on every page of the corpus's text-layer PDFs
+and scores the flagged pages against the manifest's ``table_pages`` (scanned
+PDFs have no text layer or drawings for the prefilter to see; their tables are
+left to OCR table detection). pdfplumber's ``extract_tables`` is timed on every
+page as well, so the report shows what the skipped pages would have cost, and
+the tables found with and without the prefilter are compared.
+
+Usage:
+    python -m benchmarks.table_prefilter --documents 20 --pages 15
+    python -m benchmarks.table_prefilter --corpus-dir /tmp/bench_corpus
+"""
+
+import argparse
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from benchmarks.corpus import DEFAULTS, generate_corpus, load_manifest  # noqa: E402
+
+TEXT_PDF_KINDS = ("text_pdf", "mixed_pdf")
+
+
+def _ratio(numerator, denominator):
+    return round(numerator / denominator, 3) if denominator else None
+
+
+def run_prefilter_benchmark(corpus_dir):
+    """Score the prefilter against the manifest and time it against pdfplumber.
+
+    Returns:
+        dict: page counts, confusion counts, precision, recall, signal counts,
+        prefilter and pdfplumber milliseconds and whether any table was lost
+    """
+    import fitz
+    import pdfplumber
+
+    import doc_pipeline
+
+    counts = {"true_positive": 0, "false_positive": 0, "false_negative": 0, "true_negative": 0}
+    signals = {}
+    prefilter_seconds = plumber_seconds = plumber_skipped_seconds = 0.0
+    pages = 0
+    lost_tables = 0
+
+    for entry in load_manifest(corpus_dir)["files"]:
+        if entry["kind"] not in TEXT_PDF_KINDS:
+            continue
+        path = os.path.join(corpus_dir, entry["path"])
+        truth = set(entry["table_pages"])
+        with fitz.open(path) as doc, pdfplumber.open(path) as pdf:
+            for page_num in range(len(doc)):
+                pages += 1
+                start = time.perf_counter()
+                signal = doc_pipeline.table_candidate_signal(doc.load_page(page_num))
+                prefilter_seconds += time.perf_counter() - start
+
+                start = time.perf_counter()
+                tables = doc_pipeline._extract_plumber_page_tables(pdf.pages[page_num], page_num)
+                elapsed = time.perf_counter() - start
+                plumber_seconds += elapsed
+
+                if signal:
+                    signals[signal] = signals.get(signal, 0) + 1
+                else:
+                    plumber_skipped_seconds += elapsed
+                    lost_tables += len(tables)
+
+                has_table = page_num + 1 in truth
+                key = {
+                    (True, True): "true_positive",
+                    (True, False): "false_positive",
+                    (False, True): "false_negative",
+                    (False, False): "true_negative",
+                }[(bool(signal), has_table)]
+                counts[key] += 1
+
+    flagged = counts["true_positive"] + counts["false_positive"]
+    actual = counts["true_positive"] + counts["false_negative"]
+    return {
+        "pages": pages,
+        **counts,
+        "precision": _ratio(counts["true_positive"], flagged),
+        "recall": _ratio(counts["true_positive"], actual),
+        "signals": signals,
+        "candidate_pages": flagged,
+        "prefilter_ms_per_page": round(prefilter_seconds * 1000 / pages, 2) if pages else None,
+        "pdfplumber_ms_per_page": round(plumber_seconds * 1000 / pages, 2) if pages else None,
+        "pdfplumber_ms_saved": round(plumber_skipped_seconds * 1000, 1),
+        "tables_lost": lost_tables,
+    }
+
+
+def print_results(results):
+    print(f"Table prefilter on {results['pages']} text-layer PDF pages")
+    print(
+        f"  precision {results['precision']}  recall {results['recall']}  "
+        f"(tp={results['true_positive']} fp={results['false_positive']} "
+        f"fn={results['false_negative']} tn={results['true_negative']})"
+    )
+    print(f"  candidates {results['candidate_pages']} by signal {results['signals']}")
+    print(
+        f"  prefilter {results['prefilter_ms_per_page']} ms/page, "
+        f"pdfplumber {results['pdfplumber_ms_per_page']} ms/page, "
+        f"{results['pdfplumber_ms_saved']} ms of pdfplumber skipped"
+    )
+    print(f"  tables pdfplumber finds on skipped pages: {results['tables_lost']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score the table-candidate page prefilter")
+    parser.add_argument("--corpus-dir", help="Existing corpus (generated when omitted)")
+    parser.add_argument("--documents", type=int, default=DEFAULTS["documents"])
+    parser.add_argument("--pages", type=int, default=DEFAULTS["pages"])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="table_prefilter_corpus_") as scratch:
+        corpus_dir = args.corpus_dir
+        if not corpus_dir:
+            corpus_dir = scratch
+            generate_corpus(
+                corpus_dir,
+                seed=args.seed,
+                documents=args.documents,
+                pages=args.pages,
+                kinds=TEXT_PDF_KINDS,
+            )
+        results = run_prefilter_benchmark(corpus_dir)
+    print_results(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
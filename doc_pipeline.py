@@ -4,14 +4,24 @@ import hashlib
 import logging
 import argparse
 from datetime import datetime
-from docx import Document
+from src.ingestion.docx_reader import load_docx
+from src.ingestion.section_classifier import SectionClassifier
 import re
 import json
+import gzip
+import time
+import csv
+import contextlib
+import threading
+from collections import deque
 import pytesseract
 from PIL import Image
 import fitz
 import io
 import pdfplumber
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 # Configuration constants
 CONFIG = {
@@ -20,10 +30,56 @@ CONFIG = {
     "LOG_FORMAT": "%(asctime)s - %(levelname)s - %(message)s",
     "LOG_FILE": "document_processing.log",
     "DB_PATH": "processing_tracker.db",
+    "DB_BATCH_SIZE": 500,  # Tracker inserts committed per transaction
+    "HASH_BUFFER_SIZE": 1024 * 1024,  # Read size when hashing files
     "KB_PATH": "knowledge_base.json",
+    "KB_STORAGE": "json",  # "json" (single file) or "sharded" (one file per document)
+    "KB_STORE_DIR": "kb_store",  # Root of the sharded knowledge base store
+    "KB_EXPORT_LEGACY_ON_SAVE": False,  # Also rewrite KB_PATH after sharded saves
     "SNAPSHOT_DIR": "snapshots",
-    "MAX_PREVIEW_LENGTH": 10000,  # Max length for OCR output
+    "SEARCH_INDEX_ENABLED": True,  # Keep the full-text index updated while processing
+    "SEARCH_INDEX_PATH": "search_index.db",
+    "WATCH_INTERVAL": 2.0,  # Seconds between folder scans in --watch mode
+    "WATCH_DEBOUNCE": 3.0,  # Seconds a file must stay unchanged before it is processed
+    "RUN_REPORT_DIR": "run_reports",  # Per-run timing reports (JSON and CSV)
+    "REPORT_TOP_N": 5,  # Slowest files/stages listed in the processing summary
+    "SEGMENT_MEMORY_LIMIT": 8 * 1024 * 1024,  # Section characters buffered before spilling to disk
+    "SEGMENT_SPILL_DIR": None,  # Directory for spilled sections (None = system temp dir)
+    "DOCX_STREAM_READER": True,  # Parse document.xml directly; python-docx is the fallback
     "MAX_PAGES_FOR_TABLE_EXTRACTION": 10,  # Limit pages for table extraction
+    "TABLE_PREFILTER": True,  # Run pdfplumber only on pages with rulings or grid-aligned text
+    "TABLE_PREFILTER_MIN_RULINGS": (3, 2),  # (horizontal, vertical) ruling segments of a ruled table
+    "TABLE_PREFILTER_MIN_COLUMNS": 3,  # Aligned text columns that mark an unruled table
+    "OCR_TABLE_MIN_ROWS": 3,  # Consecutive multi-cell lines needed for an OCR table
+    "OCR_TABLE_CELL_GAP": 1.5,  # Horizontal gap (in median word heights) that splits cells
+    "OCR_TABLE_MIN_FILL": 0.5,  # Share of non-empty grid cells needed to keep an OCR table
+    "PAGE_WORKERS": 1,  # Processes per PDF for page-level parallelism (1 = disabled)
+    "PAGE_PARALLEL_MIN_PAGES": 50,  # Only split PDFs with at least this many pages
+    "PAGE_CHUNK_SIZE": 25,  # Maximum pages per worker range
+    "OCR_LANG": "ara+eng",
+    "OCR_SCRIPT_DETECTION": True,  # Pick a single-language model per page from Tesseract OSD
+    "OCR_SCRIPT_MIN_CONFIDENCE": 2.0,  # OSD script confidence needed to drop the other language
+    "OCR_SCRIPT_LANGS": {"Arabic": "ara", "Latin": "eng"},  # OSD script -> Tesseract language
+    "OCR_PSM_MODES": [6, 3, 1],  # Tried in order until one is confident enough
+    "OCR_MIN_CONFIDENCE": 75,  # Mean word confidence needed to stop retrying
+    "OCR_MIN_COVERAGE": 0.8,  # Share of words at/above the confidence floor
+    "OCR_WORD_CONFIDENCE_FLOOR": 60,  # Per-word confidence counted as "confident"
+    "OCR_PAGE_MIN_SCORE": 60,  # Page quality score below which an OCR page is rejected
+    "OCR_PAGE_MIN_CHARS": 20,  # Shorter page text counts against the page score
+    "OCR_PAGE_MIN_WORDS": 3,
+    "OCR_PAGE_MIN_LETTER_RATIO": 0.5,  # Share of letters/digits among visible characters
+    "OCR_DPI": 72,  # Render resolution of the fast OCR pass
+    "OCR_HIGH_DPI": 200,  # Re-render resolution for pages the fast pass reads poorly (None = off)
+    "OCR_HIGH_DPI_MIN_CONFIDENCE": 70,  # Fast-pass confidence below which a page is re-OCRed
+    "OCR_COLORSPACE": "gray",  # Colorspace of OCR renders: "gray" or "rgb"
+    "OCR_BACKEND": "auto",  # "auto" (tesserocr if installed), "tesserocr" or "pytesseract"
+    "TESSDATA_PATH": None,  # tessdata directory for the in-process engine (None = its default)
+    "PAGE_TEXT_MIN_CHARS": 50,  # Text-layer characters that make a page "text" (no OCR)
+    "PAGE_IMAGE_COVERAGE": 0.5,  # Image share of a low-text page that routes it to OCR
+    "OCR_CACHE_ENABLED": True,
+    "OCR_CACHE_PATH": "ocr_cache.db",  # Kept next to DB_PATH
+    "OCR_CACHE_MAX_BYTES": 512 * 1024 * 1024,  # LRU eviction above this size
+    "TESSERACT_PROBE_CACHE": "tesseract_probe.json",  # Keyed by binary path and mtime
     # TESSERACT_PATHS is now computed dynamically based on platform
     # See get_tesseract_paths() function below
     "ALLOWED_EXTENSIONS": {".docx", ".pdf", ".txt"},
@@ -42,17 +98,42 @@ CONFIG = {
 }
 
 
-# Setup logging with proper Unicode support
-logging.basicConfig(
-    level=logging.INFO,
-    format=CONFIG["LOG_FORMAT"],
-    handlers=[
-        logging.FileHandler(CONFIG["LOG_FILE"], encoding=CONFIG["DEFAULT_ENCODING"]),
-        logging.StreamHandler(),
-    ],
-)
 logger = logging.getLogger(__name__)
 
+_section_classifier = None
+
+
+def get_section_classifier():
+    """Return the compiled header classifier for the current CONFIG patterns.
+
+    Rebuilt only when HEADER_PATTERNS or SECTION_KEYWORDS_PATTERN are replaced.
+    """
+    global _section_classifier
+    key = (tuple(CONFIG["HEADER_PATTERNS"]), CONFIG["SECTION_KEYWORDS_PATTERN"])
+    if _section_classifier is None or _section_classifier[0] != key:
+        classifier = SectionClassifier(
+            header_patterns=CONFIG["HEADER_PATTERNS"],
+            keyword_pattern=CONFIG["SECTION_KEYWORDS_PATTERN"],
+        )
+        _section_classifier = (key, classifier)
+    return _section_classifier[1]
+
+
+def setup_logging(level=logging.INFO):
+    """Setup console and file logging with proper Unicode support.
+
+    Called by entry points rather than at import time, so importing this module
+    never creates the log file or touches the root logger.
+    """
+    logging.basicConfig(
+        level=level,
+        format=CONFIG["LOG_FORMAT"],
+        handlers=[
+            logging.FileHandler(CONFIG["LOG_FILE"], encoding=CONFIG["DEFAULT_ENCODING"]),
+            logging.StreamHandler(),
+        ],
+    )
+
 
 def get_tesseract_paths():
     """Get platform-specific Tesseract executable paths.
@@ -102,34 +183,51 @@ def get_tesseract_paths():
     return paths
 
 
-# Validate OCR availability
-OCR_ENABLED = False
-TESSERACT_VERSION = None
+def find_tesseract_path():
+    """Return the first usable Tesseract executable from get_tesseract_paths(), or None."""
+    for path in get_tesseract_paths():
+        if path and os.path.exists(path):
+            # Validate that the path is safe before using it
+            try:
+                # Ensure the path is a file and not a directory
+                if os.path.isfile(path):
+                    # Additional validation: check if it's actually an executable
+                    if os.access(path, os.X_OK) or path.endswith((".exe", ".bat", ".sh")):
+                        # Sanitize the path before using it to prevent command injection
+                        return os.path.normpath(path)
+            except (OSError, ValueError):
+                continue
+    return None
+
+
+def _load_tesseract_probe(tesseract_path, binary_stat):
+    """Return the cached probe for this binary, or None if it is missing or stale."""
+    try:
+        with open(CONFIG["TESSERACT_PROBE_CACHE"], "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
 
-# Try to get Tesseract path from configuration
-tesseract_path = None
-for path in get_tesseract_paths():
-    if path and os.path.exists(path):
-        # Validate that the path is safe before using it
-        try:
-            # Ensure the path is a file and not a directory
-            if os.path.isfile(path):
-                # Additional validation: check if it's actually an executable
-                if os.access(path, os.X_OK) or path.endswith((".exe", ".bat", ".sh")):
-                    tesseract_path = path
-                    break
-        except (OSError, ValueError):
-            continue
+    if (
+        isinstance(cached, dict)
+        and cached.get("path") == tesseract_path
+        and cached.get("mtime_ns") == binary_stat.st_mtime_ns
+        and cached.get("size") == binary_stat.st_size
+    ):
+        return cached
+    return None
 
-try:
-    if tesseract_path:
-        # Sanitize the path before assigning to prevent command injection
-        tesseract_path = os.path.normpath(tesseract_path)
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
-        TESSERACT_VERSION = pytesseract.get_tesseract_version()
-        OCR_ENABLED = True
-        logger.info(f"Tesseract OCR v{TESSERACT_VERSION} detected and enabled")
-    else:
+
+def _probe_tesseract():
+    """Locate Tesseract and query its version and languages.
+
+    The subprocess results are cached on disk keyed by binary path and mtime, so
+    only the first run after installing or upgrading Tesseract shells out.
+    """
+    probe = {"enabled": False, "path": None, "version": None, "languages": []}
+
+    tesseract_path = find_tesseract_path()
+    if not tesseract_path:
         logger.warning("Tesseract OCR not found in any of the expected locations")
         logger.warning(
             "OCR features will be disabled. Install from https://github.com/tesseract-ocr/tesseract"
@@ -137,24 +235,92 @@ try:
         logger.warning(
             "Or set TESSERACT_PATH environment variable to point to tesseract executable"
         )
+        return probe
+
+    try:
+        binary_stat = os.stat(tesseract_path)
+        pytesseract.pytesseract.tesseract_cmd = tesseract_path
+
+        cached = _load_tesseract_probe(tesseract_path, binary_stat)
+        if cached:
+            probe.update(
+                enabled=True,
+                path=tesseract_path,
+                version=cached.get("version"),
+                languages=cached.get("languages", []),
+            )
+            logger.debug(f"Tesseract OCR v{probe['version']} (cached probe) enabled")
+            return probe
+
+        probe.update(
+            enabled=True,
+            path=tesseract_path,
+            version=str(pytesseract.get_tesseract_version()),
+        )
+        logger.info(f"Tesseract OCR v{probe['version']} detected and enabled")
 
-    # Check available languages
-    if OCR_ENABLED:
+        # Check available languages
         try:
-            languages = pytesseract.get_languages()
-            logger.info(f"OCR Languages available: {languages}")
-            if "ara" in languages:
+            probe["languages"] = pytesseract.get_languages()
+            logger.info(f"OCR Languages available: {probe['languages']}")
+            if "ara" in probe["languages"]:
                 logger.info("Arabic OCR support: ENABLED")
             else:
                 logger.warning("Arabic OCR support: NOT AVAILABLE (install ara language pack)")
         except Exception as lang_e:
             logger.warning(f"Could not detect OCR languages: {lang_e}")
 
-except Exception as e:
-    logger.warning(f"Tesseract OCR not available: {e}")
-    logger.warning(
-        "OCR features will be disabled. Install from https://github.com/tesseract-ocr/tesseract"
-    )
+        try:
+            _atomic_write(
+                CONFIG["TESSERACT_PROBE_CACHE"],
+                lambda f: json.dump(
+                    {
+                        "path": tesseract_path,
+                        "mtime_ns": binary_stat.st_mtime_ns,
+                        "size": binary_stat.st_size,
+                        "version": probe["version"],
+                        "languages": probe["languages"],
+                    },
+                    f,
+                ),
+            )
+        except Exception as cache_e:
+            logger.debug(f"Could not cache Tesseract probe: {cache_e}")
+
+    except Exception as e:
+        probe["enabled"] = False
+        logger.warning(f"Tesseract OCR not available: {e}")
+        logger.warning(
+            "OCR features will be disabled. Install from https://github.com/tesseract-ocr/tesseract"
+        )
+
+    return probe
+
+
+# OCR availability is discovered on first use rather than at import time
+_tesseract_probe = None
+
+
+def get_ocr_engine_info():
+    """Get the (lazily probed) Tesseract status: enabled, path, version and languages."""
+    global _tesseract_probe
+    if _tesseract_probe is None:
+        _tesseract_probe = _probe_tesseract()
+    return _tesseract_probe
+
+
+def is_ocr_enabled():
+    """Check whether Tesseract OCR is available, probing for it on first call."""
+    return get_ocr_engine_info()["enabled"]
+
+
+def __getattr__(name):
+    # Backwards-compatible module attributes for the former import-time probe
+    if name == "OCR_ENABLED":
+        return is_ocr_enabled()
+    if name == "TESSERACT_VERSION":
+        return get_ocr_engine_info()["version"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def list_files(folder_path):
@@ -307,16 +473,28 @@ def get_file_hash(file_path):
         )
 
         hash_sha256 = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            # Read in chunks to avoid memory issues with large files
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
+        # Read into one reusable buffer to avoid memory issues with large files
+        buffer = bytearray(CONFIG["HASH_BUFFER_SIZE"])
+        view = memoryview(buffer)
+        with open(file_path, "rb", buffering=0) as f:
+            while size := f.readinto(buffer):
+                hash_sha256.update(view[:size])
         return hash_sha256.hexdigest()
     except Exception as e:
         logger.warning(f"Could not calculate hash for {file_path}: {e}")
         return None
 
 
+def get_file_stat(file_path):
+    """Return the (size, mtime_ns, inode) signature used to detect unchanged files."""
+    try:
+        stat = os.stat(file_path)
+        return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+    except OSError as e:
+        logger.warning(f"Could not stat {file_path}: {e}")
+        return None
+
+
 def extract_docx_segments(file_path):
     """Extract text from docx and segment into logical parts with table extraction"""
     try:
@@ -326,12 +504,13 @@ def extract_docx_segments(file_path):
         )  # Use consistent allowed extensions
 
         try:
-            doc = Document(file_path)
+            doc = load_docx(file_path, stream=CONFIG["DOCX_STREAM_READER"])
         except Exception as e:
             logger.error(f"Failed to open DOCX file {file_path}: {e}")
             return {"Error": f"Could not open DOCX file: {str(e)}"}
 
         tables = []
+        paragraphs = doc.paragraphs
 
         # Extract tables first
         for table_idx, table in enumerate(doc.tables):
@@ -339,7 +518,7 @@ def extract_docx_segments(file_path):
                 table_data = []
                 for row_idx, row in enumerate(table.rows):
                     try:
-                        row_data = [cell.text.strip() if cell.text else "" for cell in row.cells]
+                        row_data = [cell.strip() for cell in row]
                         if any(row_data):  # Only add non-empty rows
                             table_data.append(row_data)
                     except Exception as e:
@@ -383,11 +562,13 @@ def extract_docx_segments(file_path):
             "Heading 6",
         ]
 
+        classifier = get_section_classifier()
+
         # Process paragraphs in chunks to manage memory
-        for para_idx, para in enumerate(doc.paragraphs):
+        for para_idx, para in enumerate(paragraphs):
             try:
                 if para.text.strip():
-                    style_name = para.style.name if para.style and para.style.name else "Normal"
+                    style_name = para.style or "Normal"
                     item_text = para.text.strip()
 
                     is_header = False
@@ -401,14 +582,11 @@ def extract_docx_segments(file_path):
                         is_header = True
 
                     # Check regex-based detection (fallback)
-                    else:
-                        for pattern in CONFIG["HEADER_PATTERNS"]:
-                            if pattern.match(item_text):
-                                current_section = item_text[:100]
-                                if current_section not in segments:
-                                    segments[current_section] = []
-                                is_header = True
-                                break
+                    elif classifier.matches_header_patterns(item_text):
+                        current_section = item_text[:100]
+                        if current_section not in segments:
+                            segments[current_section] = []
+                        is_header = True
 
                     if not is_header:
                         segments[current_section].append(item_text)
@@ -429,7 +607,7 @@ def extract_docx_segments(file_path):
             "segments": segments,
             "tables": tables,
             "metadata": {
-                "paragraph_count": len(doc.paragraphs),  # Count from doc instead of content list
+                "paragraph_count": len(paragraphs),  # Count from doc instead of content list
                 "table_count": len(tables),
                 "section_count": len(segments),
             },
@@ -446,47 +624,148 @@ def extract_docx_segments(file_path):
         return {"Error": f"Unexpected error: {str(e)}"}
 
 
-def validate_ocr_quality(ocr_text, file_path):
-    """Validate OCR output quality and provide confidence metrics.
+# Character classes for OCR scoring, looked up per codepoint with NumPy
+_CHAR_OTHER, _CHAR_SPACE, _CHAR_LATIN, _CHAR_ARABIC, _CHAR_DIGIT = range(5)
+
+
+def _build_ocr_char_classes():
+    """Class per codepoint below U+3001 (the last whitespace codepoint); higher ones are "other"."""
+    table = np.full(0x3002, _CHAR_OTHER, dtype=np.uint8)
+    table[[code for code in range(0x3001) if chr(code).isspace()]] = _CHAR_SPACE
+    table[ord("A") : ord("Z") + 1] = _CHAR_LATIN
+    table[ord("a") : ord("z") + 1] = _CHAR_LATIN
+    table[0x0600:0x0700] = _CHAR_ARABIC
+    table[ord("0") : ord("9") + 1] = _CHAR_DIGIT
+    return table
+
+
+_OCR_CHAR_CLASSES = _build_ocr_char_classes()
+
+
+def count_ocr_text(text):
+    """Character class counts used to score OCR output.
+
+    The text is decoded to codepoints once and classified with a NumPy table
+    lookup, so every count comes from a single vectorized pass instead of
+    several Python loops. Counts from several pages can be summed and scored
+    together.
+    """
+    if not text:
+        return dict.fromkeys(
+            ("chars", "stripped_chars", "non_space", "latin", "arabic", "digits", "words"), 0
+        )
+    codes = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    classes = _OCR_CHAR_CLASSES[np.minimum(codes, len(_OCR_CHAR_CLASSES) - 1)]
+    counts = np.bincount(classes, minlength=5)
+
+    visible = np.flatnonzero(classes != _CHAR_SPACE)
+    is_space = classes == _CHAR_SPACE
+    # A word starts at every visible character that follows whitespace (or the start)
+    words = int(np.count_nonzero(~is_space[1:] & is_space[:-1])) + int(not is_space[0])
+    return {
+        "chars": len(text),
+        "stripped_chars": int(visible[-1] - visible[0] + 1) if len(visible) else 0,
+        "non_space": len(text) - int(counts[_CHAR_SPACE]),
+        "latin": int(counts[_CHAR_LATIN]),
+        "arabic": int(counts[_CHAR_ARABIC]),
+        "digits": int(counts[_CHAR_DIGIT]),
+        "words": words,
+    }
+
+
+def _sum_ocr_counts(counts_list):
+    totals = dict.fromkeys(("chars", "stripped_chars", "non_space", "latin", "arabic", "digits", "words"), 0)
+    for counts in counts_list:
+        for key in totals:
+            totals[key] += counts[key]
+    return totals
+
+
+def score_ocr_counts(counts, min_chars=100, min_words=10, min_letter_ratio=None):
+    """Score OCR output from count_ocr_text counts.
 
     Args:
-        ocr_text: Extracted text from OCR
-        file_path: Path to processed file (for logging)
+        counts: Dict from count_ocr_text (or summed over pages)
+        min_chars: Minimum stripped length before the text counts as too short
+        min_words: Minimum word count
+        min_letter_ratio: Optional minimum share of non-space characters that are
+            letters or digits (catches pages of OCR noise such as "|~;,")
 
     Returns:
-        tuple: (is_valid, quality_score, issues)
+        tuple: (quality_score 0-100, list of issues)
     """
     issues = []
     quality_score = 0
 
     # Check 1: Minimum content length
-    if len(ocr_text.strip()) < 100:
-        issues.append(f"Insufficient text content ({len(ocr_text)} chars, minimum 100)")
+    if counts["stripped_chars"] < min_chars:
+        issues.append(f"Insufficient text content ({counts['chars']} chars, minimum {min_chars})")
         quality_score -= 50
 
     # Check 2: Character density (non-space characters / total length)
-    non_space_chars = len([c for c in ocr_text if not c.isspace()])
-    char_density = non_space_chars / max(len(ocr_text), 1)
+    char_density = counts["non_space"] / max(counts["chars"], 1)
     if char_density < 0.3:
         issues.append(f"Low character density ({char_density:.2f}, minimum 0.3)")
         quality_score -= 30
 
     # Check 3: Language presence (English or Arabic)
-    has_english = any(c.isalpha() and ord(c) < 128 for c in ocr_text)
-    has_arabic = any("\u0600" <= c <= "\u06ff" for c in ocr_text)
-    if not has_english and not has_arabic:
+    if not counts["latin"] and not counts["arabic"]:
         issues.append("No recognizable language detected (English or Arabic)")
         quality_score -= 20
 
     # Check 4: Word count
-    words = ocr_text.split()
-    word_count = len(words)
-    if word_count < 10:
-        issues.append(f"Low word count ({word_count}, minimum 10)")
+    if counts["words"] < min_words:
+        issues.append(f"Low word count ({counts['words']}, minimum {min_words})")
         quality_score -= 20
 
+    # Check 5 (optional): Share of letters/digits among visible characters
+    if min_letter_ratio is not None and counts["non_space"]:
+        letter_ratio = (counts["latin"] + counts["arabic"] + counts["digits"]) / counts["non_space"]
+        if letter_ratio < min_letter_ratio:
+            issues.append(f"Mostly symbols ({letter_ratio:.2f} letters, minimum {min_letter_ratio})")
+            quality_score -= 30
+
     # Calculate final score (0-100 scale)
-    quality_score = max(0, min(100, 100 + quality_score))
+    return max(0, min(100, 100 + quality_score)), issues
+
+
+def score_ocr_page(text):
+    """Score one page of OCR text against the per-page thresholds.
+
+    Returns:
+        dict: score, issues, rejected flag (score below CONFIG["OCR_PAGE_MIN_SCORE"])
+        and the character counts, which extract_pdf_with_ocr sums for the document gate
+    """
+    counts = count_ocr_text(text)
+    score, issues = score_ocr_counts(
+        counts,
+        min_chars=CONFIG["OCR_PAGE_MIN_CHARS"],
+        min_words=CONFIG["OCR_PAGE_MIN_WORDS"],
+        min_letter_ratio=CONFIG["OCR_PAGE_MIN_LETTER_RATIO"],
+    )
+    return {
+        "score": score,
+        "issues": issues,
+        "rejected": score < CONFIG["OCR_PAGE_MIN_SCORE"],
+        "counts": counts,
+    }
+
+
+def validate_ocr_quality(ocr_text, file_path, counts=None):
+    """Validate OCR output quality and provide confidence metrics.
+
+    Args:
+        ocr_text: Extracted text from OCR
+        file_path: Path to processed file (for logging)
+        counts: Optional precomputed count_ocr_text counts (e.g. summed per page),
+            in which case ocr_text is not rescanned
+
+    Returns:
+        tuple: (is_valid, quality_score, issues)
+    """
+    if counts is None:
+        counts = count_ocr_text(ocr_text)
+    quality_score, issues = score_ocr_counts(counts)
 
     # Determine validity
     is_valid = quality_score >= 50 and len(issues) < 3
@@ -506,402 +785,1584 @@ def validate_ocr_quality(ocr_text, file_path):
     return is_valid, quality_score, issues
 
 
-def retry_ocr_page(page_num, page_img, max_retries=3, psm_modes=[6, 3, 1]):
-    """Retry OCR with different page segmentation modes for better accuracy.
-
-    Args:
-        page_num: Page number for logging
-        page_img: PIL Image object of the page
-        max_retries: Maximum number of retry attempts
-        psm_modes: List of PSM modes to try (6=uniform, 3=auto, 1=auto with OSD)
+def _pixmap_fingerprint(pix):
+    """Hash the rendered pixels of a page so identical page images share OCR results."""
+    hasher = hashlib.sha256()
+    hasher.update(f"{pix.width}x{pix.height}x{pix.n}:".encode())
+    hasher.update(pix.samples)
+    return hasher.hexdigest()
 
-    Returns:
-        str: Best OCR text obtained
-    """
-    best_text = ""
-    best_confidence = 0
 
-    for attempt, psm_mode in enumerate(psm_modes):
-        if attempt >= max_retries:
-            break
+def _pixmap_to_image(pix):
+    """Wrap a rendered pixmap's samples in a PIL image without a PNG round trip."""
+    mode = {1: "L", 3: "RGB", 4: "RGBA"}[pix.n]
+    return Image.frombytes(mode, (pix.width, pix.height), pix.samples)
 
-        try:
-            custom_config = f"--oem 3 --psm {psm_mode}"
-            text = pytesseract.image_to_string(page_img, lang="ara+eng", config=custom_config)
 
-            # Calculate simple quality score
-            if len(text.strip()) > len(best_text.strip()):
-                best_text = text
-                best_confidence = len(text.strip())
+def _ocr_pixmap(page, dpi):
+    """Rasterize a PDF page for OCR in CONFIG["OCR_COLORSPACE"]."""
+    colorspace = fitz.csRGB if CONFIG["OCR_COLORSPACE"] == "rgb" else fitz.csGRAY
+    return page.get_pixmap(dpi=dpi, colorspace=colorspace)
 
-            if attempt > 0:
-                logger.debug(
-                    f"OCR retry {attempt + 1}/max_{max_retries} for page {page_num} with PSM {psm_mode}"
-                )
 
-        except Exception as e:
-            logger.warning(f"OCR attempt {attempt + 1} failed for page {page_num}: {e}")
-            continue
+def _render_page(doc, page_num, dpi, context=None):
+    """Render a PDF page for OCR.
 
-    return best_text
+    Returns:
+        tuple: (PIL image, page image fingerprint)
+    """
+    if context is not None:
+        pix, fingerprint = context.get_pixmap(page_num, dpi)
+    else:
+        pix = _ocr_pixmap(doc.load_page(page_num), dpi)
+        fingerprint = _pixmap_fingerprint(pix)
+    return _pixmap_to_image(pix), fingerprint
 
 
-def extract_pdf_with_ocr(file_path):
-    """Extract text from PDF using OCR for scanned documents with validation."""
-    # Validate input
-    if not validate_file_path(
-        file_path, [".pdf"], os.path.dirname(file_path)
-    ):  # For OCR processing, only allow PDF
-        return {"Error": "Invalid file path or type for OCR processing"}
+class PDFDocumentContext:
+    """Shared state for a single pass over one PDF.
 
-    if not OCR_ENABLED:
-        logger.warning(f"OCR disabled, cannot process scanned PDF: {pathlib.Path(file_path).name}")
-        return {"Error": "OCR not available - cannot extract text from scanned PDF"}
+    The file is read from disk once; PyMuPDF and pdfplumber both parse the same
+    in-memory bytes. Page renders and the word-level OCR results of pages listed
+    in retain_pages are kept so a later stage (OCR table detection) can reuse
+    them instead of rasterizing or OCRing the page again.
+    """
 
-    doc = None
-    try:
-        logger.info(f"Running OCR on {pathlib.Path(file_path).name}...")
-        doc = fitz.open(file_path)
-        ocr_text = ""
+    def __init__(self, file_path, retain_pages=()):
+        self.file_path = str(file_path)
+        with open(file_path, "rb") as f:
+            self.data = f.read()
+        self.doc = fitz.open(stream=self.data, filetype="pdf")
+        self.retain_pages = set(retain_pages)
+        self.renders = 0
+        self.reused_renders = 0
+        self._plumber = None
+        self._pixmaps = {}
+        self._ocr_data = {}
+
+    @property
+    def plumber(self):
+        """pdfplumber view of the document, opened lazily from the shared bytes."""
+        if self._plumber is None:
+            self._plumber = pdfplumber.open(io.BytesIO(self.data))
+        return self._plumber
+
+    def get_pixmap(self, page_num, dpi):
+        """Render a page once, returning (pixmap, fingerprint)."""
+        key = (page_num, dpi)
+        if key in self._pixmaps:
+            self.reused_renders += 1
+            return self._pixmaps[key]
+
+        pix = _ocr_pixmap(self.doc.load_page(page_num), dpi)
+        self.renders += 1
+        rendered = (pix, _pixmap_fingerprint(pix))
+        if page_num in self.retain_pages:
+            self._pixmaps[key] = rendered
+        return rendered
+
+    def keep_ocr_data(self, page_num, ocr_data):
+        """Keep a retained page's image_to_data output from text OCR."""
+        if ocr_data is not None and page_num in self.retain_pages:
+            self._ocr_data[page_num] = ocr_data
+
+    def get_ocr_data(self, page_num):
+        """image_to_data output kept for a page by keep_ocr_data, or None."""
+        return self._ocr_data.get(page_num)
 
-        for page_num in range(len(doc)):
-            img = None
+    def close(self):
+        """Release the parsed documents and any retained page renders and OCR data."""
+        self._pixmaps.clear()
+        self._ocr_data.clear()
+        if self._plumber is not None:
             try:
-                page = doc.load_page(page_num)
-                pix = page.get_pixmap()
-                img = Image.open(io.BytesIO(pix.tobytes()))
-
-                # Validate image before OCR
-                if img.width > 10 and img.height > 10:  # Basic sanity check
-                    # Use retry logic with different PSM modes
-                    page_text = retry_ocr_page(page_num, img, max_retries=3)
-                    ocr_text += f"\n\n--- Page {page_num + 1} ---\n\n" + page_text
-                else:
-                    logger.warning(
-                        f"Page {page_num} has suspiciously small dimensions: {img.width}x{img.height}"
-                    )
+                self._plumber.close()
             except Exception as e:
-                logger.warning(f"OCR failed on page {page_num}: {e}")
-                continue
-            finally:
-                # Clean up image resource
-                if img:
-                    try:
-                        img.close()
-                    except:
-                        pass  # Best effort cleanup
+                logger.warning(f"Error closing pdfplumber document {self.file_path}: {e}")
+            self._plumber = None
+        try:
+            self.doc.close()
+        except Exception as e:
+            logger.warning(f"Error closing PDF document {self.file_path}: {e}")
 
-        # Validate OCR output quality
-        if len(ocr_text.strip()) < 10:
-            logger.warning(f"OCR produced minimal output for {pathlib.Path(file_path).name}")
-            return {"Error": "OCR produced insufficient text content (quality gate failed)"}
+    def __enter__(self):
+        return self
 
-        # Run quality gate validation
-        is_valid, quality_score, issues = validate_ocr_quality(ocr_text, file_path)
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-        if not is_valid:
-            logger.error(
-                f"OCR quality gate FAILED for {pathlib.Path(file_path).name} - "
-                f"quality_score={quality_score}%, issues={len(issues)}"
-            )
-            return {
-                "Error": f"OCR quality gate failed (score={quality_score}%): {issues[0] if issues else 'Unknown issue'}",
-                "quality_score": quality_score,
-                "issues": issues,
-            }
 
-        # Segment OCR text
-        segments = {
-            "OCR_Extracted_Content": ocr_text[: CONFIG["MAX_PREVIEW_LENGTH"]]
-        }  # Limit OCR output
+# Column order of Tesseract's TSV output (what image_to_data parses)
+TESSERACT_TSV_HEADER = "\t".join(
+    [
+        "level", "page_num", "block_num", "par_num", "line_num", "word_num",
+        "left", "top", "width", "height", "conf", "text",
+    ]
+)
 
-        # Add quality metadata
-        segments["_metadata"] = {
-            "extraction_method": "ocr",
-            "quality_score": quality_score,
-            "pages_processed": len(doc) if doc else 0,
-            "total_chars": len(ocr_text),
-        }
 
-        logger.info(
-            f"OCR extraction completed with quality score {quality_score}% for {pathlib.Path(file_path).name}"
-        )
-        return segments
+class PytesseractBackend:
+    """OCR through the tesseract command line: one subprocess per call."""
 
-    except FileNotFoundError:
-        logger.error(f"PDF file not found for OCR: {file_path}")
-        return {"Error": "File not found"}
-    except PermissionError:
-        logger.error(f"Permission denied for OCR on PDF: {file_path}")
-        return {"Error": "Permission denied"}
-    except Exception as e:
-        logger.error(f"OCR extraction failed for {file_path}: {e}", exc_info=True)
-        return {"Error": str(e)}
-    finally:
-        # Ensure document is closed even if an exception occurs
-        if doc:
-            try:
-                doc.close()
-            except Exception as e:
-                logger.warning(f"Error closing PDF document during OCR: {e}")
+    name = "pytesseract"
 
+    @staticmethod
+    def _config(psm_mode):
+        return f"--oem 3 --psm {psm_mode}"
 
-def extract_pdf_segments(file_path, max_pages=None):
-    """Extract text from PDF using PyMuPDF with better error handling and memory management."""
-    try:
-        # Validate file path before processing
-        validate_file_path(
-            file_path, [".pdf"], os.path.dirname(file_path)
-        )  # For PDF processing, only allow PDF
+    def image_to_data(self, image, lang, psm_mode):
+        return pytesseract.image_to_data(
+            image, lang=lang, config=self._config(psm_mode), output_type=pytesseract.Output.DICT
+        )
 
-        try:
-            doc = fitz.open(file_path)
-        except Exception as e:
-            logger.error(f"Failed to open PDF file {file_path}: {e}")
-            return {"Error": f"Could not open PDF file: {str(e)}"}
+    def image_to_string(self, image, lang, psm_mode):
+        return pytesseract.image_to_string(image, lang=lang, config=self._config(psm_mode))
 
+    def detect_script(self, image):
+        """Return (script name, confidence) from Tesseract OSD, or None if undetectable."""
         try:
-            total_pages = len(doc)
-
-            # Check if it's a scanned/image-only PDF
-            try:
-                first_page = doc.load_page(0)
-                text = str(first_page.get_text())
-            except Exception as e:
-                logger.error(f"Could not read first page of {file_path}: {e}")
-                doc.close()
-                return {"Error": "Could not read PDF content"}
+            osd = pytesseract.image_to_osd(
+                image, config="--psm 0", output_type=pytesseract.Output.DICT
+            )
+        except pytesseract.TesseractError as e:
+            if "Too few characters" in str(e):
+                return None
+            raise
+        return osd.get("script"), float(osd.get("script_conf", 0))
 
-            if len(text.strip()) < 50:  # Likely scanned PDF
-                logger.info(f"{pathlib.Path(file_path).name} appears to be scanned. Using OCR.")
-                doc.close()
-                return extract_pdf_with_ocr(file_path)
+    def close(self):
+        pass
 
-            page_limit = max_pages if max_pages else total_pages
-            logger.info(
-                f"Processing {pathlib.Path(file_path).name} ({min(total_pages, page_limit)} pages)..."
-            )
 
-            failed_pages = []
-            successful_pages = 0
+class TesserocrBackend:
+    """OCR with in-process Tesseract engines (tesserocr), reused across pages.
 
-            # Process pages in chunks to manage memory - use a more memory-efficient approach
-            segments = {}
-            current_section = "Content"
-            segments[current_section] = []
+    One PyTessBaseAPI is kept per language string, so traineddata is loaded once
+    per process instead of once per call, and images are handed over in memory
+    rather than through temporary files. Output matches the pytesseract backend:
+    image_to_data is parsed from the engine's TSV with pytesseract's parser.
+    """
 
-            # Track progress for large documents
-            progress_interval = max(1, min(total_pages, page_limit) // 10)  # Log every 10%
+    name = "tesserocr"
+
+    def __init__(self, tessdata_path=None):
+        import tesserocr
+
+        self._tesserocr = tesserocr
+        self._tessdata_path = tessdata_path
+        self._apis = {}
+        self._osd_api = None
+        self.lock = threading.Lock()  # An engine must not be used by two threads at once
+
+    def _api(self, lang, psm_mode):
+        api = self._apis.get(lang)
+        if api is None:
+            kwargs = {"lang": lang, "oem": self._tesserocr.OEM.DEFAULT}
+            if self._tessdata_path:
+                kwargs["path"] = self._tessdata_path
+            api = self._tesserocr.PyTessBaseAPI(**kwargs)
+            self._apis[lang] = api
+        api.SetPageSegMode(psm_mode)
+        return api
+
+    def detect_script(self, image):
+        """Return (script name, confidence) from Tesseract OSD, or None if undetectable."""
+        with self.lock:
+            if self._osd_api is None:
+                kwargs = {"lang": "osd", "psm": self._tesserocr.PSM.OSD_ONLY}
+                if self._tessdata_path:
+                    kwargs["path"] = self._tessdata_path
+                self._osd_api = self._tesserocr.PyTessBaseAPI(**kwargs)
+            self._osd_api.SetImage(image)
+            result = self._osd_api.DetectOrientationScript()
+        if not result:
+            return None
+        return result["script_name"], float(result["script_conf"])
+
+    def image_to_data(self, image, lang, psm_mode):
+        with self.lock:
+            api = self._api(lang, psm_mode)
+            api.SetImage(image)
+            api.Recognize()
+            tsv = api.GetTSVText(0)
+        return pytesseract.pytesseract.file_to_dict(f"{TESSERACT_TSV_HEADER}\n{tsv}", "\t", -1)
+
+    def image_to_string(self, image, lang, psm_mode):
+        with self.lock:
+            api = self._api(lang, psm_mode)
+            api.SetImage(image)
+            return api.GetUTF8Text()
 
-            for page_num in range(min(total_pages, page_limit)):
+    def close(self):
+        with self.lock:
+            apis = list(self._apis.values())
+            if self._osd_api is not None:
+                apis.append(self._osd_api)
+            for api in apis:
                 try:
-                    try:
-                        page = doc.load_page(page_num)
-                        page_text = page.get_text()
-                    except Exception as e:
-                        logger.warning(f"Could not load page {page_num} in {file_path}: {e}")
-                        failed_pages.append(page_num)
-                        continue
-
-                    # Process page text for segmentation without storing all in memory at once
-                    page_lines = page_text.split("\n")
-
-                    for line_idx, line in enumerate(page_lines):
-                        try:
-                            line = line.strip()
-                            if line:
-                                # Check if line is a potential section header
-                                is_header = False
-
-                                # Check for all caps headers with reasonable length
-                                if (
-                                    line.isupper()
-                                    and 10 <= len(line) <= 100
-                                    and len(line.split()) >= 2
-                                ):
-                                    is_header = True
-
-                                # Check for section keywords
-                                elif CONFIG["SECTION_KEYWORDS_PATTERN"].match(line):
-                                    is_header = True
-
-                                # Check for numbered sections (e.g., "1. Introduction")
-                                elif re.match(r"^\d+\.\s+\w+", line):
-                                    is_header = True
-
-                                if is_header:
-                                    current_section = line[:100]  # Limit header length
-                                    if current_section not in segments:
-                                        segments[current_section] = []
-                                else:
-                                    segments[current_section].append(line)
-                        except Exception as e:
-                            logger.warning(
-                                f"Error processing line {line_idx} on page {page_num}: {e}"
-                            )
-                            continue
+                    api.End()
+                except Exception as e:
+                    logger.debug(f"Error closing Tesseract engine: {e}")
+            self._apis.clear()
+            self._osd_api = None
 
-                    successful_pages += 1
 
-                    # Log progress for large documents
-                    if (page_num + 1) % progress_interval == 0:
-                        logger.debug(
-                            f"Processed {page_num + 1}/{min(total_pages, page_limit)} pages"
-                        )
+OCR_BACKENDS = {"pytesseract": PytesseractBackend, "tesserocr": TesserocrBackend}
 
-                except Exception as e:
-                    logger.warning(f"Error reading page {page_num}: {e}")
-                    failed_pages.append(page_num)
-                    continue
+_ocr_backend = None
+_ocr_backend_pid = None
 
-            # Log summary of extraction quality
-            if failed_pages:
-                logger.warning(f"Failed to extract {len(failed_pages)} pages: {failed_pages}")
 
-            if successful_pages == 0:
-                logger.error(f"No pages successfully extracted from {file_path}")
-                return {"Error": "No pages could be extracted"}
+def create_ocr_backend(name=None, fallback=True):
+    """Create an OCR backend by name, falling back to pytesseract.
 
-            logger.info(
-                f"Successfully extracted {successful_pages}/{min(total_pages, page_limit)} pages"
-            )
+    Args:
+        name: "auto", "tesserocr" or "pytesseract" (defaults to CONFIG["OCR_BACKEND"]);
+            "auto" uses tesserocr when it is installed
+        fallback: Use pytesseract when the in-process engine cannot be created
+            (otherwise the error is raised)
+    """
+    name = name or CONFIG["OCR_BACKEND"]
+    if name not in ("auto", *OCR_BACKENDS):
+        logger.warning(f"Unknown OCR backend {name!r}, using pytesseract")
+        name = "pytesseract"
 
-            # Clean up segments without hard truncation - optimize for memory
-            cleaned_segments = {}
-            for section in segments:
-                try:
-                    content = "\n".join(segments[section])
-                    # Only truncate if extremely long to avoid JSON issues
-                    if len(content) > 50000:
-                        content = content[:50000] + "\n\n... [Content truncated - file too large]"
-                    cleaned_segments[section] = content
-                except Exception as e:
-                    logger.warning(f"Error processing segment '{section}': {e}")
-                    cleaned_segments[section] = ""
+    if name in ("auto", "tesserocr"):
+        try:
+            return TesserocrBackend(CONFIG["TESSDATA_PATH"])
+        except ImportError:
+            if not fallback:
+                raise
+            log = logger.debug if name == "auto" else logger.warning
+            log("tesserocr not installed, using pytesseract for OCR")
+        except Exception as e:
+            if not fallback:
+                raise
+            logger.warning(f"In-process Tesseract engine unavailable ({e}), using pytesseract")
+    return PytesseractBackend()
 
-            return cleaned_segments
 
-        finally:
-            try:
-                doc.close()
-            except Exception as e:
-                logger.warning(f"Error closing PDF document {file_path}: {e}")
+def get_ocr_backend():
+    """Get this process's OCR backend, creating it on first use.
 
-    except FileNotFoundError:
-        logger.error(f"PDF file not found: {file_path}")
-        return {"Error": "File not found"}
-    except PermissionError:
-        logger.error(f"Permission denied accessing PDF file: {file_path}")
-        return {"Error": "Permission denied"}
-    except Exception as e:
-        logger.error(f"PDF extraction failed for {file_path}: {e}", exc_info=True)
-        return {"Error": f"PDF extraction failed: {str(e)}"}
+    Each process (including pool workers) gets its own engine, which then serves
+    every page that process OCRs.
+    """
+    global _ocr_backend, _ocr_backend_pid
 
+    if _ocr_backend is None or _ocr_backend_pid != os.getpid():
+        _ocr_backend = create_ocr_backend()
+        _ocr_backend_pid = os.getpid()
+        logger.debug(f"OCR backend: {_ocr_backend.name}")
+    return _ocr_backend
 
-def extract_table_from_image(image_path):
-    """Extract table data from image using OCR"""
-    if not OCR_ENABLED:
-        return {"Error": "OCR not available"}
 
-    try:
-        img = Image.open(image_path)
-        text = pytesseract.image_to_string(img, lang="ara+eng")
-        # Basic table parsing
-        lines = text.split("\n")
-        table_data = [line.split("\t") for line in lines if line.strip()]
-        return table_data
-    except Exception as e:
-        logger.error(f"Error extracting table from image: {e}")
-        return {"Error": str(e)}
+def close_ocr_backend():
+    """Release this process's OCR engine (a new one is created on next use)."""
+    global _ocr_backend
+    if _ocr_backend is not None and _ocr_backend_pid == os.getpid():
+        _ocr_backend.close()
+    _ocr_backend = None
 
 
-def extract_tables_from_pdf(file_path):
-    """Extract tables from PDF using pdfplumber with OCR fallback.
+def detect_page_lang(page_img, fingerprint=None, dpi=None):
+    """Choose the Tesseract language(s) for one page image from its script.
 
-    Args:
-        file_path: Path to PDF file
+    Tesseract's orientation and script detection (OSD) is far cheaper than a
+    recognition pass. A page whose dominant script is detected with at least
+    CONFIG["OCR_SCRIPT_MIN_CONFIDENCE"] is OCRed with that script's model alone
+    (see CONFIG["OCR_SCRIPT_LANGS"]); anything else keeps CONFIG["OCR_LANG"].
+    With a page fingerprint the decision is stored in the OCR cache next to the
+    page's OCR results.
 
     Returns:
-        list: List of extracted tables with metadata
+        tuple: (lang, detected script or None)
     """
-    tables = []
+    default_lang = CONFIG["OCR_LANG"]
+    if not CONFIG["OCR_SCRIPT_DETECTION"]:
+        return default_lang, None
 
-    try:
-        logger.info(f"Extracting tables from {pathlib.Path(file_path).name} using pdfplumber...")
-        with pdfplumber.open(file_path) as pdf:
-            for page_num, page in enumerate(pdf.pages):
-                try:
-                    # Extract tables using pdfplumber
-                    page_tables = page.extract_tables()
-
-                    if page_tables:
-                        for table_idx, table_data in enumerate(page_tables):
-                            try:
-                                # Clean and format table data
-                                clean_table = []
-                                for row_idx, row in enumerate(table_data):
-                                    if row:  # Skip empty rows
-                                        # Clean cell text
-                                        clean_row = [
-                                            str(cell).strip() if cell else "" for cell in row
-                                        ]
-                                        # Only add non-empty rows
-                                        if any(clean_row):
-                                            clean_table.append(clean_row)
-
-                                if clean_table:
-                                    tables.append(
-                                        {
-                                            "page": page_num + 1,
-                                            "rows": len(clean_table),
-                                            "columns": len(clean_table[0]) if clean_table else 0,
-                                            "data": clean_table,
-                                        }
-                                    )
-                                    logger.debug(
-                                        f"Found table on page {page_num + 1}, table {table_idx}: {len(clean_table)} rows, {len(clean_table[0]) if clean_table else 0} cols"
-                                    )
-                            except Exception as table_e:
-                                logger.warning(
-                                    f"Error processing table {table_idx} on page {page_num + 1}: {table_e}"
-                                )
-                                continue
-
-                except Exception as page_e:
-                    logger.warning(f"Error extracting tables from page {page_num + 1}: {page_e}")
-                    continue
+    backend = get_ocr_backend()
+    if getattr(backend, "script_detection_failed", False):
+        return default_lang, None
 
-        logger.info(f"Extracted {len(tables)} tables using pdfplumber")
-        return tables
+    cache = get_ocr_cache() if fingerprint else None
+    if cache:
+        cache_key = cache.make_key(fingerprint, "osd", 0, dpi, kind="script")
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached["lang"], cached["script"]
 
-    except FileNotFoundError:
-        logger.error(f"PDF file not found for table extraction: {file_path}")
-        return []
-    except PermissionError:
-        logger.error(f"Permission denied for table extraction on PDF: {file_path}")
-        return []
+    try:
+        detected = backend.detect_script(page_img)
     except Exception as e:
-        logger.error(f"PDF table extraction with pdfplumber failed: {e}", exc_info=True)
+        # Usually missing osd.traineddata; don't retry on every page
+        logger.warning(f"Script detection unavailable, using {default_lang} for all pages: {e}")
+        backend.script_detection_failed = True
+        return default_lang, None
+
+    script = None
+    lang = default_lang
+    if detected:
+        script, confidence = detected
+        script_lang = CONFIG["OCR_SCRIPT_LANGS"].get(script)
+        if (
+            script_lang in default_lang.split("+")
+            and confidence >= CONFIG["OCR_SCRIPT_MIN_CONFIDENCE"]
+        ):
+            lang = script_lang
 
-        # Fallback to OCR-based table detection
-        if OCR_ENABLED:
-            logger.info(
-                f"Falling back to OCR-based table detection for {pathlib.Path(file_path).name}..."
-            )
-            return detect_tables_with_ocr(file_path)
-        else:
-            logger.warning("OCR disabled - cannot extract tables from PDF")
-            return []
+    if cache:
+        cache.put(cache_key, {"lang": lang, "script": script})
+    return lang, script
 
 
-def detect_tables_with_ocr(file_path):
-    """Detect and extract tables from PDF using OCR as fallback.
+def _ocr_image_data(page_img, lang, psm_mode, fingerprint=None, dpi=None):
+    """Run Tesseract on an image and return word-level results from image_to_data.
 
-    This function is called when pdfplumber fails or is unavailable.
+    When a page fingerprint is given, results are served from and stored in the
+    persistent OCR cache.
     """
-    doc = None
-    try:
-        doc = fitz.open(file_path)
+    cache = get_ocr_cache() if fingerprint else None
+    if cache:
+        cache_key = cache.make_key(fingerprint, lang, psm_mode, dpi, kind="data")
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    result = get_ocr_backend().image_to_data(page_img, lang, psm_mode)
+
+    if cache:
+        cache.put(cache_key, result)
+    return result
+
+
+def _summarize_ocr_data(ocr_data):
+    """Rebuild page text from image_to_data output and score its word confidences.
+
+    Returns:
+        dict: text, mean word confidence, coverage (share of words at or above
+        CONFIG["OCR_WORD_CONFIDENCE_FLOOR"]), word count and confident character count
+    """
+    lines = {}
+    confidences = []
+    confident_chars = 0
+    floor = CONFIG["OCR_WORD_CONFIDENCE_FLOOR"]
+
+    for idx, word in enumerate(ocr_data.get("text", [])):
+        word = (word or "").strip()
+        try:
+            confidence = float(ocr_data["conf"][idx])
+        except (KeyError, IndexError, TypeError, ValueError):
+            confidence = -1.0
+        if not word or confidence < 0:
+            continue
+
+        line_key = (
+            ocr_data["block_num"][idx],
+            ocr_data["par_num"][idx],
+            ocr_data["line_num"][idx],
+        )
+        lines.setdefault(line_key, []).append(word)
+        confidences.append(confidence)
+        if confidence >= floor:
+            confident_chars += len(word)
+
+    text_lines = []
+    previous_block = None
+    for (block_num, par_num, line_num), words in lines.items():
+        if previous_block is not None and block_num != previous_block:
+            text_lines.append("")
+        text_lines.append(" ".join(words))
+        previous_block = block_num
+
+    word_count = len(confidences)
+    return {
+        "text": "\n".join(text_lines),
+        "confidence": round(sum(confidences) / word_count, 1) if word_count else 0.0,
+        "coverage": (
+            round(sum(1 for c in confidences if c >= floor) / word_count, 3) if word_count else 0.0
+        ),
+        "word_count": word_count,
+        "confident_chars": confident_chars,
+    }
+
+
+def retry_ocr_page(
+    page_num,
+    page_img,
+    max_retries=3,
+    psm_modes=None,
+    min_confidence=None,
+    min_coverage=None,
+    return_details=False,
+    fingerprint=None,
+    dpi=None,
+    lang=None,
+):
+    """Run OCR with different page segmentation modes, stopping at the first confident result.
+
+    Each attempt uses image_to_data so per-word confidences are available, and its
+    text is scored with score_ocr_page. As soon as a mode produces acceptable text
+    that reaches both the confidence and the coverage threshold the remaining
+    modes are skipped. Otherwise acceptable attempts beat rejected (garbage) ones,
+    and among those the attempt with the most confidently recognized text wins.
+
+    Args:
+        page_num: Page number for logging
+        page_img: PIL Image object of the page
+        max_retries: Maximum number of retry attempts
+        psm_modes: List of PSM modes to try (6=uniform, 3=auto, 1=auto with OSD),
+            defaults to CONFIG["OCR_PSM_MODES"]
+        min_confidence: Mean word confidence needed to stop early
+            (defaults to CONFIG["OCR_MIN_CONFIDENCE"])
+        min_coverage: Share of confident words needed to stop early
+            (defaults to CONFIG["OCR_MIN_COVERAGE"])
+        return_details: If True, return a dict with the winning mode and scores
+        fingerprint: Optional page image fingerprint enabling the persistent OCR cache
+        dpi: Render DPI of page_img (part of the OCR cache key)
+        lang: Tesseract language(s) (defaults to CONFIG["OCR_LANG"])
+
+    Returns:
+        str: Best OCR text obtained, or a dict with text, psm, confidence, coverage,
+        attempts, the page quality (quality_score, rejected, issues, counts) and
+        the winning image_to_data output ("data") when return_details is True
+    """
+    psm_modes = psm_modes or CONFIG["OCR_PSM_MODES"]
+    lang = lang or CONFIG["OCR_LANG"]
+    min_confidence = CONFIG["OCR_MIN_CONFIDENCE"] if min_confidence is None else min_confidence
+    min_coverage = CONFIG["OCR_MIN_COVERAGE"] if min_coverage is None else min_coverage
+
+    best = {"text": "", "psm": None, "confidence": 0.0, "coverage": 0.0, "confident_chars": -1}
+    best_quality = score_ocr_page("")
+    best_data = None
+    attempts = 0
+
+    for attempt, psm_mode in enumerate(psm_modes):
+        if attempt >= max_retries:
+            break
+
+        try:
+            attempts += 1
+            ocr_data = _ocr_image_data(page_img, lang, psm_mode, fingerprint=fingerprint, dpi=dpi)
+            summary = _summarize_ocr_data(ocr_data)
+            quality = score_ocr_page(summary["text"])
+
+            if attempt > 0:
+                logger.debug(
+                    f"OCR retry {attempt + 1}/max_{max_retries} for page {page_num} with PSM {psm_mode}"
+                )
+
+            # Keep the usable attempt with the most confidently recognized text
+            if (not quality["rejected"], summary["confident_chars"]) > (
+                not best_quality["rejected"],
+                best["confident_chars"],
+            ):
+                best = dict(summary, psm=psm_mode)
+                best_quality = quality
+                best_data = ocr_data
+
+            if quality["rejected"]:
+                logger.debug(
+                    f"OCR page {page_num}: PSM {psm_mode} output rejected "
+                    f"(score={quality['score']}, issues={quality['issues']})"
+                )
+            elif summary["confidence"] >= min_confidence and summary["coverage"] >= min_coverage:
+                logger.debug(
+                    f"OCR page {page_num}: PSM {psm_mode} cleared threshold "
+                    f"(confidence={summary['confidence']}, coverage={summary['coverage']})"
+                )
+                break
+
+        except Exception as e:
+            logger.warning(f"OCR attempt {attempt + 1} failed for page {page_num}: {e}")
+            continue
+
+    if not return_details:
+        return best["text"]
+
+    return {
+        "text": best["text"],
+        "psm": best["psm"],
+        "lang": lang,
+        "confidence": best["confidence"],
+        "coverage": best["coverage"],
+        "attempts": attempts,
+        "quality_score": best_quality["score"],
+        "rejected": best_quality["rejected"],
+        "issues": best_quality["issues"],
+        "counts": best_quality["counts"],
+        "data": best_data,
+    }
+
+
+def _should_split_pages(page_count, page_workers):
+    """Decide whether a PDF is large enough to be split across page workers."""
+    return bool(page_workers) and page_workers > 1 and page_count >= CONFIG["PAGE_PARALLEL_MIN_PAGES"]
+
+
+def _page_ranges(page_count, page_workers):
+    """Split [0, page_count) into contiguous, ordered page ranges for worker processes."""
+    chunk_size = min(CONFIG["PAGE_CHUNK_SIZE"], -(-page_count // page_workers))
+    chunk_size = max(1, chunk_size)
+    return [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+
+
+def _map_page_ranges(range_func, file_path, page_count, page_workers):
+    """Run range_func(file_path, start, end) over page ranges on a process pool.
+
+    Returns:
+        list: Per-range results, in page order
+    """
+    ranges = _page_ranges(page_count, page_workers)
+    logger.info(
+        f"Splitting {pathlib.Path(file_path).name} into {len(ranges)} page ranges "
+        f"across {min(page_workers, len(ranges))} processes"
+    )
+    return list(_iter_page_range_results(range_func, file_path, ranges, page_workers))
+
+
+def _iter_page_range_results(range_func, file_path, ranges, page_workers):
+    """Yield range_func results in page order, releasing each one once it is consumed.
+
+    Stage timings recorded in the workers are merged into the caller's file
+    stats as each range is consumed.
+    """
+    with ProcessPoolExecutor(max_workers=min(page_workers, len(ranges))) as pool:
+        futures = deque(
+            pool.submit(_timed_page_range, range_func, str(file_path), start, end)
+            for start, end in ranges
+        )
+        while futures:
+            results, stages = futures.popleft().result()
+            _merge_worker_stages(stages)
+            yield results
+
+
+def _timed_page_range(range_func, file_path, start, end):
+    """Worker entry point: run range_func(file_path, start, end) with its own stage timings.
+
+    Returns:
+        tuple: (range_func result, stage -> seconds spent in this worker)
+    """
+    global _file_stats, _stage_stack
+    _file_stats = {"stages": {}, "pages": 0, "bytes": 0, "seconds": 0.0}
+    _stage_stack = []
+    try:
+        return range_func(file_path, start, end), _file_stats["stages"]
+    finally:
+        _file_stats = None
+
+
+def _ocr_page_at(doc, page_num, dpi, psm_modes=None, context=None, lang=None):
+    """Render one page at ``dpi`` and OCR it, returning retry_ocr_page details or None.
+
+    Without an explicit ``lang`` the page's language model is chosen by
+    detect_page_lang.
+    """
+    img = None
+    try:
+        img, fingerprint = _render_page(doc, page_num, dpi, context)
+
+        # Validate image before OCR
+        if img.width > 10 and img.height > 10:  # Basic sanity check
+            script = None
+            if lang is None:
+                lang, script = detect_page_lang(img, fingerprint, dpi)
+            # Use retry logic with different PSM modes
+            details = retry_ocr_page(
+                page_num,
+                img,
+                max_retries=len(psm_modes or CONFIG["OCR_PSM_MODES"]),
+                psm_modes=psm_modes,
+                return_details=True,
+                fingerprint=fingerprint,
+                dpi=dpi,
+                lang=lang,
+            )
+            details["dpi"] = dpi
+            details["script"] = script
+            return details
+        logger.warning(
+            f"Page {page_num} has suspiciously small dimensions: {img.width}x{img.height}"
+        )
+        return None
+    except Exception as e:
+        logger.warning(f"OCR failed on page {page_num}: {e}")
+        return None
+    finally:
+        # Clean up image resource
+        if img:
+            try:
+                img.close()
+            except Exception:
+                pass  # Best effort cleanup
+
+
+def _needs_high_dpi(page_ocr):
+    """True if a fast-pass OCR result is poor enough to redo at CONFIG["OCR_HIGH_DPI"]."""
+    return (
+        page_ocr is None
+        or page_ocr["rejected"]
+        or page_ocr["confidence"] < CONFIG["OCR_HIGH_DPI_MIN_CONFIDENCE"]
+    )
+
+
+def _ocr_page(doc, page_num, context=None):
+    """OCR one page of an open PDF, returning retry_ocr_page details or None on failure.
+
+    The winning word-level data is dropped from the details; with a shared
+    context it is kept there for OCR table detection.
+    """
+    page_ocr = _ocr_page_tiered(doc, page_num, context)
+    if page_ocr is not None:
+        ocr_data = page_ocr.pop("data", None)
+        if context is not None:
+            context.keep_ocr_data(page_num, ocr_data)
+    return page_ocr
+
+
+def _ocr_page_tiered(doc, page_num, context=None):
+    """OCR one page, retrying poorly read pages at a higher DPI.
+
+    With CONFIG["OCR_HIGH_DPI"] set, OCR is tiered: a fast pass renders the page
+    at CONFIG["OCR_DPI"] and tries only the first PSM mode; pages it reads poorly
+    (rejected or below CONFIG["OCR_HIGH_DPI_MIN_CONFIDENCE"]) are rendered again
+    at the high DPI and go through the full PSM ladder. The better of the two
+    results is kept; "dpi" and "high_dpi" in the details say which tier won and
+    whether the page was retried. The high-DPI pass always uses the full
+    CONFIG["OCR_LANG"], so a page misread with a single-language model (e.g. a
+    mixed Arabic/English page) gets both models on retry.
+    """
+    high_dpi = CONFIG["OCR_HIGH_DPI"]
+    if not high_dpi or high_dpi <= CONFIG["OCR_DPI"]:
+        return _ocr_page_at(doc, page_num, CONFIG["OCR_DPI"], context=context)
+
+    fast = _ocr_page_at(doc, page_num, CONFIG["OCR_DPI"], CONFIG["OCR_PSM_MODES"][:1], context)
+    if not _needs_high_dpi(fast):
+        fast["high_dpi"] = False
+        return fast
+
+    # High-resolution renders are not retained in the shared context
+    detailed = _ocr_page_at(doc, page_num, high_dpi, lang=CONFIG["OCR_LANG"])
+    candidates = [result for result in (fast, detailed) if result is not None]
+    if not candidates:
+        return None
+    best = max(
+        candidates, key=lambda r: (not r["rejected"], r["quality_score"], r["confidence"])
+    )
+    best["attempts"] = sum(result["attempts"] for result in candidates)
+    best["high_dpi"] = True
+    logger.debug(
+        f"Page {page_num}: fast pass confidence "
+        f"{fast['confidence'] if fast else 'n/a'} -> {best['dpi']} DPI result kept"
+    )
+    return best
+
+
+def _ocr_quality_gate(totals, file_path):
+    """Run the document-level OCR quality gate on page counts summed over the kept pages.
+
+    Returns:
+        tuple: (quality_score, None) if the document passes, else (None, error dict)
+    """
+    if totals["stripped_chars"] < 10:
+        logger.warning(f"OCR produced minimal output for {pathlib.Path(file_path).name}")
+        return None, {"Error": "OCR produced insufficient text content (quality gate failed)"}
+
+    is_valid, quality_score, issues = validate_ocr_quality("", file_path, counts=totals)
+    if not is_valid:
+        logger.error(
+            f"OCR quality gate FAILED for {pathlib.Path(file_path).name} - "
+            f"quality_score={quality_score}%, issues={len(issues)}"
+        )
+        return None, {
+            "Error": f"OCR quality gate failed (score={quality_score}%): {issues[0] if issues else 'Unknown issue'}",
+            "quality_score": quality_score,
+            "issues": issues,
+        }
+    return quality_score, None
+
+
+def extract_pdf_with_ocr(file_path, page_workers=None, context=None, memory_limit=None):
+    """Extract text from a scanned PDF with OCR.
+
+    A thin wrapper over extract_pdf_segments, which already routes image-only
+    pages to OCR, keeps rejected OCR output out of the text and runs the
+    document-level quality gate when no page has a text layer; this only adds
+    the up-front check that OCR is available at all.
+
+    Args:
+        file_path: Path to PDF file
+        page_workers: Number of processes to split large PDFs across
+            (defaults to CONFIG["PAGE_WORKERS"])
+        context: Optional PDFDocumentContext shared with other extraction stages
+        memory_limit: Section characters kept in memory before spilling to disk
+            (defaults to CONFIG["SEGMENT_MEMORY_LIMIT"])
+
+    Returns:
+        dict: section -> text plus "_metadata", or {"Error": message}
+    """
+    if not is_ocr_enabled():
+        logger.warning(f"OCR disabled, cannot process scanned PDF: {pathlib.Path(file_path).name}")
+        return {"Error": "OCR not available - cannot extract text from scanned PDF"}
+    return extract_pdf_segments(
+        file_path, page_workers=page_workers, context=context, memory_limit=memory_limit
+    )
+
+
+def ocr_pdf_pages(file_path, pages, psm_modes=None, dpi=None):
+    """OCR selected pages of a PDF, e.g. the "rejected_pages" listed in segment metadata.
+
+    Only the requested pages are rendered, so a bad page can be retried (with
+    other PSM modes or a higher DPI) without redoing the whole file.
+
+    Args:
+        file_path: Path to PDF file
+        pages: 1-based page numbers
+        psm_modes: Optional PSM modes to try instead of CONFIG["OCR_PSM_MODES"]
+        dpi: Optional render resolution instead of CONFIG["OCR_DPI"]
+
+    Returns:
+        dict: page number -> retry_ocr_page details (None for pages that failed),
+        or {"Error": message}
+    """
+    if not is_ocr_enabled():
+        return {"Error": "OCR not available"}
+
+    dpi = dpi or CONFIG["OCR_DPI"]
+    results = {}
+    try:
+        with fitz.open(file_path) as doc:
+            for page in pages:
+                if not 1 <= page <= len(doc):
+                    results[page] = None
+                    continue
+                img = None
+                try:
+                    pix = _ocr_pixmap(doc.load_page(page - 1), dpi)
+                    img = _pixmap_to_image(pix)
+                    results[page] = retry_ocr_page(
+                        page - 1,
+                        img,
+                        max_retries=len(psm_modes or CONFIG["OCR_PSM_MODES"]),
+                        psm_modes=psm_modes,
+                        return_details=True,
+                        fingerprint=_pixmap_fingerprint(pix),
+                        dpi=dpi,
+                    )
+                except Exception as e:
+                    logger.warning(f"OCR failed on page {page} of {file_path}: {e}")
+                    results[page] = None
+                finally:
+                    if img:
+                        img.close()
+    except Exception as e:
+        logger.error(f"Could not OCR pages of {file_path}: {e}")
+        return {"Error": str(e)}
+    return results
+
+
+def _ocr_page_record(page_num, page_ocr):
+    """Per-page OCR summary stored in segment metadata (1-based page number)."""
+    return {
+        "page": page_num + 1,
+        "psm": page_ocr["psm"],
+        "lang": page_ocr.get("lang"),
+        "confidence": page_ocr["confidence"],
+        "coverage": page_ocr["coverage"],
+        "attempts": page_ocr["attempts"],
+        "quality_score": page_ocr["quality_score"],
+        "rejected": page_ocr["rejected"],
+        "dpi": page_ocr.get("dpi"),
+        "high_dpi": page_ocr.get("high_dpi", False),
+    }
+
+
+def _page_method_runs(methods):
+    """Collapse per-page methods into runs: [{"start": 1, "end": 3, "method": "text"}, ...]."""
+    runs = []
+    for page_num, method in enumerate(methods, start=1):
+        if runs and runs[-1]["method"] == method and runs[-1]["end"] == page_num - 1:
+            runs[-1]["end"] = page_num
+        else:
+            runs.append({"start": page_num, "end": page_num, "method": method})
+    return runs
+
+
+def _image_coverage(page):
+    """Share of the page area covered by placed images (capped at 1.0)."""
+    page_area = page.rect.get_area()
+    if not page_area:
+        return 0.0
+    covered = sum(
+        fitz.Rect(info["bbox"]).intersect(page.rect).get_area() for info in page.get_image_info()
+    )
+    return min(1.0, covered / page_area)
+
+
+def classify_pdf_page(page):
+    """Decide whether a page is read from its text layer or needs OCR.
+
+    A page with at least CONFIG["PAGE_TEXT_MIN_CHARS"] characters of text is a
+    text page. A sparse page goes to OCR only when images cover at least
+    CONFIG["PAGE_IMAGE_COVERAGE"] of it; blank or near-empty vector pages keep
+    their (short) text layer, since OCR would not find anything more.
+
+    Returns:
+        tuple: (method, text layer) where method is "text" or "ocr"
+    """
+    text = page.get_text()
+    if len(text.strip()) >= CONFIG["PAGE_TEXT_MIN_CHARS"]:
+        return "text", text
+    if _image_coverage(page) >= CONFIG["PAGE_IMAGE_COVERAGE"]:
+        return "ocr", text
+    return "text", text
+
+
+def _iter_routed_pages(doc, start, end, context=None):
+    """Read pages [start, end), OCRing only the pages classify_pdf_page routes to OCR.
+
+    Yields:
+        tuple: (page_num, text or None, method, OCR details or None); method is
+        "text", "ocr", "ocr_unavailable", "ocr_failed" or "ocr_rejected" (the
+        last three keep the text layer), or "failed" when the page could not be read
+    """
+    for page_num in range(start, end):
+        try:
+            method, text = classify_pdf_page(doc.load_page(page_num))
+        except Exception as e:
+            logger.warning(f"Could not load page {page_num} in {doc.name}: {e}")
+            yield page_num, None, "failed", None
+            continue
+
+        if method == "text":
+            yield page_num, text, method, None
+        elif not is_ocr_enabled():
+            yield page_num, text, "ocr_unavailable", None
+        else:
+            with stage_timer("ocr"):
+                page_ocr = _ocr_page(doc, page_num, context)
+            if page_ocr is None:
+                yield page_num, text, "ocr_failed", None
+            elif page_ocr["rejected"]:
+                yield page_num, text, "ocr_rejected", page_ocr
+            else:
+                yield page_num, page_ocr["text"], method, page_ocr
+
+
+def _route_page_range(file_path, start, end):
+    """Worker entry point: read a page range with per-page text/OCR routing."""
+    doc = fitz.open(file_path)
+    try:
+        return list(_iter_routed_pages(doc, start, end))
+    finally:
+        doc.close()
+
+
+def _record_page_routes(routed_pages, page_methods, ocr_pages, ocr_totals=None):
+    """Pass (page_num, text) pairs through to segmentation, noting how each page was read.
+
+    The counts of pages whose OCR text is used are added to ``ocr_totals``.
+    """
+    for page_num, text, method, page_ocr in routed_pages:
+        page_methods.append(method)
+        if page_ocr is not None:
+            ocr_pages.append(_ocr_page_record(page_num, page_ocr))
+            if method == "ocr" and ocr_totals is not None:
+                ocr_totals.update(_sum_ocr_counts([ocr_totals, page_ocr["counts"]]))
+        yield page_num, text
+
+
+class SectionSpool:
+    """Ordered section -> text accumulator with a bounded in-memory footprint.
+
+    Lines are buffered per section until the total buffered text exceeds
+    ``memory_limit`` characters; the largest buffered section is then appended
+    to its own temporary file. Reading a section joins its spilled and buffered
+    parts, so content is never truncated however large a section grows.
+    """
+
+    def __init__(self, memory_limit=None, spill_dir=None):
+        self.memory_limit = (
+            memory_limit if memory_limit is not None else CONFIG["SEGMENT_MEMORY_LIMIT"]
+        )
+        self.spill_dir = spill_dir or CONFIG["SEGMENT_SPILL_DIR"]
+        self._buffers = {}  # section -> buffered lines, in first-seen order
+        self._sizes = {}  # section -> buffered characters
+        self._spills = {}  # section -> temporary file holding earlier lines
+        self.buffered_chars = 0
+        self.spilled_chars = 0
+        self.metadata = None  # Emitted as the "_metadata" segment when set
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __contains__(self, section):
+        return section in self._buffers
+
+    def __len__(self):
+        return len(self._buffers)
+
+    def add_section(self, section):
+        """Register a section so it is kept (and ordered) even if it stays empty."""
+        if section not in self._buffers:
+            self._buffers[section] = []
+            self._sizes[section] = 0
+
+    def append(self, section, line):
+        """Append a line to a section, spilling buffered text if over the limit."""
+        self.add_section(section)
+        self._buffers[section].append(line)
+        size = len(line) + 1
+        self._sizes[section] += size
+        self.buffered_chars += size
+        while self.buffered_chars > self.memory_limit:
+            self._spill_largest()
+
+    def _spill_largest(self):
+        section = max(self._sizes, key=self._sizes.get)
+        spill = self._spills.get(section)
+        if spill is None:
+            spill = tempfile.TemporaryFile(
+                mode="w+", encoding="utf-8", newline="", dir=self.spill_dir, prefix="section_"
+            )
+            self._spills[section] = spill
+        elif spill.tell():
+            spill.write("\n")
+        spill.write("\n".join(self._buffers[section]))
+
+        self.buffered_chars -= self._sizes[section]
+        self.spilled_chars += self._sizes[section]
+        self._buffers[section] = []
+        self._sizes[section] = 0
+
+    @property
+    def spilled_sections(self):
+        return list(self._spills)
+
+    def sections(self):
+        return list(self._buffers)
+
+    def read(self, section):
+        """Return the full text of a section (lines joined with newlines)."""
+        buffered = "\n".join(self._buffers[section])
+        spill = self._spills.get(section)
+        if spill is None:
+            return buffered
+        spill.flush()
+        spill.seek(0)
+        spilled = spill.read()
+        spill.seek(0, os.SEEK_END)
+        return f"{spilled}\n{buffered}" if buffered else spilled
+
+    def items(self):
+        """Yield (section, text) pairs one section at a time, then "_metadata" if set."""
+        for section in self.sections():
+            yield section, self.read(section)
+        if self.metadata is not None:
+            yield "_metadata", self.metadata
+
+    def close(self):
+        for spill in self._spills.values():
+            try:
+                spill.close()
+            except Exception as e:
+                logger.warning(f"Error closing spilled section file: {e}")
+        self._spills.clear()
+
+
+def _segment_page_texts(page_texts, page_count, memory_limit=None):
+    """Split ordered (page_num, text) pairs into header-delimited sections.
+
+    Pages are consumed one at a time and the current section carries over from
+    one page to the next, so a section that starts on one page (or page range)
+    keeps collecting lines until the next header, wherever the pages were
+    extracted. Section text goes into a SectionSpool, which keeps memory bounded
+    by spilling large sections to temporary files.
+
+    Returns:
+        tuple: (SectionSpool of section -> lines, successful page count, failed pages);
+            the caller owns the spool and must close it
+    """
+    failed_pages = []
+    successful_pages = 0
+
+    spool = SectionSpool(memory_limit)
+    is_header = get_section_classifier().is_line_header
+    current_section = "Content"
+    spool.add_section(current_section)
+
+    # Track progress for large documents
+    progress_interval = max(1, page_count // 10)  # Log every 10%
+
+    for page_num, page_text in page_texts:
+        if page_text is None:
+            failed_pages.append(page_num)
+            continue
+
+        try:
+            for line_idx, line in enumerate(page_text.split("\n")):
+                try:
+                    line = line.strip()
+                    if line:
+                        # All-caps lines, section keywords and numbered sections start a section
+                        if is_header(line):
+                            current_section = line[:100]  # Limit header length
+                            spool.add_section(current_section)
+                        else:
+                            spool.append(current_section, line)
+                except Exception as e:
+                    logger.warning(f"Error processing line {line_idx} on page {page_num}: {e}")
+                    continue
+
+            successful_pages += 1
+
+            # Log progress for large documents
+            if (page_num + 1) % progress_interval == 0:
+                logger.debug(f"Processed {page_num + 1}/{page_count} pages")
+
+        except Exception as e:
+            logger.warning(f"Error reading page {page_num}: {e}")
+            failed_pages.append(page_num)
+            continue
+
+    if spool.spilled_sections:
+        logger.info(
+            f"Spilled {len(spool.spilled_sections)} sections ({spool.spilled_chars} characters) "
+            f"to temporary files to stay under the segment memory limit"
+        )
+    return spool, successful_pages, failed_pages
+
+
+def _spool_pdf_segments(file_path, max_pages=None, page_workers=None, context=None, memory_limit=None):
+    """Segment a PDF into a SectionSpool, routing each page to its text layer or OCR.
+
+    Returns:
+        SectionSpool on success (caller closes it), otherwise {"Error": ...}
+    """
+    if page_workers is None:
+        page_workers = CONFIG["PAGE_WORKERS"]
+
+    try:
+        # Validate file path before processing
+        validate_file_path(
+            file_path, [".pdf"], os.path.dirname(file_path)
+        )  # For PDF processing, only allow PDF
+
+        try:
+            doc = context.doc if context else fitz.open(file_path)
+        except Exception as e:
+            logger.error(f"Failed to open PDF file {file_path}: {e}")
+            return {"Error": f"Could not open PDF file: {str(e)}"}
+
+        try:
+            total_pages = len(doc)
+
+            page_limit = min(total_pages, max_pages) if max_pages else total_pages
+
+            logger.info(f"Processing {pathlib.Path(file_path).name} ({page_limit} pages)...")
+            cache = get_ocr_cache() if is_ocr_enabled() else None
+            cache_hits, cache_misses = (cache.hits, cache.misses) if cache else (0, 0)
+
+            if _should_split_pages(page_limit, page_workers):
+                # Ranges are consumed in order as workers finish, never all at once
+                routed_pages = (
+                    page_result
+                    for range_results in _iter_page_range_results(
+                        _route_page_range,
+                        file_path,
+                        _page_ranges(page_limit, page_workers),
+                        page_workers,
+                    )
+                    for page_result in range_results
+                )
+            else:
+                routed_pages = _iter_routed_pages(doc, 0, page_limit, context)
+
+            page_methods = []
+            ocr_pages = []
+            ocr_totals = _sum_ocr_counts([])
+            spool, successful_pages, failed_pages = _segment_page_texts(
+                _record_page_routes(routed_pages, page_methods, ocr_pages, ocr_totals),
+                page_limit,
+                memory_limit,
+            )
+
+            # Text-only documents carry no metadata; anything else records how each page was read
+            if any(method != "text" for method in page_methods):
+                spool.metadata = {
+                    "extraction_method": "hybrid",
+                    "page_methods": _page_method_runs(page_methods),
+                    "ocr_pages": ocr_pages,
+                    "mean_confidence": (
+                        round(sum(p["confidence"] for p in ocr_pages) / len(ocr_pages), 1)
+                        if ocr_pages
+                        else 0.0
+                    ),
+                    "rejected_pages": [p["page"] for p in ocr_pages if p["rejected"]],
+                    "high_dpi_pages": [p["page"] for p in ocr_pages if p["high_dpi"]],
+                }
+                if cache:
+                    spool.metadata["ocr_cache"] = {
+                        "hits": cache.hits - cache_hits,
+                        "misses": cache.misses - cache_misses,
+                    }
+                logger.info(
+                    f"OCRed {len(ocr_pages)}/{page_limit} pages of {pathlib.Path(file_path).name}; "
+                    f"the rest came from the text layer"
+                )
+
+            # A PDF without any text-layer page depends on OCR alone, so it has to
+            # pass the document-level quality gate on its OCR page counts
+            if "text" not in page_methods and successful_pages:
+                if not is_ocr_enabled():
+                    spool.close()
+                    logger.warning(
+                        f"OCR disabled, cannot process scanned PDF: {pathlib.Path(file_path).name}"
+                    )
+                    return {"Error": "OCR not available - cannot extract text from scanned PDF"}
+                quality_score, error = _ocr_quality_gate(ocr_totals, file_path)
+                if error:
+                    spool.close()
+                    return error
+                spool.metadata["extraction_method"] = "ocr"
+                spool.metadata["quality_score"] = quality_score
+                spool.metadata["pages_processed"] = page_limit
+                spool.metadata["total_chars"] = ocr_totals["chars"]
+
+            # Log summary of extraction quality
+            if failed_pages:
+                logger.warning(f"Failed to extract {len(failed_pages)} pages: {failed_pages}")
+
+            if successful_pages == 0:
+                spool.close()
+                logger.error(f"No pages successfully extracted from {file_path}")
+                return {"Error": "No pages could be extracted"}
+
+            logger.info(f"Successfully extracted {successful_pages}/{page_limit} pages")
+            return spool
+
+        finally:
+            if not context:
+                try:
+                    doc.close()
+                except Exception as e:
+                    logger.warning(f"Error closing PDF document {file_path}: {e}")
+
+    except FileNotFoundError:
+        logger.error(f"PDF file not found: {file_path}")
+        return {"Error": "File not found"}
+    except PermissionError:
+        logger.error(f"Permission denied accessing PDF file: {file_path}")
+        return {"Error": "Permission denied"}
+    except Exception as e:
+        logger.error(f"PDF extraction failed for {file_path}: {e}", exc_info=True)
+        return {"Error": f"PDF extraction failed: {str(e)}"}
+
+
+def iter_pdf_segments(file_path, max_pages=None, page_workers=None, context=None, memory_limit=None):
+    """Stream the (section, content) pairs of a PDF one section at a time.
+
+    Yields the same pairs as ``extract_pdf_segments(...).items()`` (including
+    ("Error", message) on failure), but only one section's text is materialised
+    at a time, so very large reports can be written out in bounded memory.
+
+    Args:
+        memory_limit: Section characters kept in memory before spilling to disk
+            (defaults to CONFIG["SEGMENT_MEMORY_LIMIT"])
+    """
+    result = _spool_pdf_segments(file_path, max_pages, page_workers, context, memory_limit)
+    if isinstance(result, dict):
+        yield from result.items()
+        return
+    with result as spool:
+        yield from spool.items()
+
+
+def extract_pdf_segments(file_path, max_pages=None, page_workers=None, context=None, memory_limit=None):
+    """Extract text from PDF using PyMuPDF with better error handling and memory management.
+
+    Each page is classified on its own (see classify_pdf_page): text pages use the
+    text layer and only image-only pages are OCRed, so a scanned cover or
+    appendix no longer decides how the whole document is read. Documents with
+    any non-text page get a "_metadata" segment listing the method per page run.
+    A PDF with no text-layer page at all is read the same way (extraction_method
+    "ocr") and must also pass the document-level OCR quality gate.
+
+    Sections are never truncated; while segmenting, section text beyond
+    ``memory_limit`` characters is spilled to temporary files.
+
+    Args:
+        file_path: Path to PDF file
+        max_pages: Optional limit on the number of pages to read
+        page_workers: Number of processes to split large PDFs across
+            (defaults to CONFIG["PAGE_WORKERS"])
+        context: Optional PDFDocumentContext shared with other extraction stages
+        memory_limit: Section characters kept in memory before spilling to disk
+            (defaults to CONFIG["SEGMENT_MEMORY_LIMIT"])
+    """
+    return dict(iter_pdf_segments(file_path, max_pages, page_workers, context, memory_limit))
+
+
+def _count_rulings(page, tolerance=1.0):
+    """Count horizontal and vertical ruling segments among a page's vector drawings.
+
+    Thin rectangles count as a single ruling; larger ones (cell borders) count
+    as two horizontal and two vertical edges.
+    """
+    get_drawings = getattr(page, "get_cdrawings", page.get_drawings)
+    horizontal = vertical = 0
+    for path in get_drawings():
+        for item in path["items"]:
+            if item[0] == "l":
+                (x0, y0), (x1, y1) = item[1], item[2]
+            elif item[0] == "re":
+                x0, y0, x1, y1 = item[1]
+            else:
+                continue
+            width, height = abs(x1 - x0), abs(y1 - y0)
+            if height <= tolerance and width > tolerance:
+                horizontal += 1
+            elif width <= tolerance and height > tolerance:
+                vertical += 1
+            elif item[0] == "re" and width > tolerance:
+                horizontal += 2
+                vertical += 2
+    return horizontal, vertical
+
+
+def _page_word_boxes(page):
+    """Words of a page's text layer in image_to_data layout, for reconstruct_ocr_tables."""
+    words = page.get_text("words")
+    return {
+        "text": [word[4] for word in words],
+        "conf": [100] * len(words),
+        "left": [word[0] for word in words],
+        "top": [word[1] for word in words],
+        "width": [word[2] - word[0] for word in words],
+        "height": [word[3] - word[1] for word in words],
+    }
+
+
+def table_candidate_signal(page):
+    """Cheap PyMuPDF check for whether a page may contain a table.
+
+    A page is a candidate when its drawings hold at least
+    CONFIG["TABLE_PREFILTER_MIN_RULINGS"] horizontal and vertical rulings (the
+    edges pdfplumber's line strategy builds cells from), or when its words line
+    up as a grid of CONFIG["TABLE_PREFILTER_MIN_COLUMNS"] or more columns over
+    CONFIG["OCR_TABLE_MIN_ROWS"] rows (see reconstruct_ocr_tables). Both checks
+    together cost a millisecond or two, against tens of milliseconds for
+    pdfplumber's extract_tables.
+
+    Returns:
+        str or None: "rulings" or "text_grid" for candidate pages, else None
+    """
+    min_horizontal, min_vertical = CONFIG["TABLE_PREFILTER_MIN_RULINGS"]
+    horizontal, vertical = _count_rulings(page)
+    if horizontal >= min_horizontal and vertical >= min_vertical:
+        return "rulings"
+    if reconstruct_ocr_tables(
+        _page_word_boxes(page), min_columns=CONFIG["TABLE_PREFILTER_MIN_COLUMNS"]
+    ):
+        return "text_grid"
+    return None
+
+
+def _table_candidate_pages(doc, start, end):
+    """Pages in [start, end) worth running pdfplumber on (all of them if the prefilter is off)."""
+    if not CONFIG["TABLE_PREFILTER"]:
+        return list(range(start, end))
+    candidates = []
+    for page_num in range(start, end):
+        try:
+            if table_candidate_signal(doc.load_page(page_num)):
+                candidates.append(page_num)
+        except Exception as e:
+            # Let pdfplumber decide on pages the prefilter cannot read
+            logger.debug(f"Table prefilter failed on page {page_num + 1}: {e}")
+            candidates.append(page_num)
+    return candidates
+
+
+def _extract_plumber_page_tables(page, page_num):
+    """Extract and clean the tables pdfplumber finds on a single page."""
+    tables = []
+    try:
+        # Extract tables using pdfplumber
+        page_tables = page.extract_tables()
+
+        if page_tables:
+            for table_idx, table_data in enumerate(page_tables):
+                try:
+                    # Clean and format table data
+                    clean_table = []
+                    for row_idx, row in enumerate(table_data):
+                        if row:  # Skip empty rows
+                            # Clean cell text
+                            clean_row = [str(cell).strip() if cell else "" for cell in row]
+                            # Only add non-empty rows
+                            if any(clean_row):
+                                clean_table.append(clean_row)
+
+                    if clean_table:
+                        tables.append(
+                            {
+                                "page": page_num + 1,
+                                "rows": len(clean_table),
+                                "columns": len(clean_table[0]) if clean_table else 0,
+                                "data": clean_table,
+                            }
+                        )
+                        logger.debug(
+                            f"Found table on page {page_num + 1}, table {table_idx}: {len(clean_table)} rows, {len(clean_table[0]) if clean_table else 0} cols"
+                        )
+                except Exception as table_e:
+                    logger.warning(
+                        f"Error processing table {table_idx} on page {page_num + 1}: {table_e}"
+                    )
+                    continue
+
+    except Exception as page_e:
+        logger.warning(f"Error extracting tables from page {page_num + 1}: {page_e}")
+
+    return tables
+
+
+def _extract_table_page_range(file_path, start, end):
+    """Worker entry point: extract pdfplumber tables from the candidate pages of a page range."""
+    with fitz.open(file_path) as doc:
+        candidates = _table_candidate_pages(doc, start, end)
+    tables = []
+    if not candidates:
+        return tables
+    with pdfplumber.open(file_path, pages=[page_num + 1 for page_num in candidates]) as pdf:
+        for page in pdf.pages:
+            tables.extend(_extract_plumber_page_tables(page, page.page_number - 1))
+    return tables
+
+
+def extract_tables_from_pdf(file_path, page_workers=None, context=None):
+    """Extract tables from PDF using pdfplumber with OCR fallback.
+
+    With CONFIG["TABLE_PREFILTER"] on, pdfplumber only runs on the pages
+    table_candidate_signal flags; the other pages are skipped.
+
+    Args:
+        file_path: Path to PDF file
+        page_workers: Number of processes to split large PDFs across
+            (defaults to CONFIG["PAGE_WORKERS"])
+        context: Optional PDFDocumentContext shared with other extraction stages
+
+    Returns:
+        list: List of extracted tables with metadata
+    """
+    if page_workers is None:
+        page_workers = CONFIG["PAGE_WORKERS"]
+
+    tables = []
+
+    try:
+        logger.info(f"Extracting tables from {pathlib.Path(file_path).name} using pdfplumber...")
+        pdf = context.plumber if context else pdfplumber.open(file_path)
+        try:
+            page_count = len(pdf.pages)
+            split_pages = _should_split_pages(page_count, page_workers)
+            if not split_pages:
+                doc = context.doc if context else fitz.open(file_path)
+                try:
+                    candidates = _table_candidate_pages(doc, 0, page_count)
+                finally:
+                    if not context:
+                        doc.close()
+                logger.debug(
+                    f"Table prefilter kept {len(candidates)} of {page_count} pages "
+                    f"of {pathlib.Path(file_path).name}"
+                )
+                for page_num in candidates:
+                    tables.extend(_extract_plumber_page_tables(pdf.pages[page_num], page_num))
+        finally:
+            if not context:
+                pdf.close()
+
+        if split_pages:
+            for range_tables in _map_page_ranges(
+                _extract_table_page_range, file_path, page_count, page_workers
+            ):
+                tables.extend(range_tables)
+
+        logger.info(f"Extracted {len(tables)} tables using pdfplumber")
+        return tables
+
+    except FileNotFoundError:
+        logger.error(f"PDF file not found for table extraction: {file_path}")
+        return []
+    except PermissionError:
+        logger.error(f"Permission denied for table extraction on PDF: {file_path}")
+        return []
+    except Exception as e:
+        logger.error(f"PDF table extraction with pdfplumber failed: {e}", exc_info=True)
+
+        # Fallback to OCR-based table detection
+        if is_ocr_enabled():
+            logger.info(
+                f"Falling back to OCR-based table detection for {pathlib.Path(file_path).name}..."
+            )
+            with stage_timer("ocr_tables"):
+                return detect_tables_with_ocr(file_path, context=context)
+        else:
+            logger.warning("OCR disabled - cannot extract tables from PDF")
+            return []
+
+
+def _ocr_words(ocr_data):
+    """Recognized words of image_to_data output as (texts, left, top, width, height) arrays."""
+    texts = []
+    keep = []
+    for idx, word in enumerate(ocr_data.get("text", [])):
+        word = (word or "").strip()
+        try:
+            confidence = float(ocr_data["conf"][idx])
+        except (KeyError, IndexError, TypeError, ValueError):
+            confidence = -1.0
+        if word and confidence >= 0:
+            texts.append(word)
+            keep.append(idx)
+    boxes = [
+        np.asarray(ocr_data[key], dtype=float)[keep] if keep else np.empty(0)
+        for key in ("left", "top", "width", "height")
+    ]
+    return (np.array(texts, dtype=object), *boxes)
+
+
+def _table_columns(x0, x1, row_sizes):
+    """Column x-intervals from the cells of the rows with the most common cell count.
+
+    Cells of those rows are sorted by left edge and overlapping intervals are
+    merged (a running maximum of right edges); each merged interval is a column.
+
+    Args:
+        x0, x1: Left and right edges of the cells
+        row_sizes: Cell count of each cell's row
+    """
+    sample = row_sizes == np.bincount(row_sizes).argmax()
+    order = np.argsort(x0[sample], kind="stable")
+    left, right = x0[sample][order], x1[sample][order]
+    reach = np.maximum.accumulate(right)
+    starts = np.flatnonzero(np.r_[True, left[1:] > reach[:-1]])
+    return left[starts], np.maximum.reduceat(right, starts)
+
+
+def reconstruct_ocr_tables(ocr_data, min_rows=None, cell_gap=None, min_fill=None, min_columns=2):
+    """Rebuild tables from the word boxes of one image_to_data pass.
+
+    Words are grouped into lines by their vertical centers (a new line starts
+    where the gap between sorted centers exceeds half the median word height),
+    and a line is split into cells wherever two words are further apart than
+    ``cell_gap`` median word heights. A run of at least ``min_rows`` consecutive
+    lines with ``min_columns`` or more cells is a table candidate; its columns are
+    the merged x-intervals of the cells of its most common row shape, every cell
+    is placed in the column containing its center, and candidates whose grid is
+    less than ``min_fill`` filled are dropped. Coordinates are only compared
+    relative to word height, so the render DPI does not matter.
+
+    Args:
+        ocr_data: image_to_data output (dict of lists)
+        min_rows: Minimum table rows (defaults to CONFIG["OCR_TABLE_MIN_ROWS"])
+        cell_gap: Cell-splitting gap in median word heights
+            (defaults to CONFIG["OCR_TABLE_CELL_GAP"])
+        min_fill: Minimum share of non-empty cells (defaults to CONFIG["OCR_TABLE_MIN_FILL"])
+        min_columns: Minimum cells per table row
+
+    Returns:
+        list: {"rows", "columns", "data"} per table, top to bottom
+    """
+    min_rows = CONFIG["OCR_TABLE_MIN_ROWS"] if min_rows is None else min_rows
+    cell_gap = CONFIG["OCR_TABLE_CELL_GAP"] if cell_gap is None else cell_gap
+    min_fill = CONFIG["OCR_TABLE_MIN_FILL"] if min_fill is None else min_fill
+
+    texts, left, top, width, height = _ocr_words(ocr_data)
+    if len(texts) < min_rows * min_columns:
+        return []
+    word_height = max(float(np.median(height)), 1.0)
+
+    # Lines: split the sorted vertical centers at large jumps
+    center_y = top + height / 2
+    by_y = np.argsort(center_y, kind="stable")
+    line = np.empty(len(texts), dtype=int)
+    line[by_y] = np.r_[0, np.cumsum(np.diff(center_y[by_y]) > word_height / 2)]
+
+    # Cells: within a line (left to right), split at wide horizontal gaps
+    order = np.lexsort((left, line))
+    word_line, x0, x1 = line[order], left[order], (left + width)[order]
+    wide_gap = x0[1:] - x1[:-1] > cell_gap * word_height
+    new_cell = np.r_[True, (word_line[1:] != word_line[:-1]) | wide_gap]
+    cell_starts = np.flatnonzero(new_cell)
+    cell_line = word_line[cell_starts]
+    cell_x0 = np.minimum.reduceat(x0, cell_starts)
+    cell_x1 = np.maximum.reduceat(x1, cell_starts)
+    cell_text = [" ".join(words) for words in np.split(texts[order], cell_starts[1:])]
+    cells_per_line = np.bincount(cell_line, minlength=line.max() + 1)
+
+    # Table candidates: runs of consecutive lines with several cells
+    is_row = np.r_[False, cells_per_line >= min_columns, False].astype(int)
+    edges = np.diff(is_row)
+    run_starts, run_ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    tables = []
+    for first, last in zip(run_starts, run_ends):
+        if last - first < min_rows:
+            continue
+        in_run = (cell_line >= first) & (cell_line < last)
+        run_x0, run_x1 = cell_x0[in_run], cell_x1[in_run]
+        run_sizes = cells_per_line[first:last]
+        col_x0, _ = _table_columns(run_x0, run_x1, np.repeat(run_sizes, run_sizes))
+        if len(col_x0) < min_columns:
+            continue
+
+        centers = (run_x0 + run_x1) / 2
+        columns = np.clip(np.searchsorted(col_x0, centers, side="right") - 1, 0, len(col_x0) - 1)
+        grid = [[[] for _ in col_x0] for _ in range(last - first)]
+        run_text = [cell_text[idx] for idx in np.flatnonzero(in_run)]
+        for row, column, text in zip(cell_line[in_run] - first, columns, run_text):
+            grid[row][column].append(text)
+        data = [[" ".join(parts) for parts in row] for row in grid]
+
+        filled = sum(1 for row in data for cell in row if cell)
+        if filled < min_fill * len(data) * len(col_x0):
+            continue
+        tables.append({"rows": len(data), "columns": len(col_x0), "data": data})
+    return tables
+
+
+def _cached_page_ocr_data(fingerprint, lang, dpi):
+    """image_to_data output already cached for a page by text OCR, or None."""
+    cache = get_ocr_cache()
+    if not cache:
+        return None
+    for psm_mode in CONFIG["OCR_PSM_MODES"]:
+        cached = cache.get(cache.make_key(fingerprint, lang, psm_mode, dpi, kind="data"))
+        if cached is not None:
+            return cached
+    return None
+
+
+def detect_tables_with_ocr(file_path, context=None):
+    """Detect and extract tables from PDF using OCR as fallback.
+
+    This function is called when pdfplumber fails or is unavailable. Tables are
+    rebuilt from word bounding boxes (see reconstruct_ocr_tables), so each page
+    needs a single image_to_data pass, and that pass is reused when text OCR has
+    already made it: from the shared PDFDocumentContext, or else from the OCR
+    cache. Only pages that were never OCRed are rendered and OCRed here.
+    """
+    doc = None
+    try:
+        doc = context.doc if context else fitz.open(file_path)
         tables_found = []
         logger.info(f"Scanning {pathlib.Path(file_path).name} for tables with OCR...")
 
@@ -910,53 +2371,18 @@ def detect_tables_with_ocr(file_path):
         ):  # Limit to configured number of pages
             img = None
             try:
-                page = doc.load_page(page_num)
-                pix = page.get_pixmap()
-                img = Image.open(io.BytesIO(pix.tobytes()))
-
-                # Use more sophisticated OCR with table-aware configurations
-                custom_config = r"--oem 3 --psm 6"  # Page segmentation mode 6 for uniform blocks
-                text = pytesseract.image_to_string(img, lang="ara+eng", config=custom_config)
-
-                if text.strip():
-                    # Try to detect and parse tabular data patterns
-                    lines = [l for l in text.split("\n") if l.strip()]
-
-                    # Look for multiple types of table-like patterns
-                    potential_table = []
-                    for line in lines:
-                        # Try multiple delimiters to detect table-like structures
-                        cells = None
-
-                        # First try tab delimiter
-                        if "\t" in line:
-                            cells = line.split("\t")
-                        # Then try multiple spaces (common in tables)
-                        elif "  " in line:  # At least 2 spaces
-                            import re
-
-                            cells = re.split(r"\s{2,}", line)  # Split on 2 or more spaces
-                        # Then try pipe delimiter (common in ASCII tables)
-                        elif "|" in line and line.count("|") > 1:
-                            cells = [cell.strip() for cell in line.split("|") if cell.strip()]
-
-                        if cells and len(cells) > 1:  # Has multiple columns
-                            potential_table.append([cell.strip() for cell in cells if cell.strip()])
-
-                    if len(potential_table) > 2:  # Only if there's substantial tabular data
-                        # Validate that this looks like a real table (consistent columns)
-                        if (
-                            len(set(len(row) for row in potential_table)) <= 2
-                        ):  # At most 2 different column counts
-                            tables_found.append(
-                                {
-                                    "page": page_num + 1,
-                                    "rows": len(potential_table),
-                                    "columns": len(potential_table[0]) if potential_table else 0,
-                                    "data": potential_table,
-                                    "method": "ocr_fallback",
-                                }
-                            )
+                ocr_data = context.get_ocr_data(page_num) if context else None
+                if ocr_data is None:
+                    dpi = CONFIG["OCR_DPI"]
+                    img, fingerprint = _render_page(doc, page_num, dpi, context)
+                    lang, _ = detect_page_lang(img, fingerprint, dpi)
+                    ocr_data = _cached_page_ocr_data(fingerprint, lang, dpi)
+                    if ocr_data is None:
+                        # PSM 6 treats the page as uniform blocks, keeping table rows intact
+                        ocr_data = _ocr_image_data(img, lang, 6, fingerprint=fingerprint, dpi=dpi)
+
+                for table in reconstruct_ocr_tables(ocr_data):
+                    tables_found.append(dict(page=page_num + 1, **table, method="ocr_fallback"))
 
             except Exception as e:
                 logger.warning(f"OCR failed on page {page_num}: {e}")
@@ -966,7 +2392,7 @@ def detect_tables_with_ocr(file_path):
                 if img:
                     try:
                         img.close()
-                    except:
+                    except Exception:
                         pass  # Best effort cleanup
 
         logger.info(f"Found {len(tables_found)} tables via OCR fallback")
@@ -983,47 +2409,65 @@ def detect_tables_with_ocr(file_path):
         return []
     finally:
         # Ensure document is closed even if an exception occurs
-        if doc:
+        if doc and not context:
             try:
                 doc.close()
             except Exception as e:
                 logger.warning(f"Error closing PDF document during OCR table detection: {e}")
 
 
-def validate_processing_state(dup_tracker, knowledge_base):
-    """Validate consistency between duplicate tracker and knowledge base.
+def build_file_path_index(knowledge_base):
+    """Map each processed document's source file path to its knowledge base id."""
+    return {
+        doc_data["file_path"]: doc_id
+        for doc_id, doc_data in knowledge_base.items()
+        if not doc_id.startswith("knowledge_base")
+        and isinstance(doc_data, dict)
+        and doc_data.get("file_path")
+    }
+
+
+def compute_state_diff(dup_tracker, knowledge_base):
+    """Diff the duplicate tracker against the knowledge base by file path.
+
+    Runs in O(tracked files + documents) using dict/set lookups. The knowledge
+    base may be the full dict or sharded store manifest summaries, since only
+    ``file_path`` and ``file_hash`` are read.
 
     Returns:
-        dict: Validation results with warnings and errors
+        dict: Sets of file paths keyed ``missing_in_kb`` (tracked but no document),
+            ``missing_in_tracker`` (document but not tracked) and ``hash_mismatch``
+            (document extracted from a different file version than the tracker recorded)
     """
-    validation_results = {"errors": [], "warnings": [], "status": "unknown"}
-
-    try:
-        # Get tracked files from duplicate tracker
-        tracked_files = dup_tracker.get_all_tracked_files()
-        tracked_hashes = dup_tracker.get_all_tracked_hashes()
+    tracked_files = dup_tracker.get_tracked_file_map()
+    path_index = build_file_path_index(knowledge_base)
+
+    hash_mismatch = set()
+    for file_path in tracked_files.keys() & path_index.keys():
+        kb_hash = knowledge_base[path_index[file_path]].get("file_hash")
+        if kb_hash and kb_hash != tracked_files[file_path]:
+            hash_mismatch.add(file_path)
+
+    return {
+        "missing_in_kb": tracked_files.keys() - path_index.keys(),
+        "missing_in_tracker": path_index.keys() - tracked_files.keys(),
+        "hash_mismatch": hash_mismatch,
+    }
 
-        # Get processed documents from knowledge base
-        kb_docs = {k: v for k, v in knowledge_base.items() if not k.startswith("knowledge_base")}
 
-        # Check for tracked files not in knowledge base
-        missing_docs = []
-        for file_path in tracked_files:
-            doc_id = None
-            for kb_key in kb_docs.keys():
-                if kb_docs[kb_key].get("file_path") == file_path:
-                    doc_id = kb_key
-                    break
+def validate_processing_state(dup_tracker, knowledge_base):
+    """Validate consistency between duplicate tracker and knowledge base.
 
-            if not doc_id:
-                missing_docs.append(file_path)
+    Returns:
+        dict: Validation results with warnings, errors and the sorted ``diff``
+            file path lists from compute_state_diff
+    """
+    validation_results = {"errors": [], "warnings": [], "status": "unknown", "diff": {}}
 
-        # Check for knowledge base docs not in tracker
-        extra_docs = []
-        for doc_id, doc_data in kb_docs.items():
-            file_path = doc_data.get("file_path")
-            if file_path and file_path not in tracked_files:
-                extra_docs.append((doc_id, file_path))
+    try:
+        diff = compute_state_diff(dup_tracker, knowledge_base)
+        validation_results["diff"] = {key: sorted(paths) for key, paths in diff.items()}
+        missing_docs = validation_results["diff"]["missing_in_kb"]
 
         # Generate validation results
         if missing_docs:
@@ -1032,9 +2476,15 @@ def validate_processing_state(dup_tracker, knowledge_base):
                 f"{missing_docs[:3]}..."
             )
 
-        if extra_docs:
+        if diff["missing_in_tracker"]:
+            validation_results["warnings"].append(
+                f"Knowledge base has {len(diff['missing_in_tracker'])} documents not in duplicate tracker"
+            )
+
+        if diff["hash_mismatch"]:
             validation_results["warnings"].append(
-                f"Knowledge base has {len(extra_docs)} documents not in duplicate tracker"
+                f"Knowledge base has {len(diff['hash_mismatch'])} documents whose file hash "
+                "differs from the duplicate tracker"
             )
 
         # Determine overall status
@@ -1112,8 +2562,10 @@ def perform_health_check(base_folders, dup_tracker, knowledge_base):
         health_results["recommendations"].extend(validation["warnings"])
 
     # Check 5: OCR availability
-    if OCR_ENABLED:
-        health_results["checks"]["ocr"] = f"OK: Tesseract v{TESSERACT_VERSION} available"
+    if is_ocr_enabled():
+        health_results["checks"]["ocr"] = (
+            f"OK: Tesseract v{get_ocr_engine_info()['version']} available"
+        )
     else:
         health_results["checks"]["ocr"] = (
             "INFO: OCR not available (install Tesseract for full functionality)"
@@ -1130,11 +2582,440 @@ def perform_health_check(base_folders, dup_tracker, knowledge_base):
         else:
             health_results["overall_status"] = "warning"
 
-    return health_results
+    return health_results
+
+
+# Stage timings of the file currently being extracted in this process
+_file_stats = None
+_stage_stack = []
+
+
+@contextlib.contextmanager
+def stage_timer(stage):
+    """Add the block's self time (excluding nested stages) to the current file's stats."""
+    start = time.perf_counter()
+    _stage_stack.append(0.0)
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = _stage_stack.pop()
+        if _stage_stack:
+            _stage_stack[-1] += elapsed
+        if _file_stats is not None:
+            stages = _file_stats["stages"]
+            # Page workers running in parallel can report more nested time than elapsed
+            stages[stage] = stages.get(stage, 0.0) + max(0.0, elapsed - nested)
+
+
+def _merge_worker_stages(stages):
+    """Add stage seconds measured in a page worker process to the current file's stats.
+
+    The seconds also count as nested time of the stage the caller is in, so
+    waiting on workers (e.g. OCR inside routed PDF text extraction) is not
+    billed to that stage.
+    """
+    if _stage_stack:
+        _stage_stack[-1] += sum(stages.values())
+    if _file_stats is not None:
+        for stage, seconds in stages.items():
+            _file_stats["stages"][stage] = _file_stats["stages"].get(stage, 0.0) + seconds
+
+
+def _note_file_pages(page_count):
+    if _file_stats is not None:
+        _file_stats["pages"] = page_count
+
+
+def extract_document_with_stats(file_path, folder_name, page_workers=1):
+    """Run extract_document and also return its per-stage timings.
+
+    Returns:
+        tuple: (entry, stats) where stats holds ``stages`` (stage -> seconds),
+            ``pages``, ``bytes`` and total ``seconds``
+    """
+    global _file_stats
+    _file_stats = {"stages": {}, "pages": 0, "bytes": 0, "seconds": 0.0}
+    stats = _file_stats
+    start = time.perf_counter()
+    try:
+        try:
+            stats["bytes"] = os.path.getsize(file_path)
+        except OSError:
+            pass
+        entry = extract_document(file_path, folder_name, page_workers)
+    finally:
+        stats["seconds"] = time.perf_counter() - start
+        _file_stats = None
+    return entry, stats
+
+
+class PipelineMetrics:
+    """Per-file stage timings for one processing run, aggregated into throughput figures.
+
+    Stages: hash, docx, pdf_text, pdf_tables, ocr and ocr_tables per file, plus
+    run-level stages such as save. Times are self times, so OCR that runs inside
+    PDF text extraction is only counted as ocr.
+    """
+
+    def __init__(self):
+        self.files = {}  # file path -> {"stages", "pages", "bytes", "seconds", "status"}
+        self.run_stages = {}
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.wall_seconds = None
+
+    def _file(self, file_path):
+        return self.files.setdefault(
+            str(file_path),
+            {"stages": {}, "pages": 0, "bytes": 0, "seconds": 0.0, "status": "pending"},
+        )
+
+    def add_stage(self, file_path, stage, seconds):
+        """Record parent-side work for a file (e.g. hashing)."""
+        record = self._file(file_path)
+        record["stages"][stage] = record["stages"].get(stage, 0.0) + seconds
+        record["seconds"] += seconds
+
+    def record_file(self, file_path, stats, status="ok"):
+        """Merge extraction stats returned by extract_document_with_stats."""
+        record = self._file(file_path)
+        for stage, seconds in (stats or {}).get("stages", {}).items():
+            record["stages"][stage] = record["stages"].get(stage, 0.0) + seconds
+        if stats:
+            record["pages"] = stats.get("pages", 0)
+            record["bytes"] = stats.get("bytes", 0)
+            record["seconds"] += stats.get("seconds", 0.0)
+        record["status"] = status
+
+    @contextlib.contextmanager
+    def run_stage(self, stage):
+        """Time a run-level stage such as the final save."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.run_stages[stage] = (
+                self.run_stages.get(stage, 0.0) + time.perf_counter() - start
+            )
+
+    def finish(self):
+        self.wall_seconds = time.perf_counter() - self._start
+
+    def summary(self, top_n=None):
+        """Aggregate the run: totals, throughput, stage totals and the slowest files."""
+        top_n = top_n or CONFIG["REPORT_TOP_N"]
+        wall = self.wall_seconds if self.wall_seconds is not None else time.perf_counter() - self._start
+        measured = [r for r in self.files.values() if r["status"] in ("ok", "error")]
+        pages = sum(r["pages"] for r in measured)
+        size_bytes = sum(r["bytes"] for r in measured)
+
+        stage_totals = dict(self.run_stages)
+        for record in self.files.values():
+            for stage, seconds in record["stages"].items():
+                stage_totals[stage] = stage_totals.get(stage, 0.0) + seconds
+
+        slowest = sorted(self.files.items(), key=lambda item: item[1]["seconds"], reverse=True)
+        return {
+            "started_at": self.started_at.isoformat(),
+            "wall_seconds": round(wall, 3),
+            "files": len(measured),
+            "pages": pages,
+            "megabytes": round(size_bytes / (1024 * 1024), 3),
+            "pages_per_sec": round(pages / wall, 2) if wall > 0 else 0.0,
+            "mb_per_sec": round(size_bytes / (1024 * 1024) / wall, 3) if wall > 0 else 0.0,
+            "stage_seconds": {
+                stage: round(seconds, 3)
+                for stage, seconds in sorted(stage_totals.items(), key=lambda x: -x[1])
+            },
+            "slowest_files": [
+                {
+                    "file": pathlib.Path(path).name,
+                    "seconds": round(record["seconds"], 3),
+                    "slowest_stage": max(record["stages"], key=record["stages"].get)
+                    if record["stages"]
+                    else None,
+                }
+                for path, record in slowest[:top_n]
+            ],
+        }
+
+    def write_report(self, report_dir=None):
+        """Write run_report_<timestamp>.json (summary + per-file) and .csv (per-file).
+
+        Returns:
+            tuple: (json path, csv path)
+        """
+        report_dir = pathlib.Path(report_dir or CONFIG["RUN_REPORT_DIR"])
+        report_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"run_report_{self.started_at.strftime('%Y%m%d_%H%M%S')}"
+        json_path = report_dir / f"{stem}.json"
+        csv_path = report_dir / f"{stem}.csv"
+
+        report = {"summary": self.summary(), "run_stages": self.run_stages, "files": self.files}
+        _atomic_write(
+            str(json_path), lambda f: json.dump(report, f, ensure_ascii=False, indent=2)
+        )
+
+        stages = sorted({stage for r in self.files.values() for stage in r["stages"]})
+
+        def write_csv(f):
+            writer = csv.writer(f)
+            writer.writerow(["file", "status", "pages", "bytes", "seconds"] + stages)
+            for path, record in self.files.items():
+                writer.writerow(
+                    [path, record["status"], record["pages"], record["bytes"]]
+                    + [round(record["seconds"], 4)]
+                    + [round(record["stages"].get(stage, 0.0), 4) for stage in stages]
+                )
+
+        _atomic_write(str(csv_path), write_csv)
+        logger.info(f"Run report written to {json_path} and {csv_path}")
+        return str(json_path), str(csv_path)
+
+    def log_summary(self, top_n=None):
+        """Log throughput plus the slowest stages and files."""
+        summary = self.summary(top_n)
+        logger.info(
+            f"  Throughput: {summary['pages_per_sec']} pages/sec, "
+            f"{summary['mb_per_sec']} MB/sec ({summary['wall_seconds']}s wall)"
+        )
+        if summary["stage_seconds"]:
+            top_stages = list(summary["stage_seconds"].items())[: top_n or CONFIG["REPORT_TOP_N"]]
+            logger.info(
+                "  Slowest stages: " + ", ".join(f"{stage} {sec}s" for stage, sec in top_stages)
+            )
+        if summary["slowest_files"]:
+            logger.info("  Slowest files:")
+            for item in summary["slowest_files"]:
+                logger.info(f"    {item['file']}: {item['seconds']}s (mostly {item['slowest_stage']})")
+
+
+def load_latest_run_report(report_dir=None):
+    """Load the summary of the most recent run report, or None if there is none."""
+    report_dir = pathlib.Path(report_dir or CONFIG["RUN_REPORT_DIR"])
+    reports = sorted(report_dir.glob("run_report_*.json")) if report_dir.exists() else []
+    if not reports:
+        return None
+    try:
+        with open(reports[-1], "r", encoding="utf-8") as f:
+            return json.load(f).get("summary")
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read run report {reports[-1]}: {e}")
+        return None
+
+
+def _extract_pdf_tables(file_path, page_workers=1, context=None):
+    """Extract tables from a PDF with pdfplumber, falling back to OCR detection."""
+    with stage_timer("pdf_tables"):
+        tables = extract_tables_from_pdf(file_path, page_workers=page_workers, context=context)
+    if tables:
+        logger.info(f"    Found {len(tables)} tables")
+        return tables
+
+    if is_ocr_enabled():
+        logger.info(f"    No tables found with pdfplumber, scanning with OCR...")
+        with stage_timer("ocr_tables"):
+            ocr_tables = detect_tables_with_ocr(file_path, context=context)
+        if ocr_tables:
+            logger.info(f"    Found {len(ocr_tables)} tables via OCR")
+            return ocr_tables
+
+    logger.info(f"    No tables found")
+    return []
+
+
+def process_pdf_document(file_path, page_workers=1):
+    """Extract segments and tables from a PDF in one pass over the file.
+
+    The PDF is read once into a PDFDocumentContext that text extraction,
+    pdfplumber table extraction and OCR all share. Pages that OCR renders are
+    kept for the OCR table fallback, so no page is rasterized twice. Sections
+    are read from iter_pdf_segments and sanitized one at a time.
+
+    Returns:
+        dict: {"segments": ..., "tables": [...]} or {"Error": message}
+    """
+    try:
+        validate_file_path(file_path, [".pdf"], os.path.dirname(file_path))
+        retain_pages = range(CONFIG["MAX_PAGES_FOR_TABLE_EXTRACTION"]) if is_ocr_enabled() else ()
+        context = PDFDocumentContext(file_path, retain_pages=retain_pages)
+    except FileNotFoundError:
+        logger.error(f"PDF file not found: {file_path}")
+        return {"Error": "File not found"}
+    except PermissionError:
+        logger.error(f"Permission denied accessing PDF file: {file_path}")
+        return {"Error": "Permission denied"}
+    except Exception as e:
+        logger.error(f"Failed to open PDF file {file_path}: {e}")
+        return {"Error": f"Could not open PDF file: {str(e)}"}
+
+    _note_file_pages(context.doc.page_count)
+    with context:
+        # Sections are sanitized one at a time as the spool yields them, so the
+        # document is only ever held once (there is no second, cleaned copy)
+        segments = {}
+        with stage_timer("pdf_text"):
+            for section, content in iter_pdf_segments(
+                file_path, page_workers=page_workers, context=context
+            ):
+                if section == "Error":
+                    return {"Error": content}
+                segments[section] = (
+                    _sanitize_text(content)
+                    if isinstance(content, str)
+                    else _sanitize_document_data(content)
+                )
+
+        tables = _extract_pdf_tables(file_path, page_workers=page_workers, context=context)
+        logger.debug(
+            f"Rendered {context.renders} page images ({context.reused_renders} reused) "
+            f"for {pathlib.Path(file_path).name}"
+        )
+
+    return {"segments": segments, "tables": tables}
+
+
+def extract_document(file_path, folder_name, page_workers=1):
+    """Run every extraction stage for a single document and build its knowledge base entry.
+
+    This is the unit of work handed to worker processes in parallel mode. It only
+    reads the file itself; duplicate tracking and the knowledge base merge stay
+    with the caller so results are deterministic regardless of worker count.
+
+    Args:
+        file_path: Path to a DOCX or PDF file
+        folder_name: Name of the source folder (stored as the document type)
+        page_workers: Number of processes to split large PDFs across
+
+    Returns:
+        dict: Knowledge base entry for the document (with an "error" key on failure)
+    """
+    file_path = pathlib.Path(file_path)
+    entry = {
+        "file_path": str(file_path),
+        "type": folder_name,
+        "format": file_path.suffix.lower(),
+    }
+
+    if file_path.suffix.lower() == ".docx":
+        with stage_timer("docx"):
+            result = extract_docx_segments(str(file_path))
+        if isinstance(result, dict) and "segments" in result:
+            # Sanitize and validate the extracted data before storing
+            sanitized_result = _sanitize_document_data(result)
+            entry["segments"] = sanitized_result["segments"]
+            entry["tables"] = sanitized_result.get("tables", [])
+            entry["metadata"] = sanitized_result.get("metadata", {})
+        elif "Error" in result:
+            entry["error"] = str(result["Error"])
+
+    elif file_path.suffix.lower() == ".pdf":
+        result = process_pdf_document(str(file_path), page_workers=page_workers)
+        if "Error" not in result:
+            # Segments come back sanitized section by section; only tables need it here
+            entry["segments"] = result["segments"]
+            entry["tables"] = _sanitize_document_data({"tables": result["tables"]})["tables"]
+        else:
+            entry["error"] = str(result["Error"])
+
+    entry["processed_at"] = datetime.now().isoformat()
+    return entry
+
+
+def _extract_in_isolation(job):
+    """Re-run a single extraction job in its own one-process pool.
+
+    Used after a worker crash broke the shared pool: every file that was still in
+    flight is retried alone, so only the file that actually crashes a worker is lost.
+    """
+    try:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(
+                extract_document_with_stats,
+                job["file_path"],
+                job["folder_name"],
+                job["page_workers"],
+            )
+            entry, stats = future.result()
+            return entry, None, stats
+    except BrokenProcessPool:
+        return None, "Worker process crashed while extracting this file", None
+    except Exception as e:
+        return None, str(e), None
+
+
+def _iter_extraction_results(jobs, workers=1):
+    """Yield (job, entry, error, stats) for each extraction job, in job order.
+
+    With workers <= 1 the files are extracted lazily in the current process.
+    Otherwise extraction is fanned out to a process pool and results are
+    collected back in submission order.
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            logger.info(f"\n[{job['index']}/{job['total']}] Processing: {job['name']}")
+            try:
+                entry, stats = extract_document_with_stats(
+                    job["file_path"], job["folder_name"], job["page_workers"]
+                )
+                error = None
+            except Exception as e:
+                logger.error(f"  [ERROR] Error processing {job['name']}: {e}", exc_info=True)
+                entry, error, stats = None, str(e), None
+            yield job, entry, error, stats
+        return
+
+    logger.info(f"Extracting {len(jobs)} files with {workers} worker processes...")
+    # Probe Tesseract once here so forked workers inherit the result
+    get_ocr_engine_info()
+    results = {}
+    crashed = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = [
+            (
+                job,
+                pool.submit(
+                    extract_document_with_stats,
+                    job["file_path"],
+                    job["folder_name"],
+                    job["page_workers"],
+                ),
+            )
+            for job in jobs
+        ]
+        for job, future in futures:
+            try:
+                entry, stats = future.result()
+                results[job["file_path"]] = (entry, None, stats)
+            except BrokenProcessPool:
+                crashed.append(job)
+            except Exception as e:
+                results[job["file_path"]] = (None, str(e), None)
+
+    if crashed:
+        logger.warning(f"Worker pool crashed; retrying {len(crashed)} in-flight files in isolation")
+        for job in crashed:
+            results[job["file_path"]] = _extract_in_isolation(job)
+
+    for job in jobs:
+        entry, error, stats = results[job["file_path"]]
+        logger.info(f"\n[{job['index']}/{job['total']}] Processed: {job['name']}")
+        if error:
+            logger.error(f"  [ERROR] Error processing {job['name']}: {error}")
+        yield job, entry, error, stats
 
 
 def process_all_documents(
-    base_folders, force_reprocess=False, selective_files=None, existing_kb=None
+    base_folders,
+    force_reprocess=False,
+    selective_files=None,
+    existing_kb=None,
+    workers=1,
+    page_workers=None,
+    verify_hashes=False,
+    dup_tracker=None,
+    metrics=None,
 ):
     """Process all documents in folders and create knowledge library with deduplication
 
@@ -1143,184 +3024,147 @@ def process_all_documents(
         force_reprocess: If True, ignore duplicate tracker and reprocess all files
         selective_files: List of specific files to process (if None, process all)
         existing_kb: Optional existing knowledge base dict to merge with (preserves previous data)
+        workers: Number of worker processes for per-file extraction (1 = sequential)
+        page_workers: Processes per large PDF for page-level parallelism
+            (defaults to CONFIG["PAGE_WORKERS"])
+        verify_hashes: If True, rehash every file instead of trusting unchanged
+            size/mtime/inode signatures recorded by the tracker
+        dup_tracker: Optional long-lived DuplicateTracker to reuse (it is flushed
+            when the run ends, even on error, but not closed); a new one is opened
+            and closed when omitted
+        metrics: Optional PipelineMetrics that receives per-file stage timings
     """
     # Start with existing knowledge base if provided, otherwise create empty one
     # This FIXES the data loss bug - we now accept and preserve existing data
     knowledge_base = existing_kb.copy() if existing_kb else {}
+    if page_workers is None:
+        page_workers = CONFIG["PAGE_WORKERS"]
     file_count = 0
     error_count = 0
     skipped_count = 0
+    unchanged_count = 0
+    metrics = metrics if metrics is not None else PipelineMetrics()
 
-    # Initialize duplicate tracker
-    dup_tracker = DuplicateTracker()
-
-    for folder_name, folder_path in base_folders.items():
-        logger.info(f"\n{'=' * 60}")
-        logger.info(f"Processing {folder_name} folder...")
-        logger.info(f"{'=' * 60}")
-        folder = pathlib.Path(folder_path)
-
-        if not folder.exists():
-            logger.error(f"Folder not found: {folder_path}")
-            continue
+    # Initialize duplicate tracker; all hashes are loaded once so checks stay in memory
+    owns_tracker = dup_tracker is None
+    if owns_tracker:
+        dup_tracker = DuplicateTracker()
+    if not force_reprocess:
+        dup_tracker.preload()
 
-        # Get all files first to show total count
-        all_files = [
-            f for f in folder.iterdir() if f.is_file() and f.suffix.lower() in [".docx", ".pdf"]
-        ]
+    try:
+        # Collect extraction jobs; duplicate checks happen here in the parent process
+        jobs = []
+        for folder_name, folder_path in base_folders.items():
+            logger.info(f"\n{'=' * 60}")
+            logger.info(f"Scanning {folder_name} folder...")
+            logger.info(f"{'=' * 60}")
+            folder = pathlib.Path(folder_path)
 
-        for idx, file_path in enumerate(all_files):
-            # Check selective processing filter
-            if selective_files and str(file_path) not in selective_files:
+            if not folder.exists():
+                logger.error(f"Folder not found: {folder_path}")
                 continue
 
-            file_count += 1
-            logger.info(f"\n[{idx + 1}/{len(all_files)}] Processing: {file_path.name}")
-
-            # Get file hash for duplicate checking and recording
-            file_hash = get_file_hash(file_path) if not force_reprocess else None
-
-            # Check for duplicates using persistent tracker (unless force reprocess)
-            if (
-                not force_reprocess
-                and file_hash
-                and dup_tracker.is_duplicate(str(file_path), file_hash)
-            ):
-                logger.warning(f"  Skipping previously processed file (hash: {file_hash[:8]}...)")
-                skipped_count += 1
-                continue
+            # Get all files first to show total count
+            all_files = [
+                f for f in folder.iterdir() if f.is_file() and f.suffix.lower() in [".docx", ".pdf"]
+            ]
 
-            doc_id = f"{folder_name}_{file_path.stem}"
+            for idx, file_path in enumerate(all_files):
+                # Check selective processing filter
+                if selective_files and str(file_path) not in selective_files:
+                    continue
 
-            try:
-                if file_path.suffix.lower() == ".docx":
-                    result = extract_docx_segments(str(file_path))
-                    if isinstance(result, dict) and "segments" in result:
-                        # Sanitize and validate the extracted data before storing
-                        sanitized_result = _sanitize_document_data(result)
-                        knowledge_base[doc_id] = {
-                            "file_path": str(file_path),
-                            "type": folder_name,
-                            "format": file_path.suffix.lower(),
-                            "segments": sanitized_result["segments"],
-                            "tables": sanitized_result.get("tables", []),
-                            "metadata": sanitized_result.get("metadata", {}),
-                            "processed_at": datetime.now().isoformat(),
-                        }
-                    elif "Error" in result:
-                        error_msg = (
-                            str(result["Error"])
-                            if isinstance(result["Error"], str)
-                            else str(result["Error"])
-                        )
-                        knowledge_base[doc_id] = {
-                            "file_path": str(file_path),
-                            "type": folder_name,
-                            "format": file_path.suffix.lower(),
-                            "error": error_msg,
-                            "processed_at": datetime.now().isoformat(),
-                        }
+                file_count += 1
+
+                file_hash = None
+                file_stat = None
+                if not force_reprocess:
+                    # Files whose size/mtime/inode match the tracker are skipped unread
+                    file_stat = get_file_stat(file_path)
+                    if not verify_hashes and dup_tracker.get_unchanged_hash(file_path, file_stat):
+                        logger.debug(f"  Skipping unchanged file {file_path.name}")
+                        unchanged_count += 1
+                        skipped_count += 1
+                        continue
 
-                elif file_path.suffix.lower() == ".pdf":
-                    segments = extract_pdf_segments(str(file_path))
-                    if "Error" not in segments:
-                        # Sanitize and validate the extracted data before storing
-                        sanitized_segments = _sanitize_document_data({"segments": segments})
-                        knowledge_base[doc_id] = {
-                            "file_path": str(file_path),
-                            "type": folder_name,
-                            "format": file_path.suffix.lower(),
-                            "segments": sanitized_segments["segments"],
-                            "processed_at": datetime.now().isoformat(),
-                        }
-                    else:
-                        error_msg = (
-                            str(segments["Error"])
-                            if isinstance(segments["Error"], str)
-                            else str(segments["Error"])
-                        )
-                        knowledge_base[doc_id] = {
-                            "file_path": str(file_path),
-                            "type": folder_name,
-                            "format": file_path.suffix.lower(),
-                            "error": error_msg,
-                            "processed_at": datetime.now().isoformat(),
-                        }
+                    # Get file hash for duplicate checking and recording
+                    hash_start = time.perf_counter()
+                    file_hash = get_file_hash(file_path)
+                    metrics.add_stage(file_path, "hash", time.perf_counter() - hash_start)
+
+                # Check for duplicates using persistent tracker (unless force reprocess)
+                if (
+                    not force_reprocess
+                    and file_hash
+                    and dup_tracker.is_duplicate(str(file_path), file_hash)
+                ):
+                    logger.warning(
+                        f"  Skipping previously processed file {file_path.name} (hash: {file_hash[:8]}...)"
+                    )
+                    # Touched but identical files get their new stat signature recorded
+                    if file_stat and dup_tracker.get_tracked_hash(file_path) == file_hash:
+                        dup_tracker.record_processed(file_path, file_hash, file_stat)
+                    metrics.record_file(file_path, None, "skipped")
+                    skipped_count += 1
+                    continue
 
-                # Record successful processing
-                if file_hash:
-                    dup_tracker.record_processed(str(file_path), file_hash)
-                logger.info(f"  [OK] Successfully processed")
+                jobs.append(
+                    {
+                        "doc_id": f"{folder_name}_{file_path.stem}",
+                        "file_path": str(file_path),
+                        "folder_name": folder_name,
+                        "file_hash": file_hash,
+                        "file_stat": file_stat,
+                        "page_workers": page_workers,
+                        "name": file_path.name,
+                        "index": idx + 1,
+                        "total": len(all_files),
+                    }
+                )
 
-            except Exception as e:
+        # Extract (possibly in parallel) and merge results in deterministic job order
+        for job, entry, error, stats in _iter_extraction_results(jobs, workers):
+            metrics.record_file(job["file_path"], stats, "error" if error is not None else "ok")
+            if error is not None:
                 error_count += 1
-                logger.error(f"  [ERROR] Error processing {file_path.name}: {e}", exc_info=True)
-                knowledge_base[doc_id] = {
-                    "file_path": str(file_path),
-                    "type": folder_name,
+                file_path = pathlib.Path(job["file_path"])
+                knowledge_base[job["doc_id"]] = {
+                    "file_path": job["file_path"],
+                    "type": job["folder_name"],
                     "format": file_path.suffix.lower(),
-                    "error": str(e),
+                    "error": error,
                     "processed_at": datetime.now().isoformat(),
                 }
+                continue
 
-    # Extract tables from PDFs using pdfplumber - process in batches to manage memory
-    logger.info(f"\n{'=' * 60}")
-    logger.info("Extracting tables from PDFs...")
-    logger.info(f"{'=' * 60}")
-
-    # Get PDF documents that need table extraction
-    pdf_docs = [
-        (doc_id, doc_data)
-        for doc_id, doc_data in knowledge_base.items()
-        if doc_data.get("format") == ".pdf" and "error" not in doc_data
-    ]
-
-    for idx, (doc_id, doc_data) in enumerate(pdf_docs):
-        file_path = doc_data.get("file_path")
-        if file_path:
-            logger.info(f"  [{idx + 1}/{len(pdf_docs)}] Table extraction: {doc_id}")
-            pdf_tables = extract_tables_from_pdf(file_path)
-            if pdf_tables:
-                doc_data["tables"] = pdf_tables
-                logger.info(f"    Found {len(pdf_tables)} tables")
-            else:
-                doc_data["tables"] = []
-                logger.info(f"    No tables found")
-
-    # Add OCR processing for PDFs if enabled - process in batches to manage memory
-    if OCR_ENABLED:
-        logger.info(f"\n{'=' * 60}")
-        logger.info("Running additional OCR on PDFs for table detection...")
-        logger.info(f"{'=' * 60}")
-
-        # Get PDF documents that don't have tables yet
-        ocr_docs = [
-            (doc_id, doc_data)
-            for doc_id, doc_data in knowledge_base.items()
-            if doc_data.get("format") == ".pdf"
-            and "error" not in doc_data
-            and not doc_data.get("tables")
-        ]
+            # Keep the source hash so state validation can detect stale documents
+            if job["file_hash"]:
+                entry["file_hash"] = job["file_hash"]
+            knowledge_base[job["doc_id"]] = entry
 
-        for idx, (doc_id, doc_data) in enumerate(ocr_docs):
-            file_path = doc_data.get("file_path")
-            if file_path:
-                logger.info(f"  [{idx + 1}/{len(ocr_docs)}] OCR scanning: {doc_id}")
-                ocr_tables = detect_tables_with_ocr(file_path)
-                if ocr_tables:
-                    doc_data["tables"] = ocr_tables
-                    logger.info(f"    Found {len(ocr_tables)} tables via OCR")
-    else:
-        logger.info("\nOCR is disabled - skipping additional OCR processing")
+            # Record successful processing
+            if job["file_hash"]:
+                dup_tracker.record_processed(job["file_path"], job["file_hash"], job["file_stat"])
+            logger.info(f"  [OK] Successfully processed")
+    finally:
+        # Buffered tracker records are written even if the run is interrupted
+        if owns_tracker:
+            dup_tracker.close()
+        else:
+            dup_tracker.flush()
 
     logger.info(f"\n{'=' * 60}")
     logger.info(f"Processing Summary:")
     logger.info(f"  Total files found: {file_count}")
     logger.info(f"  Files skipped (duplicates): {skipped_count}")
+    logger.info(f"    Unchanged since last run (not rehashed): {unchanged_count}")
     logger.info(
         f"  Successfully processed: {len([d for d in knowledge_base.values() if 'error' not in d])}"
     )
     logger.info(f"  Errors: {error_count}")
+    if jobs:
+        metrics.log_summary()
     logger.info(f"{'=' * 60}\n")
 
     return knowledge_base
@@ -1332,21 +3176,36 @@ import sqlite3
 import atexit
 
 
-import threading
+class DuplicateTracker:
+    """SQLite record of processed files, mirrored in memory for fast lookups.
 
+    All rows are loaded once into a path -> hash dict and a hash -> path dict,
+    so duplicate checks never hit the database. New records are buffered and
+    written in one transaction per ``batch_size`` files; call ``flush()`` or
+    ``close()`` to write the remainder.
 
-class DuplicateTracker:
-    def __init__(self, db_path=None):
+    Each row also stores the file's (size, mtime_ns, inode) at the time it was
+    hashed, which lets unchanged files be recognized without reading them.
+    """
+
+    def __init__(self, db_path=None, batch_size=None):
         self.db_path = db_path or CONFIG["DB_PATH"]
+        self.batch_size = max(1, batch_size or CONFIG["DB_BATCH_SIZE"])
         self.local = threading.local()  # Thread-local storage for connection
         self.lock = threading.Lock()  # Lock for thread safety
+        self._paths = None  # file_path -> file_hash, loaded on first use
+        self._hashes = None  # file_hash -> file_path
+        self._stats = None  # file_path -> (size, mtime_ns, inode)
+        self._pending = []
         self.setup_db()
         # Removed atexit.register to prevent potential hanging issues
 
     def get_connection(self):
         """Get thread-local database connection."""
         if not hasattr(self.local, "conn"):
-            self.local.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.local.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self.local.conn.execute("PRAGMA journal_mode=WAL")
+            self.local.conn.execute("PRAGMA synchronous=NORMAL")
         return self.local.conn
 
     def setup_db(self):
@@ -1360,56 +3219,136 @@ class DuplicateTracker:
                 UNIQUE(file_hash)
             )
         """)
+        # Migrate databases created before stat-based change detection
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(processed_files)")}
+        for column in ("file_size", "mtime_ns", "inode"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE processed_files ADD COLUMN {column} INTEGER")
         conn.commit()
 
+    def _ensure_loaded(self):
+        """Load every tracked row into memory (caller holds the lock)."""
+        if self._paths is not None:
+            return
+        self._paths = {}
+        self._hashes = {}
+        self._stats = {}
+        try:
+            conn = self.get_connection()
+            for file_path, file_hash, size, mtime_ns, inode in conn.execute(
+                "SELECT file_path, file_hash, file_size, mtime_ns, inode FROM processed_files"
+            ):
+                self._paths[file_path] = file_hash
+                self._hashes[file_hash] = file_path
+                if size is not None:
+                    self._stats[file_path] = (size, mtime_ns, inode)
+        except sqlite3.Error as e:
+            logger.error(f"Database error loading tracked files: {e}")
+
+    def preload(self):
+        """Load all tracked hashes up front so later lookups are in-memory only."""
+        with self.lock:
+            self._ensure_loaded()
+            return len(self._paths)
+
     def is_duplicate(self, file_path, file_hash):
         """Check if file has been processed before."""
         with self.lock:  # Thread-safe access
-            try:
-                conn = self.get_connection()
-                cursor = conn.execute(
-                    "SELECT file_path FROM processed_files WHERE file_hash = ?", (file_hash,)
-                )
-                result = cursor.fetchone()
-                return result is not None
-            except sqlite3.Error as e:
-                logger.error(f"Database error checking duplicate: {e}")
-                return False  # Assume not duplicate if DB error occurs
-
-    def record_processed(self, file_path, file_hash):
-        """Record that a file has been processed."""
+            self._ensure_loaded()
+            return file_hash in self._hashes
+
+    def get_tracked_hash(self, file_path):
+        """Return the hash recorded for a file path, or None if it is not tracked."""
+        with self.lock:
+            self._ensure_loaded()
+            return self._paths.get(str(file_path))
+
+    def get_unchanged_hash(self, file_path, file_stat):
+        """Return the tracked hash if the file's stat signature is unchanged, else None."""
+        if file_stat is None:
+            return None
+        with self.lock:
+            self._ensure_loaded()
+            file_path = str(file_path)
+            if self._stats.get(file_path) == tuple(file_stat):
+                return self._paths.get(file_path)
+            return None
+
+    def record_processed(self, file_path, file_hash, file_stat=None):
+        """Record that a file has been processed (written in batches).
+
+        Args:
+            file_stat: (size, mtime_ns, inode) captured when the file was hashed;
+                looked up from disk when omitted
+        """
+        file_path = str(file_path)
+        if file_stat is None:
+            file_stat = get_file_stat(file_path)
         with self.lock:  # Thread-safe access
-            try:
-                conn = self.get_connection()
-                conn.execute(
-                    "INSERT OR REPLACE INTO processed_files (file_path, file_hash) VALUES (?, ?)",
-                    (str(file_path), file_hash),
+            self._ensure_loaded()
+            # Mirror INSERT OR REPLACE semantics: path and hash are both unique
+            old_hash = self._paths.pop(file_path, None)
+            if old_hash is not None:
+                self._hashes.pop(old_hash, None)
+            self._stats.pop(file_path, None)
+            old_path = self._hashes.pop(file_hash, None)
+            if old_path is not None:
+                self._paths.pop(old_path, None)
+                self._stats.pop(old_path, None)
+            self._paths[file_path] = file_hash
+            self._hashes[file_hash] = file_path
+            if file_stat is not None:
+                self._stats[file_path] = tuple(file_stat)
+
+            size, mtime_ns, inode = file_stat or (None, None, None)
+            self._pending.append((file_path, file_hash, size, mtime_ns, inode))
+            if len(self._pending) >= self.batch_size:
+                self._flush_pending()
+
+    def _flush_pending(self):
+        """Write buffered records in a single transaction (caller holds the lock)."""
+        if not self._pending:
+            return
+        try:
+            conn = self.get_connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO processed_files "
+                    "(file_path, file_hash, file_size, mtime_ns, inode) VALUES (?, ?, ?, ?, ?)",
+                    self._pending,
                 )
-                conn.commit()
-            except sqlite3.Error as e:
-                logger.error(f"Failed to record processed file: {e}")
+            self._pending = []
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record processed files: {e}")
+
+    def flush(self):
+        """Commit any buffered records."""
+        with self.lock:
+            self._flush_pending()
+
+    def get_tracked_file_map(self):
+        """Get a dict of tracked file path -> file hash."""
+        with self.lock:
+            self._ensure_loaded()
+            return dict(self._paths)
+
+    def get_tracked_hash_set(self):
+        """Get the set of all tracked file hashes."""
+        with self.lock:
+            self._ensure_loaded()
+            return set(self._hashes)
 
     def get_all_tracked_files(self):
         """Get list of all tracked file paths."""
         with self.lock:  # Thread-safe access
-            try:
-                conn = self.get_connection()
-                cursor = conn.execute("SELECT file_path FROM processed_files")
-                return [row[0] for row in cursor.fetchall()]
-            except sqlite3.Error as e:
-                logger.error(f"Database error getting tracked files: {e}")
-                return []
+            self._ensure_loaded()
+            return list(self._paths)
 
     def get_all_tracked_hashes(self):
         """Get list of all tracked file hashes."""
         with self.lock:  # Thread-safe access
-            try:
-                conn = self.get_connection()
-                cursor = conn.execute("SELECT file_hash FROM processed_files")
-                return [row[0] for row in cursor.fetchall()]
-            except sqlite3.Error as e:
-                logger.error(f"Database error getting tracked hashes: {e}")
-                return []
+            self._ensure_loaded()
+            return list(self._hashes)
 
     def clear_all_records(self):
         """Clear all duplicate tracking records."""
@@ -1418,25 +3357,214 @@ class DuplicateTracker:
                 conn = self.get_connection()
                 conn.execute("DELETE FROM processed_files")
                 conn.commit()
+                self._pending = []
+                self._paths = {}
+                self._hashes = {}
+                self._stats = {}
                 logger.info("Cleared all duplicate tracking records")
             except sqlite3.Error as e:
                 logger.error(f"Failed to clear duplicate records: {e}")
 
     def get_record_count(self):
         """Get total number of tracked records."""
+        with self.lock:  # Thread-safe access
+            self._ensure_loaded()
+            return len(self._paths)
+
+    def close(self):
+        """Flush buffered records and close database connection."""
+        self.flush()
+        if hasattr(self.local, "conn"):
+            self.local.conn.close()
+            del self.local.conn
+
+
+class OCRResultCache:
+    """Persistent SQLite cache of OCR results keyed by page image fingerprint.
+
+    Keys combine the rendered page pixels with the OCR language, PSM mode and
+    render DPI, so a page is only sent to Tesseract again when one of those
+    changes. The cache is bounded by size and evicts least recently used entries.
+    """
+
+    def __init__(self, db_path=None, max_bytes=None):
+        self.db_path = db_path or CONFIG["OCR_CACHE_PATH"]
+        self.max_bytes = max_bytes if max_bytes is not None else CONFIG["OCR_CACHE_MAX_BYTES"]
+        self.local = threading.local()  # Thread-local storage for connection
+        self.lock = threading.Lock()  # Lock for thread safety
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes = 0
+        self.setup_db()
+
+    def get_connection(self):
+        """Get thread-local database connection."""
+        if not hasattr(self.local, "conn"):
+            self.local.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            # WAL lets page-range and file-level worker processes share the cache
+            self.local.conn.execute("PRAGMA journal_mode=WAL")
+        return self.local.conn
+
+    def setup_db(self):
+        """Setup database table for cached OCR results."""
+        conn = self.get_connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS ocr_results (
+                cache_key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_access REAL NOT NULL
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ocr_results_last_access ON ocr_results (last_access)"
+        )
+        conn.commit()
+        self._total_bytes = self._stored_bytes(conn)
+
+    @staticmethod
+    def make_key(fingerprint, lang, psm_mode, dpi, kind="data"):
+        """Build the cache key for one OCR call on one page image."""
+        return f"{kind}:{lang}:psm{psm_mode}:dpi{dpi}:{fingerprint}"
+
+    def get(self, cache_key):
+        """Return the cached OCR result for a key, or None on a miss."""
+        with self.lock:  # Thread-safe access
+            try:
+                conn = self.get_connection()
+                row = conn.execute(
+                    "SELECT result FROM ocr_results WHERE cache_key = ?", (cache_key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+
+                conn.execute(
+                    "UPDATE ocr_results SET last_access = ? WHERE cache_key = ?",
+                    (time.time(), cache_key),
+                )
+                conn.commit()
+                self.hits += 1
+                return json.loads(row[0])
+            except (sqlite3.Error, ValueError) as e:
+                logger.error(f"OCR cache lookup failed: {e}")
+                self.misses += 1
+                return None
+
+    def put(self, cache_key, result):
+        """Store an OCR result and evict old entries if the cache grew too large."""
+        payload = json.dumps(result, ensure_ascii=False)
+        size_bytes = len(payload.encode("utf-8"))
+
+        with self.lock:  # Thread-safe access
+            try:
+                conn = self.get_connection()
+                # A replaced entry's bytes leave the total along with it
+                row = conn.execute(
+                    "SELECT size_bytes FROM ocr_results WHERE cache_key = ?", (cache_key,)
+                ).fetchone()
+                replaced_bytes = row[0] if row else 0
+                conn.execute(
+                    "INSERT OR REPLACE INTO ocr_results (cache_key, result, size_bytes, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (cache_key, payload, size_bytes, time.time()),
+                )
+                conn.commit()
+                self._total_bytes += size_bytes - replaced_bytes
+                if self._total_bytes > self.max_bytes:
+                    self._evict(conn)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to store OCR result in cache: {e}")
+
+    def _stored_bytes(self, conn):
+        return conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM ocr_results").fetchone()[0]
+
+    def _evict(self, conn):
+        """Drop least recently used entries until the cache is back under 90% of its limit."""
+        # Other processes may have written to the cache, so start from the real total
+        self._total_bytes = self._stored_bytes(conn)
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+
+        while self._total_bytes > target:
+            rows = conn.execute(
+                "SELECT cache_key, size_bytes FROM ocr_results ORDER BY last_access LIMIT 100"
+            ).fetchall()
+            if not rows:
+                break
+            for cache_key, size_bytes in rows:
+                if self._total_bytes <= target:
+                    break
+                conn.execute("DELETE FROM ocr_results WHERE cache_key = ?", (cache_key,))
+                self._total_bytes -= size_bytes
+                evicted += 1
+
+        conn.commit()
+        logger.debug(f"Evicted {evicted} entries from OCR cache")
+
+    def stats(self):
+        """Get hit/miss counters for this process plus stored entry count and size."""
+        with self.lock:  # Thread-safe access
+            try:
+                conn = self.get_connection()
+                entries, size_bytes = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM ocr_results"
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.error(f"Database error getting OCR cache stats: {e}")
+                entries, size_bytes = 0, 0
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size_bytes,
+        }
+
+    def clear(self):
+        """Remove all cached OCR results."""
         with self.lock:  # Thread-safe access
             try:
                 conn = self.get_connection()
-                cursor = conn.execute("SELECT COUNT(*) FROM processed_files")
-                return cursor.fetchone()[0]
+                conn.execute("DELETE FROM ocr_results")
+                conn.commit()
+                self._total_bytes = 0
+                logger.info("Cleared OCR result cache")
             except sqlite3.Error as e:
-                logger.error(f"Database error getting record count: {e}")
-                return 0
+                logger.error(f"Failed to clear OCR cache: {e}")
 
     def close(self):
         """Close database connection."""
         if hasattr(self.local, "conn"):
             self.local.conn.close()
+            del self.local.conn
+
+
+_ocr_cache = None
+_ocr_cache_pid = None
+
+
+def get_ocr_cache():
+    """Get this process's OCR result cache, or None when caching is disabled.
+
+    Each process (including pool workers) opens its own connection.
+    """
+    global _ocr_cache, _ocr_cache_pid
+
+    if not CONFIG["OCR_CACHE_ENABLED"]:
+        return None
+
+    if _ocr_cache is None or _ocr_cache_pid != os.getpid():
+        try:
+            _ocr_cache = OCRResultCache()
+            _ocr_cache_pid = os.getpid()
+        except sqlite3.Error as e:
+            logger.warning(f"OCR cache unavailable, continuing without it: {e}")
+            return None
+    return _ocr_cache
 
 
 def atomic_save_json(data, file_path):
@@ -1454,74 +3582,552 @@ def atomic_save_json(data, file_path):
             # Recursively validate nested structures
             _validate_nested_data(value, f"key '{key}'")
 
+    try:
+        _atomic_write(file_path, lambda f: json.dump(data, f, ensure_ascii=False, indent=2))
+        logger.info(f"Knowledge base saved to {file_path}")
+    except Exception as e:
+        logger.error(f"Failed to save knowledge base: {e}")
+        raise
+
+
+def _atomic_write(file_path, write_func, binary=False):
+    """Write a file atomically: write_func fills a temp file that is then moved into place."""
     temp_file = None
     try:
         # Create temporary file in the same directory to ensure atomic move
         temp_dir = os.path.dirname(file_path)
         with tempfile.NamedTemporaryFile(
-            mode="w", dir=temp_dir, delete=False, encoding="utf-8"
+            mode="wb" if binary else "w",
+            dir=temp_dir,
+            delete=False,
+            encoding=None if binary else "utf-8",
         ) as temp_f:
             temp_file = temp_f.name
-            json.dump(data, temp_f, ensure_ascii=False, indent=2)
+            write_func(temp_f)
+
+        # Atomic move operation
+        shutil.move(temp_file, file_path)
+
+    except Exception:
+        # Clean up temp file if something went wrong
+        if temp_file and os.path.exists(temp_file):
+            try:
+                os.unlink(temp_file)
+            except:
+                pass  # Best effort cleanup
+        raise
+
+
+def _validate_nested_data(obj, path=""):
+    """Recursively validate nested data structures to prevent corruption."""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if not isinstance(key, str):
+                raise ValueError(f"All keys must be strings, got {type(key)} at {path}.{key}")
+            _validate_nested_data(value, f"{path}.{key}")
+    elif isinstance(obj, list):
+        for i, item in enumerate(obj):
+            _validate_nested_data(item, f"{path}[{i}]")
+    elif isinstance(obj, (str, int, float, bool)) or obj is None:
+        # These are valid primitive types
+        pass
+    else:
+        raise ValueError(f"Invalid data type {type(obj)} at {path}")
+
+
+def _sanitize_text(value):
+    """Remove NUL characters from extracted text; content is never truncated."""
+    return value.replace("\x00", "") if "\x00" in value else value
+
+
+def _sanitize_document_data(data):
+    """Sanitize document data to prevent injection and ensure valid content."""
+    if not isinstance(data, dict):
+        return data
+
+    sanitized = {}
+    for key, value in data.items():
+        # Sanitize keys
+        clean_key = str(key)[:1000] if key is not None else ""  # Limit key length
+
+        # Sanitize values based on type
+        if isinstance(value, str):
+            sanitized[clean_key] = _sanitize_text(value)
+        elif isinstance(value, dict):
+            sanitized[clean_key] = _sanitize_document_data(value)
+        elif isinstance(value, list):
+            sanitized[clean_key] = [
+                _sanitize_document_data(item) if isinstance(item, dict) else item for item in value
+            ]
+        else:
+            # For other types, just pass through
+            sanitized[clean_key] = value
+
+    return sanitized
+
+
+def _serialize_document(doc_data):
+    """Compact JSON payload of a document and its SHA-256 content hash.
+
+    Shared by the sharded store and snapshot object store, so a document has the
+    same content hash in both.
+    """
+    payload = json.dumps(doc_data, ensure_ascii=False, separators=(",", ":"))
+    return payload, hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class KnowledgeBaseStore:
+    """Sharded knowledge base with one JSON file per document and a small manifest.
+
+    Layout under the store root:
+        manifest.json            doc_id -> shard file, content hash and summary fields
+        documents/<shard>.json   one knowledge base entry per file
+
+    Writes compare content hashes against the manifest, so an incremental run
+    only rewrites the documents that actually changed. The manifest carries the
+    file path, type and format of every document, so callers that only need an
+    overview never have to open the shards.
+    """
+
+    MANIFEST_VERSION = 1
+    SUMMARY_FIELDS = ("file_path", "file_hash", "type", "format", "processed_at")
+
+    def __init__(self, root=None):
+        self.root = pathlib.Path(root or CONFIG["KB_STORE_DIR"])
+        self.documents_dir = self.root / "documents"
+        self.manifest_path = self.root / "manifest.json"
+        self._manifest = None
+
+    def exists(self):
+        """Check whether the store has been initialized on disk."""
+        return self.manifest_path.exists()
+
+    @property
+    def manifest(self):
+        """The store manifest, loaded lazily."""
+        if self._manifest is None:
+            self._manifest = self._load_manifest()
+        return self._manifest
+
+    def _load_manifest(self):
+        if not self.manifest_path.exists():
+            return {"version": self.MANIFEST_VERSION, "documents": {}}
+
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if not isinstance(manifest, dict) or not isinstance(manifest.get("documents"), dict):
+            raise ValueError(f"Invalid knowledge base manifest: {self.manifest_path}")
+        return manifest
+
+    def _save_manifest(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        _atomic_write(
+            str(self.manifest_path),
+            lambda f: json.dump(self.manifest, f, ensure_ascii=False, indent=2),
+        )
+
+    @staticmethod
+    def shard_name(doc_id):
+        """Filesystem-safe, collision-free shard filename for a document id."""
+        slug = re.sub(r"[^\w\-]+", "_", doc_id).strip("_")[:80]
+        digest = hashlib.sha1(doc_id.encode("utf-8")).hexdigest()[:10]
+        return f"{slug}-{digest}.json"
+
+    def document_ids(self):
+        """List stored document ids in insertion order."""
+        return list(self.manifest["documents"].keys())
+
+    def summaries(self):
+        """Get manifest entries (shard, hash and summary fields) keyed by document id."""
+        return self.manifest["documents"]
+
+    def load_document(self, doc_id):
+        """Load a single document from its shard."""
+        entry = self.manifest["documents"][doc_id]
+        with open(self.documents_dir / entry["file"], "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_all(self):
+        """Load every document into a single knowledge base dict."""
+        return {doc_id: self.load_document(doc_id) for doc_id in self.document_ids()}
+
+    def write_documents(self, documents):
+        """Write new or changed documents; documents whose content is unchanged are skipped.
+
+        Returns:
+            int: Number of shards written
+        """
+        self.documents_dir.mkdir(parents=True, exist_ok=True)
+        written = 0
+
+        for doc_id, doc_data in documents.items():
+            if not isinstance(doc_id, str):
+                raise ValueError(f"All keys must be strings, got {type(doc_id)} for key {doc_id}")
+            if isinstance(doc_data, (dict, list)):
+                _validate_nested_data(doc_data, f"key '{doc_id}'")
+
+            payload, content_hash = _serialize_document(doc_data)
+            existing = self.manifest["documents"].get(doc_id)
+            if existing and existing.get("hash") == content_hash:
+                continue
+
+            shard = self.shard_name(doc_id)
+            _atomic_write(str(self.documents_dir / shard), lambda f: f.write(payload))
+
+            entry = {"file": shard, "hash": content_hash}
+            if isinstance(doc_data, dict):
+                entry.update({k: doc_data[k] for k in self.SUMMARY_FIELDS if k in doc_data})
+                if "error" in doc_data:
+                    entry["error"] = True
+            self.manifest["documents"][doc_id] = entry
+            written += 1
+
+        if written or not self.exists():
+            self._save_manifest()
+
+        logger.info(
+            f"Knowledge base store: wrote {written} of {len(documents)} documents to {self.root}"
+        )
+        return written
+
+    def remove_documents(self, doc_ids):
+        """Delete documents and their shards from the store."""
+        removed = 0
+        for doc_id in doc_ids:
+            entry = self.manifest["documents"].pop(doc_id, None)
+            if entry is None:
+                continue
+            try:
+                (self.documents_dir / entry["file"]).unlink()
+            except FileNotFoundError:
+                pass
+            removed += 1
+
+        if removed:
+            self._save_manifest()
+        return removed
+
+    def replace_all(self, knowledge_base):
+        """Make the store match knowledge_base, rewriting only documents that differ.
+
+        Returns:
+            tuple: (documents written, documents removed)
+        """
+        written = self.write_documents(knowledge_base)
+        stale = [doc_id for doc_id in self.document_ids() if doc_id not in knowledge_base]
+        return written, self.remove_documents(stale)
+
+    def restore(self, content_hashes, load_document):
+        """Make the store match a doc_id -> content hash mapping (e.g. a snapshot).
+
+        Only documents whose hash differs are fetched through load_document(hash)
+        and rewritten; documents not in the mapping are removed.
+
+        Returns:
+            tuple: (documents written, documents removed)
+        """
+        current = self.manifest["documents"]
+        changed = {
+            doc_id: load_document(content_hash)
+            for doc_id, content_hash in content_hashes.items()
+            if current.get(doc_id, {}).get("hash") != content_hash
+        }
+        written = self.write_documents(changed) if changed else 0
+        stale = [doc_id for doc_id in self.document_ids() if doc_id not in content_hashes]
+        removed = self.remove_documents(stale)
+
+        # Keep the snapshot's document order for exports
+        if list(self.manifest["documents"]) != list(content_hashes):
+            self.manifest["documents"] = {
+                doc_id: self.manifest["documents"][doc_id] for doc_id in content_hashes
+            }
+            self._save_manifest()
+        return written, removed
+
+    def import_legacy_json(self, json_path):
+        """Populate the store from a legacy single-file knowledge_base.json."""
+        knowledge_base = load_knowledge_base(json_path)
+        written, removed = self.replace_all(knowledge_base)
+        logger.info(f"Imported {len(knowledge_base)} entries from {json_path} ({written} written)")
+        return written
+
+    def export_legacy_json(self, json_path):
+        """Stream every document into a single legacy knowledge_base.json.
+
+        The output is identical to atomic_save_json on the fully loaded knowledge
+        base, but only one document is held in memory at a time.
+        """
+        doc_ids = self.document_ids()
+
+        def write_documents(f):
+            f.write("{")
+            for idx, doc_id in enumerate(doc_ids):
+                body = json.dumps(self.load_document(doc_id), ensure_ascii=False, indent=2)
+                f.write("," if idx else "")
+                f.write(f"\n  {json.dumps(doc_id, ensure_ascii=False)}: ")
+                f.write(body.replace("\n", "\n  "))
+            f.write("\n}" if doc_ids else "}")
+
+        _atomic_write(str(json_path), write_documents)
+        logger.info(f"Exported {len(doc_ids)} entries to legacy knowledge base {json_path}")
+
+
+def load_knowledge_base(kb_path):
+    """Load a legacy single-file knowledge base, returning {} if it does not exist."""
+    kb_path = pathlib.Path(kb_path)
+    if not kb_path.exists():
+        return {}
+
+    try:
+        with open(kb_path, "r", encoding="utf-8") as f:
+            raw_data = f.read()
+            # Basic validation to prevent certain injection attacks
+            if "\x00" in raw_data:
+                raise ValueError("JSON file contains null bytes")
+
+            # Parse JSON with limits to prevent resource exhaustion
+            knowledge_base = json.loads(raw_data)
+
+            # Validate that the loaded data is a dictionary
+            if not isinstance(knowledge_base, dict):
+                raise ValueError("Knowledge base must be a dictionary")
+
+            logger.info(
+                f"Loaded existing knowledge base with {len([k for k in knowledge_base.keys() if not k.startswith('knowledge_base')])} documents"
+            )
+            return knowledge_base
+    except (json.JSONDecodeError, ValueError) as e:
+        logger.error(f"Could not load existing knowledge_base due to invalid format: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"Could not load existing knowledge_base: {e}")
+        raise
+
+
+# Arabic normalization applied to both indexed text and queries: strip diacritics
+# and tatweel, and fold alef/yeh variants (same rules as ArabicProcessor.normalize)
+_ARABIC_SEARCH_TRANSLATION = str.maketrans(
+    {
+        **{chr(code): None for code in range(0x064B, 0x0660)},
+        "\u0670": None,
+        "\u0640": None,
+        "إ": "ا",
+        "أ": "ا",
+        "آ": "ا",
+        "ى": "ي",
+    }
+)
+
+
+def normalize_search_text(text):
+    """Normalize text for full-text indexing and querying."""
+    return text.translate(_ARABIC_SEARCH_TRANSLATION)
+
+
+class SearchIndex:
+    """SQLite FTS5 full-text index over extracted segments and table cells.
+
+    Each segment and each table becomes one indexed chunk. Documents are
+    re-indexed only when their content hash changes, so the index can be
+    updated after every processing run.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or CONFIG["SEARCH_INDEX_PATH"]
+        self.local = threading.local()  # Thread-local storage for connection
+        self.lock = threading.Lock()  # Lock for thread safety
+        self.setup_db()
+
+    def get_connection(self):
+        """Get thread-local database connection."""
+        if not hasattr(self.local, "conn"):
+            self.local.conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self.local.conn.execute("PRAGMA journal_mode=WAL")
+        return self.local.conn
 
-        # Atomic move operation
-        shutil.move(temp_file, file_path)
-        logger.info(f"Knowledge base saved to {file_path}")
+    def setup_db(self):
+        """Setup index tables."""
+        conn = self.get_connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS indexed_documents (
+                doc_id TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                file_path TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_chunks (
+                id INTEGER PRIMARY KEY,
+                doc_id TEXT NOT NULL,
+                location TEXT NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_search_chunks_doc ON search_chunks (doc_id)")
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5("
+            "content, tokenize='unicode61 remove_diacritics 2')"
+        )
+        conn.commit()
 
-    except Exception as e:
-        # Clean up temp file if something went wrong
-        if temp_file and os.path.exists(temp_file):
-            try:
-                os.unlink(temp_file)
-            except:
-                pass  # Best effort cleanup
-        logger.error(f"Failed to save knowledge base: {e}")
-        raise
+    @staticmethod
+    def document_chunks(doc_data):
+        """Yield (location, text) for every segment and table in a knowledge base entry."""
+        for title, text in (doc_data.get("segments") or {}).items():
+            if isinstance(text, str) and text.strip():
+                yield f"Section: {title}", f"{title}\n{text}"
 
+        for idx, table in enumerate(doc_data.get("tables") or []):
+            rows = table.get("data") if isinstance(table, dict) else None
+            if not rows:
+                continue
+            text = "\n".join(
+                " | ".join(str(cell) for cell in row if cell not in (None, "")) for row in rows
+            )
+            if text.strip():
+                location = f"Table {idx + 1}"
+                if table.get("page"):
+                    location += f" (page {table['page']})"
+                yield location, text
+
+    def _delete_document(self, conn, doc_id):
+        conn.execute(
+            "DELETE FROM search_fts WHERE rowid IN (SELECT id FROM search_chunks WHERE doc_id = ?)",
+            (doc_id,),
+        )
+        conn.execute("DELETE FROM search_chunks WHERE doc_id = ?", (doc_id,))
+        conn.execute("DELETE FROM indexed_documents WHERE doc_id = ?", (doc_id,))
+
+    def index_documents(self, documents):
+        """Index new or changed documents; unchanged documents are skipped.
+
+        Returns:
+            int: Number of documents (re)indexed
+        """
+        indexed = 0
+        with self.lock:
+            conn = self.get_connection()
+            known = dict(conn.execute("SELECT doc_id, content_hash FROM indexed_documents"))
+            with conn:
+                for doc_id, doc_data in documents.items():
+                    if doc_id.startswith("knowledge_base") or not isinstance(doc_data, dict):
+                        continue
+                    content_hash = _serialize_document(doc_data)[1]
+                    if known.get(doc_id) == content_hash:
+                        continue
 
-def _validate_nested_data(obj, path=""):
-    """Recursively validate nested data structures to prevent corruption."""
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            if not isinstance(key, str):
-                raise ValueError(f"All keys must be strings, got {type(key)} at {path}.{key}")
-            _validate_nested_data(value, f"{path}.{key}")
-    elif isinstance(obj, list):
-        for i, item in enumerate(obj):
-            _validate_nested_data(item, f"{path}[{i}]")
-    elif isinstance(obj, (str, int, float, bool)) or obj is None:
-        # These are valid primitive types
-        pass
-    else:
-        raise ValueError(f"Invalid data type {type(obj)} at {path}")
+                    self._delete_document(conn, doc_id)
+                    for location, text in self.document_chunks(doc_data):
+                        cursor = conn.execute(
+                            "INSERT INTO search_chunks (doc_id, location) VALUES (?, ?)",
+                            (doc_id, location),
+                        )
+                        conn.execute(
+                            "INSERT INTO search_fts (rowid, content) VALUES (?, ?)",
+                            (cursor.lastrowid, normalize_search_text(text)),
+                        )
+                    conn.execute(
+                        "INSERT INTO indexed_documents (doc_id, content_hash, file_path) "
+                        "VALUES (?, ?, ?)",
+                        (doc_id, content_hash, doc_data.get("file_path")),
+                    )
+                    indexed += 1
+
+        if indexed:
+            logger.info(f"Search index: indexed {indexed} documents")
+        return indexed
+
+    def remove_documents(self, doc_ids):
+        """Drop documents from the index."""
+        with self.lock:
+            conn = self.get_connection()
+            with conn:
+                for doc_id in doc_ids:
+                    self._delete_document(conn, doc_id)
+
+    def sync(self, knowledge_base):
+        """Make the index match knowledge_base (index changes, drop removed documents).
+
+        Returns:
+            tuple: (documents indexed, documents removed)
+        """
+        indexed = self.index_documents(knowledge_base)
+        stale = [doc_id for doc_id in self.document_ids() if doc_id not in knowledge_base]
+        self.remove_documents(stale)
+        return indexed, len(stale)
+
+    def document_ids(self):
+        """List indexed document ids."""
+        with self.lock:
+            conn = self.get_connection()
+            return [row[0] for row in conn.execute("SELECT doc_id FROM indexed_documents")]
+
+    @staticmethod
+    def build_match_query(query):
+        """Turn free text into an FTS5 query matching all terms (quoted, so operators are literal)."""
+        terms = re.findall(r"\w+", normalize_search_text(query))
+        return " ".join(f'"{term}"' for term in terms)
+
+    def search(self, query, limit=10):
+        """Search segments and tables.
+
+        Returns:
+            list: Best matches first, as dicts with doc_id, file_path, location,
+                snippet (matches wrapped in [ ]) and score (lower is better)
+        """
+        match_query = self.build_match_query(query)
+        if not match_query:
+            return []
 
+        with self.lock:
+            conn = self.get_connection()
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT c.doc_id, d.file_path, c.location,
+                           snippet(search_fts, 0, '[', ']', '...', 16),
+                           bm25(search_fts) AS score
+                    FROM search_fts
+                    JOIN search_chunks c ON c.id = search_fts.rowid
+                    LEFT JOIN indexed_documents d ON d.doc_id = c.doc_id
+                    WHERE search_fts MATCH ?
+                    ORDER BY score
+                    LIMIT ?
+                    """,
+                    (match_query, limit),
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.error(f"Search failed for {query!r}: {e}")
+                return []
 
-def _sanitize_document_data(data):
-    """Sanitize document data to prevent injection and ensure valid content."""
-    if not isinstance(data, dict):
-        return data
+        return [
+            {
+                "doc_id": doc_id,
+                "file_path": file_path,
+                "location": location,
+                "snippet": snippet,
+                "score": score,
+            }
+            for doc_id, file_path, location, snippet, score in rows
+        ]
 
-    sanitized = {}
-    for key, value in data.items():
-        # Sanitize keys
-        clean_key = str(key)[:1000] if key is not None else ""  # Limit key length
+    def close(self):
+        """Close database connection."""
+        if hasattr(self.local, "conn"):
+            self.local.conn.close()
+            del self.local.conn
 
-        # Sanitize values based on type
-        if isinstance(value, str):
-            # Remove potentially harmful characters and limit length
-            clean_value = value.replace("\x00", "").replace("\r\x00", "")[:1000000]  # 1MB limit
-            sanitized[clean_key] = clean_value
-        elif isinstance(value, dict):
-            sanitized[clean_key] = _sanitize_document_data(value)
-        elif isinstance(value, list):
-            sanitized[clean_key] = [
-                _sanitize_document_data(item) if isinstance(item, dict) else item for item in value
-            ]
-        else:
-            # For other types, just pass through
-            sanitized[clean_key] = value
 
-    return sanitized
+def search_knowledge_base(query, limit=10, index_path=None):
+    """Search the full-text index of processed documents.
+
+    Returns:
+        list: Ranked matches (see SearchIndex.search)
+    """
+    index = SearchIndex(index_path)
+    try:
+        return index.search(query, limit=limit)
+    finally:
+        index.close()
 
 
 def synchronize_states(dup_tracker, knowledge_base, kb_path):
@@ -1536,7 +4142,13 @@ def synchronize_states(dup_tracker, knowledge_base, kb_path):
     Returns:
         dict: Synchronization results
     """
-    sync_results = {"status": "success", "actions_taken": [], "warnings": [], "errors": []}
+    sync_results = {
+        "status": "success",
+        "actions_taken": [],
+        "warnings": [],
+        "errors": [],
+        "diff": {},
+    }
 
     try:
         # Create backup before synchronization
@@ -1550,29 +4162,12 @@ def synchronize_states(dup_tracker, knowledge_base, kb_path):
             sync_results["warnings"].append(f"Could not create backup: {e}")
 
         # Get current state
-        tracked_files = dup_tracker.get_all_tracked_files()
-        kb_docs = {k: v for k, v in knowledge_base.items() if not k.startswith("knowledge_base")}
-
-        # Find documents in KB but not in tracker
-        missing_in_tracker = []
-        for doc_id, doc_data in kb_docs.items():
-            file_path = doc_data.get("file_path")
-            if file_path and file_path not in tracked_files:
-                missing_in_tracker.append((file_path, doc_data))
-
-        # Find files in tracker but not in KB
-        missing_in_kb = []
-        for tracked_file in tracked_files:
-            found = False
-            for doc_data in kb_docs.values():
-                if doc_data.get("file_path") == tracked_file:
-                    found = True
-                    break
-            if not found:
-                missing_in_kb.append(tracked_file)
+        diff = compute_state_diff(dup_tracker, knowledge_base)
+        sync_results["diff"] = {key: sorted(paths) for key, paths in diff.items()}
+        missing_in_kb = diff["missing_in_kb"]
 
         # Synchronize: Add missing entries to tracker
-        for file_path, doc_data in missing_in_tracker:
+        for file_path in sync_results["diff"]["missing_in_tracker"]:
             try:
                 # Calculate hash for the file
                 file_hash = get_file_hash(file_path)
@@ -1591,6 +4186,14 @@ def synchronize_states(dup_tracker, knowledge_base, kb_path):
                 f"Found {len(missing_in_kb)} files in tracker not in KB (keeping for history)"
             )
 
+        if diff["hash_mismatch"]:
+            sync_results["warnings"].append(
+                f"Found {len(diff['hash_mismatch'])} documents extracted from a different file "
+                "version than the tracker recorded (reprocess with --files to refresh)"
+            )
+
+        dup_tracker.flush()
+
         logger.info(
             f"State synchronization completed: {len(sync_results['actions_taken'])} actions taken"
         )
@@ -1603,27 +4206,94 @@ def synchronize_states(dup_tracker, knowledge_base, kb_path):
     return sync_results
 
 
-def create_snapshot(knowledge_base, snapshot_dir=None):
+class SnapshotObjectStore:
+    """Content-addressed, gzip-compressed document blobs shared by all snapshots.
+
+    Each distinct document version is stored once as objects/<aa>/<hash>.json.gz,
+    where the hash is the same content hash the sharded knowledge base store uses.
+    """
+
+    def __init__(self, root):
+        self.root = pathlib.Path(root)
+
+    def path_for(self, content_hash):
+        return self.root / content_hash[:2] / f"{content_hash}.json.gz"
+
+    def contains(self, content_hash):
+        return self.path_for(content_hash).exists()
+
+    def put(self, doc_data):
+        """Store a document blob (if not already present) and return its content hash."""
+        payload, content_hash = _serialize_document(doc_data)
+        object_path = self.path_for(content_hash)
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write(
+                str(object_path),
+                lambda f: f.write(gzip.compress(payload.encode("utf-8"))),
+                binary=True,
+            )
+        return content_hash
+
+    def get(self, content_hash):
+        """Load a document blob by content hash."""
+        with gzip.open(self.path_for(content_hash), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+
+SNAPSHOT_PREFIX = "knowledge_base_snapshot_"
+SNAPSHOT_MANIFEST_SUFFIX = ".manifest.json"
+
+
+def create_snapshot(knowledge_base, snapshot_dir=None, store=None):
     """Create a timestamped snapshot of the knowledge base.
 
+    Document blobs go into a shared compressed object store under their content
+    hash, so unchanged documents cost nothing in later snapshots. The snapshot
+    itself is a small manifest of doc_id -> content hash.
+
+    Args:
+        knowledge_base: Knowledge base dict to snapshot (ignored when store is given)
+        snapshot_dir: Directory holding snapshot manifests and the object store
+        store: Optional KnowledgeBaseStore; its manifest hashes are reused and only
+            documents missing from the object store are loaded
+
     Returns:
-        str: Path to created snapshot file
+        str: Path to created snapshot manifest
     """
     try:
         # Create snapshots directory
         snapshot_dir = snapshot_dir or CONFIG["SNAPSHOT_DIR"]
         snapshot_path = pathlib.Path(snapshot_dir)
         snapshot_path.mkdir(exist_ok=True)
+        objects = SnapshotObjectStore(snapshot_path / "objects")
+
+        documents = {}
+        if store is not None:
+            for doc_id, entry in store.summaries().items():
+                if not objects.contains(entry["hash"]):
+                    objects.put(store.load_document(doc_id))
+                documents[doc_id] = entry["hash"]
+        else:
+            for doc_id, doc_data in knowledge_base.items():
+                documents[doc_id] = objects.put(doc_data)
 
         # Create timestamped filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        snapshot_file = snapshot_path / f"knowledge_base_snapshot_{timestamp}.json"
-
-        # Save snapshot
-        with open(snapshot_file, "w", encoding="utf-8") as f:
-            json.dump(knowledge_base, f, ensure_ascii=False, indent=2)
+        snapshot_file = snapshot_path / f"{SNAPSHOT_PREFIX}{timestamp}{SNAPSHOT_MANIFEST_SUFFIX}"
+
+        # Save snapshot manifest
+        manifest = {
+            "version": 1,
+            "created_at": datetime.now().isoformat(),
+            "document_count": len(documents),
+            "documents": documents,
+        }
+        _atomic_write(
+            str(snapshot_file), lambda f: json.dump(manifest, f, ensure_ascii=False, indent=2)
+        )
 
-        logger.info(f"Created snapshot: {snapshot_file}")
+        logger.info(f"Created snapshot: {snapshot_file} ({len(documents)} documents)")
         return str(snapshot_file)
 
     except Exception as e:
@@ -1634,6 +4304,9 @@ def create_snapshot(knowledge_base, snapshot_dir=None):
 def list_snapshots(snapshot_dir=None):
     """List available snapshots with metadata.
 
+    Document counts come from the snapshot manifests; blobs are never opened.
+    Older full-copy JSON snapshots are listed with ``documents`` set to None.
+
     Returns:
         list: List of snapshot info dictionaries
     """
@@ -1644,25 +4317,30 @@ def list_snapshots(snapshot_dir=None):
             return []
 
         snapshots = []
-        for snapshot_file in snapshot_path.glob("knowledge_base_snapshot_*.json"):
+        for snapshot_file in snapshot_path.glob(f"{SNAPSHOT_PREFIX}*.json"):
             try:
                 # Extract timestamp from filename
                 filename = snapshot_file.name
-                timestamp_str = filename.replace("knowledge_base_snapshot_", "").replace(
-                    ".json", ""
-                )
+                is_manifest = filename.endswith(SNAPSHOT_MANIFEST_SUFFIX)
+                suffix = SNAPSHOT_MANIFEST_SUFFIX if is_manifest else ".json"
+                timestamp_str = filename[len(SNAPSHOT_PREFIX) : -len(suffix)]
                 timestamp = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
 
                 # Get file size
                 size = snapshot_file.stat().st_size
 
+                documents = None
+                if is_manifest:
+                    with open(snapshot_file, "r", encoding="utf-8") as f:
+                        documents = json.load(f).get("document_count")
+
                 snapshots.append(
                     {
                         "path": str(snapshot_file),
                         "filename": filename,
                         "timestamp": timestamp,
                         "size": size,
-                        "documents": None,  # Will be loaded on demand
+                        "documents": documents,
                     }
                 )
 
@@ -1678,12 +4356,14 @@ def list_snapshots(snapshot_dir=None):
         return []
 
 
-def rollback_to_snapshot(snapshot_path, target_path="knowledge_base.json"):
+def rollback_to_snapshot(snapshot_path, target_path="knowledge_base.json", store=None):
     """Rollback knowledge base to a specific snapshot.
 
     Args:
-        snapshot_path: Path to snapshot file
+        snapshot_path: Path to snapshot manifest (or older full-copy snapshot file)
         target_path: Path to target knowledge base file
+        store: Optional KnowledgeBaseStore to roll back instead of target_path; only
+            documents that differ from the snapshot are rewritten
 
     Returns:
         bool: Success status
@@ -1699,6 +4379,44 @@ def rollback_to_snapshot(snapshot_path, target_path="knowledge_base.json"):
         with open(snapshot_file, "r", encoding="utf-8") as f:
             snapshot_data = json.load(f)
 
+        if snapshot_file.name.endswith(SNAPSHOT_MANIFEST_SUFFIX):
+            objects = SnapshotObjectStore(snapshot_file.parent / "objects")
+            content_hashes = snapshot_data["documents"]
+            missing = [h for h in set(content_hashes.values()) if not objects.contains(h)]
+            if missing:
+                logger.error(f"Snapshot {snapshot_path} references {len(missing)} missing objects")
+                return False
+
+            if store is not None:
+                written, removed = store.restore(content_hashes, objects.get)
+                logger.info(
+                    f"Successfully rolled back store to snapshot: {snapshot_path} "
+                    f"({written} documents rewritten, {removed} removed)"
+                )
+                return True
+
+            # Reuse current documents that match the snapshot; only decode the rest
+            current = load_knowledge_base(target_path)
+            current_hashes = {
+                doc_id: _serialize_document(doc_data)[1] for doc_id, doc_data in current.items()
+            }
+            snapshot_data = {
+                doc_id: (
+                    current[doc_id]
+                    if current_hashes.get(doc_id) == content_hash
+                    else objects.get(content_hash)
+                )
+                for doc_id, content_hash in content_hashes.items()
+            }
+
+        if store is not None:
+            written, removed = store.replace_all(snapshot_data)
+            logger.info(
+                f"Successfully rolled back store to snapshot: {snapshot_path} "
+                f"({written} documents rewritten, {removed} removed)"
+            )
+            return True
+
         # Create backup of current state
         current_file = pathlib.Path(target_path)
         if current_file.exists():
@@ -1719,9 +4437,12 @@ def rollback_to_snapshot(snapshot_path, target_path="knowledge_base.json"):
         return False
 
 
-def create_monitoring_dashboard(base_folders, dup_tracker, knowledge_base):
+def create_monitoring_dashboard(base_folders, dup_tracker, knowledge_base, report_dir=None):
     """Create a monitoring dashboard with system status and metrics.
 
+    Throughput and stage timings come from the most recent run report in
+    report_dir (defaults to CONFIG["RUN_REPORT_DIR"]).
+
     Returns:
         dict: Dashboard data
     """
@@ -1743,6 +4464,8 @@ def create_monitoring_dashboard(base_folders, dup_tracker, knowledge_base):
 
         # Core metrics
         kb_docs = {k: v for k, v in knowledge_base.items() if not k.startswith("knowledge_base")}
+        ocr_cache = get_ocr_cache()
+        ocr_cache_stats = ocr_cache.stats() if ocr_cache else {"entries": 0, "size_bytes": 0}
 
         dashboard["metrics"] = {
             "total_documents": len(kb_docs),
@@ -1751,7 +4474,9 @@ def create_monitoring_dashboard(base_folders, dup_tracker, knowledge_base):
             "pdf_files": len([d for d in kb_docs.values() if d.get("format") == ".pdf"]),
             "total_segments": sum(len(d.get("segments", {})) for d in kb_docs.values()),
             "total_tables": sum(len(d.get("tables", [])) for d in kb_docs.values()),
-            "ocr_enabled": OCR_ENABLED,
+            "ocr_enabled": is_ocr_enabled(),
+            "ocr_cache_entries": ocr_cache_stats["entries"],
+            "ocr_cache_size_mb": round(ocr_cache_stats["size_bytes"] / (1024 * 1024), 1),
             "processing_errors": len([d for d in kb_docs.values() if "error" in d]),
         }
 
@@ -1809,6 +4534,20 @@ def create_monitoring_dashboard(base_folders, dup_tracker, knowledge_base):
                 * 100,
             }
 
+        # Throughput of the last processing run
+        last_run = load_latest_run_report(report_dir)
+        if last_run:
+            stage_seconds = last_run.get("stage_seconds") or {}
+            dashboard.setdefault("performance", {}).update(
+                {
+                    "last_run_at": last_run.get("started_at"),
+                    "last_run_seconds": last_run.get("wall_seconds"),
+                    "last_run_pages_per_sec": last_run.get("pages_per_sec"),
+                    "last_run_mb_per_sec": last_run.get("mb_per_sec"),
+                    "last_run_slowest_stage": next(iter(stage_seconds), None),
+                }
+            )
+
         # Generate alerts based on thresholds
         if dashboard["metrics"]["processing_errors"] > 0:
             dashboard["alerts"].append(
@@ -1818,7 +4557,7 @@ def create_monitoring_dashboard(base_folders, dup_tracker, knowledge_base):
         if dashboard["state_consistency"]["status"] == "error":
             dashboard["alerts"].append("State consistency issues detected")
 
-        if not OCR_ENABLED:
+        if not is_ocr_enabled():
             dashboard["recommendations"].append("Install Tesseract OCR for full PDF processing")
 
     except Exception as e:
@@ -1829,6 +4568,215 @@ def create_monitoring_dashboard(base_folders, dup_tracker, knowledge_base):
     return dashboard
 
 
+class FolderWatcher:
+    """Detect new or modified documents in the watched folders by polling file stats.
+
+    A change is only reported once the file's size and mtime have stayed the same
+    for ``debounce`` seconds, so files that are still being copied or uploaded
+    are not processed half-written.
+    """
+
+    def __init__(self, base_folders, debounce=None):
+        self.base_folders = base_folders
+        self.debounce = CONFIG["WATCH_DEBOUNCE"] if debounce is None else debounce
+        self._seen = {}  # file path -> (size, mtime_ns) last handed out or baselined
+        self._pending = {}  # file path -> ((size, mtime_ns), first seen at)
+
+    def scan(self):
+        """Get {file path: (size, mtime_ns)} for every document in the watched folders."""
+        signatures = {}
+        for folder_path in self.base_folders.values():
+            folder = pathlib.Path(folder_path)
+            if not folder.exists():
+                continue
+            for entry in os.scandir(folder):
+                # Skip Office lock files and hidden temp files written during saves
+                if entry.name.startswith(("~$", ".")):
+                    continue
+                if os.path.splitext(entry.name)[1].lower() not in (".docx", ".pdf"):
+                    continue
+                try:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        signatures[str(folder / entry.name)] = (stat.st_size, stat.st_mtime_ns)
+                except OSError:
+                    continue
+        return signatures
+
+    def set_baseline(self):
+        """Treat the current folder contents as already handled."""
+        self._seen = self.scan()
+        self._pending = {}
+
+    def poll(self, now=None):
+        """Scan once and return the files whose changes have settled, in path order."""
+        now = time.monotonic() if now is None else now
+        current = self.scan()
+        ready = []
+
+        for file_path, signature in current.items():
+            if self._seen.get(file_path) == signature:
+                self._pending.pop(file_path, None)
+                continue
+
+            pending = self._pending.get(file_path)
+            if pending is None or pending[0] != signature:
+                # New or still changing: restart the debounce window
+                self._pending[file_path] = (signature, now)
+            elif now - pending[1] >= self.debounce:
+                ready.append(file_path)
+                self._seen[file_path] = signature
+                del self._pending[file_path]
+
+        # Forget deleted files (their documents are kept, as in batch runs)
+        for file_path in [p for p in self._pending if p not in current]:
+            del self._pending[file_path]
+        for file_path in [p for p in self._seen if p not in current]:
+            del self._seen[file_path]
+
+        return sorted(ready)
+
+    def has_pending(self):
+        """Check whether any change is waiting for its debounce window."""
+        return bool(self._pending)
+
+
+def _start_change_notifier(base_folders, wake_event):
+    """Wake the watch loop on filesystem events when watchdog is available.
+
+    Returns:
+        The running watchdog observer, or None when falling back to plain polling
+    """
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        logger.info("watchdog not available, polling watched folders")
+        return None
+
+    class _WakeHandler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            wake_event.set()
+
+    observer = Observer()
+    for folder_path in base_folders.values():
+        if os.path.isdir(folder_path):
+            observer.schedule(_WakeHandler(), folder_path, recursive=False)
+    observer.start()
+    logger.info("Using filesystem notifications to watch folders")
+    return observer
+
+
+def run_watch_mode(
+    base_folders,
+    knowledge_base=None,
+    kb_store=None,
+    kb_path=None,
+    workers=1,
+    page_workers=None,
+    interval=None,
+    debounce=None,
+    stop_event=None,
+    max_cycles=None,
+):
+    """Continuously ingest new or changed documents from the watched folders.
+
+    The duplicate tracker, knowledge base, search index and OCR engine stay
+    loaded between batches; each settled batch of files is processed and
+    persisted on its own.
+
+    Args:
+        base_folders: Dict of folder_name -> folder_path to watch
+        knowledge_base: Loaded legacy knowledge base (json storage), kept in memory
+        kb_store: KnowledgeBaseStore for sharded storage (knowledge_base is then unused)
+        kb_path: Legacy knowledge base path written after each batch (json storage)
+        workers: Worker processes for per-file extraction
+        page_workers: Processes per large PDF for page-level parallelism
+        interval: Seconds between folder scans (defaults to CONFIG["WATCH_INTERVAL"])
+        debounce: Seconds a file must be unchanged before processing
+        stop_event: Optional threading.Event that ends the loop when set
+        max_cycles: Optional number of scan cycles to run before returning
+
+    Returns:
+        int: Number of documents ingested
+    """
+    interval = CONFIG["WATCH_INTERVAL"] if interval is None else interval
+    stop_event = stop_event or threading.Event()
+    knowledge_base = knowledge_base if knowledge_base is not None else {}
+    kb_path = kb_path or CONFIG["KB_PATH"]
+    ingested = 0
+
+    dup_tracker = DuplicateTracker()
+    dup_tracker.preload()
+    get_ocr_engine_info()  # Probe once up front so batches start immediately
+
+    search_index = None
+    if CONFIG["SEARCH_INDEX_ENABLED"]:
+        search_index = SearchIndex()
+        if not search_index.document_ids():
+            search_index.sync(kb_store.load_all() if kb_store else knowledge_base)
+
+    def persist(new_docs):
+        if not new_docs:
+            return
+        if kb_store is not None:
+            kb_store.write_documents(new_docs)
+        else:
+            knowledge_base.update(new_docs)
+            atomic_save_json(knowledge_base, kb_path)
+        if search_index is not None:
+            search_index.index_documents(new_docs)
+
+    watcher = FolderWatcher(base_folders, debounce)
+    wake_event = threading.Event()
+    notifier = None
+
+    try:
+        # Baseline first, then catch up on anything that changed while stopped
+        watcher.set_baseline()
+        new_docs = process_all_documents(
+            base_folders, workers=workers, page_workers=page_workers, dup_tracker=dup_tracker
+        )
+        persist(new_docs)
+        ingested += len(new_docs)
+
+        notifier = _start_change_notifier(base_folders, wake_event)
+        logger.info(f"Watching {', '.join(base_folders.values())} (Ctrl+C to stop)")
+
+        cycles = 0
+        while not stop_event.is_set():
+            ready = watcher.poll()
+            if ready:
+                logger.info(f"Detected {len(ready)} new or changed files")
+                new_docs = process_all_documents(
+                    base_folders,
+                    selective_files=set(ready),
+                    workers=workers,
+                    page_workers=page_workers,
+                    dup_tracker=dup_tracker,
+                )
+                persist(new_docs)
+                ingested += len(new_docs)
+
+            cycles += 1
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+
+            # Re-check sooner while a file is settling so it is picked up right after debounce
+            timeout = min(interval, watcher.debounce / 2) if watcher.has_pending() else interval
+            wake_event.wait(timeout)
+            wake_event.clear()
+    finally:
+        if notifier is not None:
+            notifier.stop()
+            notifier.join()
+        dup_tracker.close()
+        if search_index is not None:
+            search_index.close()
+
+    return ingested
+
+
 def create_argument_parser():
     """Create and configure argument parser for the document processing pipeline."""
     parser = argparse.ArgumentParser(
@@ -1843,10 +4791,17 @@ Processing Modes:
 Examples:
   python doc_pipeline.py                           # Incremental processing
   python doc_pipeline.py --force-reprocess         # Full reprocessing
+  python doc_pipeline.py --verify-hashes           # Incremental, but rehash every file
   python doc_pipeline.py --health-check            # System health check
   python doc_pipeline.py --validate-state          # Validate system state
   python doc_pipeline.py --clear-duplicates        # Clear duplicate tracker
   python doc_pipeline.py --files proposals/*.docx  # Process specific files
+  python doc_pipeline.py --workers 4               # Extract files on 4 processes
+  python doc_pipeline.py --page-workers 4          # Split large PDFs across 4 processes
+  python doc_pipeline.py --watch                   # Ingest new uploads continuously
+  python doc_pipeline.py --kb-storage sharded      # Store one file per document
+  python doc_pipeline.py --kb-storage sharded --export-legacy-kb  # Rebuild knowledge_base.json
+  python doc_pipeline.py --search "IDF curves"     # Full-text search of processed documents
         """,
     )
 
@@ -1859,6 +4814,56 @@ Examples:
 
     parser.add_argument("--files", nargs="+", help="Process only specified files (selective mode)")
 
+    parser.add_argument(
+        "--verify-hashes",
+        action="store_true",
+        help="Rehash every file instead of skipping files whose size/mtime/inode are unchanged",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Number of worker processes for per-file extraction (default: 1, sequential)",
+    )
+
+    parser.add_argument(
+        "--page-workers",
+        type=int,
+        default=CONFIG["PAGE_WORKERS"],
+        metavar="N",
+        help=(
+            "Processes used to split a single large PDF into page ranges "
+            f"(PDFs with at least {CONFIG['PAGE_PARALLEL_MIN_PAGES']} pages; default: 1)"
+        ),
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and ingest new or changed files in proposals/ and Reports/",
+    )
+
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=CONFIG["WATCH_INTERVAL"],
+        metavar="SECONDS",
+        help=f"Seconds between folder scans in watch mode (default: {CONFIG['WATCH_INTERVAL']})",
+    )
+
+    parser.add_argument(
+        "--watch-debounce",
+        type=float,
+        default=CONFIG["WATCH_DEBOUNCE"],
+        metavar="SECONDS",
+        help=(
+            "Seconds a file must stay unchanged before it is processed "
+            f"(default: {CONFIG['WATCH_DEBOUNCE']})"
+        ),
+    )
+
     # System management options
     parser.add_argument(
         "--health-check", action="store_true", help="Perform system health check and exit"
@@ -1874,6 +4879,10 @@ Examples:
         "--clear-duplicates", action="store_true", help="Clear all duplicate tracking records"
     )
 
+    parser.add_argument(
+        "--clear-ocr-cache", action="store_true", help="Clear all cached OCR results"
+    )
+
     parser.add_argument(
         "--sync-states",
         action="store_true",
@@ -1902,6 +4911,44 @@ Examples:
         help="Display monitoring dashboard with system status and metrics",
     )
 
+    # Search options
+    parser.add_argument(
+        "--search",
+        metavar="QUERY",
+        help="Full-text search of processed segments and tables (English or Arabic)",
+    )
+
+    parser.add_argument(
+        "--search-limit",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Maximum number of search results (default: 10)",
+    )
+
+    parser.add_argument(
+        "--rebuild-search-index",
+        action="store_true",
+        help="Re-sync the full-text search index with the knowledge base",
+    )
+
+    # Storage options
+    parser.add_argument(
+        "--kb-storage",
+        choices=["json", "sharded"],
+        default=CONFIG["KB_STORAGE"],
+        help=(
+            "Knowledge base storage: a single JSON file, or one file per document under "
+            f"{CONFIG['KB_STORE_DIR']}/ (default: {CONFIG['KB_STORAGE']})"
+        ),
+    )
+
+    parser.add_argument(
+        "--export-legacy-kb",
+        action="store_true",
+        help="Write the sharded store back out as a single knowledge_base.json and exit",
+    )
+
     # Output options
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose logging")
 
@@ -1913,9 +4960,17 @@ def main():
     parser = create_argument_parser()
     args = parser.parse_args()
 
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.page_workers < 1:
+        parser.error("--page-workers must be at least 1")
+    if args.search_limit < 1:
+        parser.error("--search-limit must be at least 1")
+    if args.watch_interval <= 0 or args.watch_debounce < 0:
+        parser.error("--watch-interval must be positive and --watch-debounce non-negative")
+
     # Configure logging level
-    if args.verbose:
-        logging.getLogger().setLevel(logging.DEBUG)
+    setup_logging(logging.DEBUG if args.verbose else logging.INFO)
 
     # Use relative paths
     base_dir = pathlib.Path(__file__).parent
@@ -1924,32 +4979,27 @@ def main():
     base_folders = {"proposals": str(proposals_folder), "reports": str(reports_folder)}
     existing_kb_path = base_dir / CONFIG["KB_PATH"]
 
-    # Load existing knowledge base - FIX: Load all existing data, not just static section
-    knowledge_base = {}
-    if existing_kb_path.exists():
-        try:
-            with open(existing_kb_path, "r", encoding="utf-8") as f:
-                raw_data = f.read()
-                # Basic validation to prevent certain injection attacks
-                if "\x00" in raw_data:
-                    raise ValueError("JSON file contains null bytes")
-
-                # Parse JSON with limits to prevent resource exhaustion
-                knowledge_base = json.loads(raw_data)
-
-                # Validate that the loaded data is a dictionary
-                if not isinstance(knowledge_base, dict):
-                    raise ValueError("Knowledge base must be a dictionary")
+    # Open the sharded store if requested, seeding it from the legacy file on first use
+    kb_store = None
+    if args.kb_storage == "sharded":
+        kb_store = KnowledgeBaseStore(base_dir / CONFIG["KB_STORE_DIR"])
+        if not kb_store.exists() and existing_kb_path.exists():
+            logger.info("Initializing sharded knowledge base store from legacy knowledge base...")
+            kb_store.import_legacy_json(existing_kb_path)
 
-                logger.info(
-                    f"Loaded existing knowledge base with {len([k for k in knowledge_base.keys() if not k.startswith('knowledge_base')])} documents"
-                )
-        except (json.JSONDecodeError, ValueError) as e:
-            logger.error(f"Could not load existing knowledge_base due to invalid format: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Could not load existing knowledge_base: {e}")
-            raise
+    # Load existing knowledge base - FIX: Load all existing data, not just static section
+    # The sharded store only loads documents for commands that inspect all of them;
+    # state checks only need file paths and hashes, which the manifest already holds
+    needs_full_kb = args.dashboard
+    needs_summaries = any([args.sync_states, args.health_check, args.validate_state])
+    if kb_store is None:
+        knowledge_base = load_knowledge_base(existing_kb_path)
+    elif needs_full_kb:
+        knowledge_base = kb_store.load_all()
+    elif needs_summaries:
+        knowledge_base = kb_store.summaries()
+    else:
+        knowledge_base = {}
 
     # Initialize components
     dup_tracker = DuplicateTracker()
@@ -1961,9 +5011,57 @@ def main():
         logger.info("Duplicate tracker cleared successfully")
         return
 
+    if args.export_legacy_kb:
+        if kb_store is None:
+            print("\n[ERROR] --export-legacy-kb requires --kb-storage sharded")
+            return
+        logger.info("Exporting sharded knowledge base to legacy JSON...")
+        kb_store.export_legacy_json(existing_kb_path)
+        print(f"\n[SUCCESS] Legacy knowledge base written: {existing_kb_path}")
+        return
+
+    if args.search or args.rebuild_search_index:
+        search_index = SearchIndex()
+        try:
+            # Seed (or re-sync) the index from the knowledge base when needed
+            if args.rebuild_search_index or not search_index.document_ids():
+                logger.info("Building full-text search index from knowledge base...")
+                full_kb = kb_store.load_all() if kb_store else load_knowledge_base(existing_kb_path)
+                indexed, removed = search_index.sync(full_kb)
+                logger.info(f"Search index updated: {indexed} indexed, {removed} removed")
+
+            if args.search:
+                results = search_index.search(args.search, limit=args.search_limit)
+
+                print(f"\n{'=' * 60}")
+                print(f"SEARCH RESULTS: {args.search}")
+                print("=" * 60)
+                for rank, result in enumerate(results, 1):
+                    name = pathlib.Path(result["file_path"] or result["doc_id"]).name
+                    print(f"{rank}. {name} - {result['location']}")
+                    print(f"   {result['snippet']}")
+                if not results:
+                    print("No matches found")
+                print("=" * 60)
+        finally:
+            search_index.close()
+        return
+
+    if args.clear_ocr_cache:
+        logger.info("Clearing OCR result cache...")
+        cache = OCRResultCache()
+        cache.clear()
+        cache.close()
+        logger.info("OCR result cache cleared successfully")
+        return
+
     if args.sync_states:
         logger.info("Synchronizing duplicate tracker and knowledge base states...")
-        sync_results = synchronize_states(dup_tracker, knowledge_base, existing_kb_path)
+        sync_results = synchronize_states(
+            dup_tracker,
+            knowledge_base,
+            kb_store.manifest_path if kb_store else existing_kb_path,
+        )
 
         print(f"\n{'=' * 60}")
         print("STATE SYNCHRONIZATION RESULTS")
@@ -1990,7 +5088,7 @@ def main():
 
     if args.create_snapshot:
         logger.info("Creating knowledge base snapshot...")
-        snapshot_path = create_snapshot(knowledge_base)
+        snapshot_path = create_snapshot(knowledge_base, store=kb_store)
         if snapshot_path:
             print(f"\n[SUCCESS] Snapshot created: {snapshot_path}")
         else:
@@ -2001,37 +5099,43 @@ def main():
         logger.info("Listing available snapshots...")
         snapshots = list_snapshots()
 
-        print(f"\n{'=' * 80}")
+        print(f"\n{'=' * 95}")
         print("AVAILABLE SNAPSHOTS")
-        print("=" * 80)
+        print("=" * 95)
 
         if snapshots:
-            print(f"{'Filename':<45} {'Date/Time':<20} {'Size':<10}")
-            print("-" * 80)
+            print(f"{'Filename':<55} {'Date/Time':<20} {'Docs':>6} {'Size':>10}")
+            print("-" * 95)
 
             for snap in snapshots:
                 size_kb = snap["size"] // 1024
                 date_str = snap["timestamp"].strftime("%Y-%m-%d %H:%M:%S")
-                print(f"{snap['filename']:<45} {date_str:<20} {size_kb:>8} KB")
+                docs = snap["documents"] if snap["documents"] is not None else "-"
+                print(f"{snap['filename']:<55} {date_str:<20} {docs:>6} {size_kb:>7} KB")
         else:
             print("No snapshots found")
 
-        print("=" * 80)
+        print("=" * 95)
         return
 
     if args.rollback:
         logger.info(f"Rolling back to snapshot: {args.rollback}")
-        success = rollback_to_snapshot(args.rollback)
+        success = rollback_to_snapshot(args.rollback, store=kb_store)
         if success:
             print(f"\n[SUCCESS] Successfully rolled back to: {args.rollback}")
-            print("Note: Original knowledge base backed up as .rollback_backup")
+            if kb_store is None:
+                print("Note: Original knowledge base backed up as .rollback_backup")
+            if os.path.exists(CONFIG["SEARCH_INDEX_PATH"]):
+                print("Run with --rebuild-search-index to refresh the full-text index")
         else:
             print(f"\n[ERROR] Rollback failed")
         return
 
     if args.dashboard:
         logger.info("Generating monitoring dashboard...")
-        dashboard = create_monitoring_dashboard(base_folders, dup_tracker, knowledge_base)
+        dashboard = create_monitoring_dashboard(
+            base_folders, dup_tracker, knowledge_base, base_dir / CONFIG["RUN_REPORT_DIR"]
+        )
 
         print(f"\n{'=' * 80}")
         print("SYSTEM MONITORING DASHBOARD")
@@ -2130,6 +5234,30 @@ def main():
         print("=" * 60)
         return
 
+    if args.watch:
+        logger.info("=" * 60)
+        logger.info("DOCUMENT PROCESSING PIPELINE - WATCH MODE")
+        logger.info("=" * 60)
+        try:
+            ingested = run_watch_mode(
+                base_folders,
+                knowledge_base=None if kb_store else knowledge_base,
+                kb_store=kb_store,
+                kb_path=existing_kb_path,
+                workers=args.workers,
+                page_workers=args.page_workers,
+                interval=args.watch_interval,
+                debounce=args.watch_debounce,
+            )
+        except KeyboardInterrupt:
+            ingested = None
+        finally:
+            dup_tracker.close()
+        logger.info("Watch mode stopped")
+        if ingested is not None:
+            logger.info(f"Documents ingested: {ingested}")
+        return
+
     # Determine processing mode
     processing_mode = "incremental"
     if args.force_reprocess:
@@ -2141,19 +5269,30 @@ def main():
     logger.info("=" * 60)
     logger.info("DOCUMENT PROCESSING PIPELINE")
     logger.info("=" * 60)
-    logger.info(f"OCR Enabled: {OCR_ENABLED}")
+    logger.info(f"OCR Enabled: {is_ocr_enabled()}")
     logger.info(f"Processing Mode: {processing_mode}")
-    if TESSERACT_VERSION and logger.isEnabledFor(logging.DEBUG):
-        logger.debug(f"Tesseract Version: {TESSERACT_VERSION}")
+    logger.info(f"Worker Processes: {args.workers} (page workers per PDF: {args.page_workers})")
+    if is_ocr_enabled() and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Tesseract Version: {get_ocr_engine_info()['version']}")
     logger.info("")
 
     # Process documents
     try:
         # Process new documents and merge with existing knowledge base to prevent data loss
+        metrics = PipelineMetrics()
         new_knowledge_base = process_all_documents(
-            base_folders, force_reprocess=args.force_reprocess, selective_files=args.files
+            base_folders,
+            force_reprocess=args.force_reprocess,
+            selective_files=args.files,
+            workers=args.workers,
+            page_workers=args.page_workers,
+            verify_hashes=args.verify_hashes,
+            metrics=metrics,
+            dup_tracker=dup_tracker,
         )
 
+        processed_doc_ids = list(new_knowledge_base.keys())
+
         # Preserve existing documents that weren't reprocessed
         preserved_docs = 0
         for key, value in knowledge_base.items():
@@ -2167,27 +5306,58 @@ def main():
                 f"Preserved {preserved_docs} existing documents during incremental processing"
             )
 
-        # Merge with existing static knowledge base section if it exists
-        if existing_kb_path.exists():
-            try:
-                with open(existing_kb_path, "r", encoding="utf-8") as f:
-                    existing_data = json.load(f)
-                    # Preserve the static knowledge_base section
-                    if "knowledge_base" in existing_data:
-                        knowledge_base["knowledge_base"] = existing_data["knowledge_base"]
-                        logger.info("Preserved existing knowledge_base section")
-            except Exception as e:
-                logger.warning(f"Could not load existing knowledge_base for merging: {e}")
+        if kb_store is not None:
+            # Only the documents produced by this run are written; the rest stay untouched
+            with metrics.run_stage("save"):
+                kb_store.write_documents(knowledge_base)
+                if CONFIG["KB_EXPORT_LEGACY_ON_SAVE"]:
+                    kb_store.export_legacy_json(existing_kb_path)
+            output_file = kb_store.root
+            kb_doc_ids = kb_store.document_ids()
+        else:
+            # Merge with existing static knowledge base section if it exists
+            if existing_kb_path.exists():
+                try:
+                    with open(existing_kb_path, "r", encoding="utf-8") as f:
+                        existing_data = json.load(f)
+                        # Preserve the static knowledge_base section
+                        if "knowledge_base" in existing_data:
+                            knowledge_base["knowledge_base"] = existing_data["knowledge_base"]
+                            logger.info("Preserved existing knowledge_base section")
+                except Exception as e:
+                    logger.warning(f"Could not load existing knowledge_base for merging: {e}")
 
-        # Save to JSON atomically
-        output_file = base_dir / "knowledge_base.json"
-        atomic_save_json(knowledge_base, output_file)
+            # Save to JSON atomically
+            output_file = base_dir / "knowledge_base.json"
+            with metrics.run_stage("save"):
+                atomic_save_json(knowledge_base, output_file)
+            kb_doc_ids = knowledge_base.keys()
 
-        processed_count = len(
-            [k for k in knowledge_base.keys() if not k.startswith("knowledge_base")]
-        )
+        processed_count = len([k for k in kb_doc_ids if not k.startswith("knowledge_base")])
         logger.info(f"[OK] Total documents in knowledge base: {processed_count}")
 
+        # Keep an existing full-text index in step with the documents produced by this run
+        # (a missing index is built from the whole knowledge base on the first --search)
+        if (
+            CONFIG["SEARCH_INDEX_ENABLED"]
+            and processed_doc_ids
+            and os.path.exists(CONFIG["SEARCH_INDEX_PATH"])
+        ):
+            search_index = SearchIndex()
+            try:
+                with metrics.run_stage("search_index"):
+                    search_index.index_documents(
+                        {doc_id: knowledge_base[doc_id] for doc_id in processed_doc_ids}
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Could not update search index: {e}")
+            finally:
+                search_index.close()
+
+        metrics.finish()
+        run_summary = metrics.summary()
+        report_json, report_csv = metrics.write_report(base_dir / CONFIG["RUN_REPORT_DIR"])
+
         # Display success message
         print(f"\n{'=' * 60}")
         print("PROCESSING COMPLETED SUCCESSFULLY")
@@ -2195,6 +5365,11 @@ def main():
         print(f"Mode: {processing_mode}")
         print(f"Documents Processed: {processed_count}")
         print(f"Knowledge Base: {output_file}")
+        print(
+            f"Throughput: {run_summary['pages_per_sec']} pages/sec, "
+            f"{run_summary['mb_per_sec']} MB/sec in {run_summary['wall_seconds']}s"
+        )
+        print(f"Run Report: {report_json} (per-file CSV: {report_csv})")
         print("=" * 60)
 
     except Exception as e:
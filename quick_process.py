@@ -10,6 +10,8 @@ sys.path.insert(0, str(pathlib.Path(__file__).parent))
 
 import doc_pipeline
 
+doc_pipeline.setup_logging()
+
 # Skip problematic scanned PDF
 skip_file = "تقرير دراسة السيول لطريق منفلوط الداخلة- شركة أرابكو (STA.160+000-STA.200+000).pdf"
 
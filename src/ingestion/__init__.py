@@ -6,7 +6,6 @@ from src.ingestion.exceptions import (
     OCRFailureError,
     UnsupportedFormatError,
 )
-from src.ingestion.module import DocumentIngestionModule
 
 __all__ = [
     "DocumentIngestionModule",
@@ -15,3 +14,13 @@ __all__ = [
     "UnsupportedFormatError",
     "OCRFailureError",
 ]
+
+
+def __getattr__(name):
+    # The module pulls in the parsers and pydantic models; import it on first use so
+    # lightweight helpers such as docx_reader can be imported on their own
+    if name == "DocumentIngestionModule":
+        from src.ingestion.module import DocumentIngestionModule
+
+        return DocumentIngestionModule
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
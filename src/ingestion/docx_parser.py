@@ -1,10 +1,12 @@
-"""DOCX document parser using python-docx."""
+"""DOCX document parser using the streaming DOCX reader (python-docx as fallback)."""
 
 from pathlib import Path
 from typing import Optional
 
+from src.ingestion.docx_reader import DocxContent, load_docx
 from src.ingestion.exceptions import CorruptedFileError, UnsupportedFormatError
 from src.ingestion.language_detector import LanguageDetector
+from src.ingestion.section_classifier import classify_section_type
 from src.models.documents import DocumentMetadata, DocumentSection, ParsedDocument, TableData
 from src.models.enums import DocumentType, Language, SectionType
 
@@ -53,7 +55,7 @@ class DOCXParser:
             raise CorruptedFileError(file_path, "python-docx library not available")
 
         try:
-            doc = self._docx.Document(file_path)
+            doc = load_docx(file_path)
 
             # Extract all text
             raw_text = self._extract_raw_text(doc)
@@ -94,7 +96,7 @@ class DOCXParser:
                 raise
             raise CorruptedFileError(file_path, str(e))
 
-    def _extract_raw_text(self, doc) -> str:
+    def _extract_raw_text(self, doc: DocxContent) -> str:
         """Extract all text from document."""
         text_parts = []
 
@@ -106,23 +108,23 @@ class DOCXParser:
         for table in doc.tables:
             for row in table.rows:
                 row_text = []
-                for cell in row.cells:
-                    if cell.text.strip():
-                        row_text.append(cell.text.strip())
+                for cell in row:
+                    if cell.strip():
+                        row_text.append(cell.strip())
                 if row_text:
                     text_parts.append(" | ".join(row_text))
 
         return "\n".join(text_parts)
 
 
-    def _extract_sections(self, doc, primary_language: Language) -> list[DocumentSection]:
+    def _extract_sections(self, doc: DocxContent, primary_language: Language) -> list[DocumentSection]:
         """Extract sections from document paragraphs."""
         sections = []
         current_section = None
         current_content = []
 
         for paragraph in doc.paragraphs:
-            style_name = paragraph.style.name if paragraph.style else ""
+            style_name = paragraph.style or ""
 
             # Check if this is a heading
             if style_name.startswith("Heading") or style_name.startswith("Title"):
@@ -169,7 +171,7 @@ class DOCXParser:
 
         return sections
 
-    def _extract_tables(self, doc) -> list[TableData]:
+    def _extract_tables(self, doc: DocxContent) -> list[TableData]:
         """Extract all tables from document."""
         tables = []
 
@@ -178,7 +180,7 @@ class DOCXParser:
             rows = []
 
             for i, row in enumerate(table.rows):
-                row_data = [cell.text.strip() for cell in row.cells]
+                row_data = [cell.strip() for cell in row]
 
                 if i == 0:
                     # First row as headers
@@ -260,29 +262,4 @@ class DOCXParser:
 
     def _detect_section_type(self, title: str) -> SectionType:
         """Detect section type from title."""
-        title_lower = title.lower()
-
-        patterns = {
-            SectionType.EXECUTIVE_SUMMARY: ["executive summary", "summary", "abstract", "ملخص"],
-            SectionType.INTRODUCTION: ["introduction", "background", "مقدمة"],
-            SectionType.SCOPE_OF_WORK: ["scope", "scope of work", "نطاق العمل"],
-            SectionType.METHODOLOGY: ["methodology", "approach", "method", "المنهجية"],
-            SectionType.TECHNICAL_APPROACH: ["technical", "technical approach", "النهج الفني"],
-            SectionType.TIMELINE: ["timeline", "schedule", "الجدول الزمني"],
-            SectionType.TEAM_COMPOSITION: ["team", "personnel", "staff", "فريق العمل"],
-            SectionType.DELIVERABLES: ["deliverables", "outputs", "المخرجات"],
-            SectionType.COST_ESTIMATE: ["cost", "budget", "pricing", "التكلفة"],
-            SectionType.BOQ: ["boq", "bill of quantities", "جدول الكميات"],
-            SectionType.TERMS_AND_CONDITIONS: ["terms", "conditions", "الشروط"],
-            SectionType.APPENDIX: ["appendix", "annex", "الملحق"],
-            SectionType.REFERENCES: ["references", "bibliography", "المراجع"],
-            SectionType.CONCLUSIONS: ["conclusion", "الخلاصة"],
-            SectionType.RECOMMENDATIONS: ["recommendation", "التوصيات"],
-        }
-
-        for section_type, keywords in patterns.items():
-            for keyword in keywords:
-                if keyword in title_lower:
-                    return section_type
-
-        return SectionType.OTHER
+        return SectionType(classify_section_type(title))
@@ -0,0 +1,360 @@
+"""Streaming DOCX reader that bypasses the python-docx object model.
+
+``word/document.xml`` is parsed once with ``iterparse``; body-level paragraphs
+(with their style names) and tables are emitted in document order and each
+element is discarded as soon as it has been read. The text rules follow
+python-docx so both readers produce the same output:
+
+- paragraph text is the direct ``w:r`` and ``w:hyperlink/w:r`` runs, with tabs,
+  line breaks and no-break hyphens mapped to ``\\t``, ``\\n`` and ``-``
+- a cell spanning several grid columns is repeated once per column, and a
+  vertically merged continuation cell repeats the cell above it
+- style ids are resolved to UI names through ``word/styles.xml``
+
+Files the stream reader does not understand (strict OOXML, broken merges,
+missing parts) raise ``DocxStreamError``; ``load_docx`` then falls back to
+python-docx.
+"""
+
+import logging
+import posixpath
+import zipfile
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Union
+from xml.etree.ElementTree import ParseError, iterparse
+
+logger = logging.getLogger(__name__)
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+OFFICE_DOCUMENT_REL = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+STYLES_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"
+
+
+def _w(tag: str) -> str:
+    return f"{{{W_NS}}}{tag}"
+
+
+W_BODY = _w("body")
+W_P = _w("p")
+W_R = _w("r")
+W_T = _w("t")
+W_TAB = _w("tab")
+W_PTAB = _w("ptab")
+W_BR = _w("br")
+W_CR = _w("cr")
+W_NO_BREAK_HYPHEN = _w("noBreakHyphen")
+W_HYPERLINK = _w("hyperlink")
+W_PPR = _w("pPr")
+W_PSTYLE = _w("pStyle")
+W_TBL = _w("tbl")
+W_TR = _w("tr")
+W_TRPR = _w("trPr")
+W_GRID_BEFORE = _w("gridBefore")
+W_TC = _w("tc")
+W_TCPR = _w("tcPr")
+W_GRID_SPAN = _w("gridSpan")
+W_VMERGE = _w("vMerge")
+W_VAL = _w("val")
+W_TYPE = _w("type")
+W_STYLE = _w("style")
+W_STYLE_ID = _w("styleId")
+W_DEFAULT = _w("default")
+W_NAME = _w("name")
+W_ALT_CHUNK = _w("altChunk")
+
+# Internal style names python-docx reports under their UI name
+_UI_STYLE_NAMES = {
+    "caption": "Caption",
+    "footer": "Footer",
+    "header": "Header",
+    **{f"heading {level}": f"Heading {level}" for level in range(1, 10)},
+}
+_ON_VALUES = {"1", "true", "on"}
+
+
+class DocxStreamError(Exception):
+    """Raised when a DOCX file needs the python-docx fallback."""
+
+
+@dataclass
+class DocxParagraph:
+    """A body-level paragraph: raw text and UI style name (None if unstyled)."""
+
+    text: str
+    style: Optional[str] = None
+
+
+@dataclass
+class DocxTable:
+    """A body-level table: raw cell text per layout-grid cell, row by row."""
+
+    rows: list[list[str]] = field(default_factory=list)
+
+
+DocxBlock = Union[DocxParagraph, DocxTable]
+
+
+@dataclass
+class DocxContent:
+    """Paragraphs and tables of a document in document order."""
+
+    blocks: list[DocxBlock]
+    source: str  # "stream" or "python-docx"
+
+    @property
+    def paragraphs(self) -> list[DocxParagraph]:
+        return [block for block in self.blocks if isinstance(block, DocxParagraph)]
+
+    @property
+    def tables(self) -> list[DocxTable]:
+        return [block for block in self.blocks if isinstance(block, DocxTable)]
+
+
+def _read_rels(archive: zipfile.ZipFile, rels_path: str) -> dict[str, str]:
+    """Map relationship type -> target from a .rels part (empty if absent)."""
+    try:
+        data = archive.open(rels_path)
+    except KeyError:
+        return {}
+    targets = {}
+    with data:
+        try:
+            for _, elem in iterparse(data):
+                if elem.tag == f"{{{REL_NS}}}Relationship" and elem.get("TargetMode") != "External":
+                    targets.setdefault(elem.get("Type"), elem.get("Target"))
+        except ParseError as e:
+            raise DocxStreamError(f"malformed {rels_path}: {e}")
+    return targets
+
+
+def _resolve_part(base_dir: str, target: str) -> str:
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(base_dir, target))
+
+
+def _read_paragraph_styles(archive: zipfile.ZipFile, styles_path: Optional[str]):
+    """Return ({style id: UI name} for paragraph styles, default paragraph style name)."""
+    names = {}
+    default_name = None
+    if not styles_path:
+        return names, default_name
+    try:
+        data = archive.open(styles_path)
+    except KeyError:
+        return names, default_name
+
+    with data:
+        try:
+            for _, elem in iterparse(data):
+                if elem.tag != W_STYLE:
+                    continue
+                if elem.get(W_TYPE) == "paragraph":
+                    name_elem = elem.find(W_NAME)
+                    name = name_elem.get(W_VAL) if name_elem is not None else None
+                    name = _UI_STYLE_NAMES.get(name, name)
+                    style_id = elem.get(W_STYLE_ID)
+                    if style_id is not None and style_id not in names:
+                        names[style_id] = name
+                    if elem.get(W_DEFAULT, "").lower() in _ON_VALUES:
+                        default_name = name  # Last default wins, as in the spec
+                elem.clear()
+        except ParseError as e:
+            raise DocxStreamError(f"malformed {styles_path}: {e}")
+    return names, default_name
+
+
+def _run_text(run) -> str:
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or "")
+        elif tag in (W_TAB, W_PTAB):
+            parts.append("\t")
+        elif tag == W_CR:
+            parts.append("\n")
+        elif tag == W_BR:
+            if child.get(W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag == W_NO_BREAK_HYPHEN:
+            parts.append("-")
+    return "".join(parts)
+
+
+def _paragraph_text(paragraph) -> str:
+    parts = []
+    for child in paragraph:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(run) for run in child if run.tag == W_R)
+    return "".join(parts)
+
+
+def _paragraph_style_id(paragraph) -> Optional[str]:
+    ppr = paragraph.find(W_PPR)
+    if ppr is None:
+        return None
+    pstyle = ppr.find(W_PSTYLE)
+    return pstyle.get(W_VAL) if pstyle is not None else None
+
+
+def _int_val(elem, default: int) -> int:
+    if elem is None:
+        return default
+    try:
+        return int(elem.get(W_VAL))
+    except (TypeError, ValueError):
+        raise DocxStreamError("invalid integer attribute in table layout")
+
+
+def _row_cells(row, cells_above: dict[int, tuple[str, int]]) -> tuple[list[str], dict]:
+    """Read one w:tr into layout-grid cell texts.
+
+    Args:
+        row: The w:tr element
+        cells_above: grid offset -> (text, span) of the cells starting in the previous row
+
+    Returns:
+        tuple: (cell texts, grid offset -> (text, span) for this row)
+    """
+    trpr = row.find(W_TRPR)
+    offset = _int_val(trpr.find(W_GRID_BEFORE) if trpr is not None else None, 0)
+    values = []
+    starts = {}
+
+    for cell in row:
+        if cell.tag != W_TC:
+            continue
+        tcpr = cell.find(W_TCPR)
+        span = _int_val(tcpr.find(W_GRID_SPAN) if tcpr is not None else None, 1)
+        vmerge = tcpr.find(W_VMERGE) if tcpr is not None else None
+
+        if vmerge is not None and vmerge.get(W_VAL, "continue") == "continue":
+            if offset not in cells_above:
+                raise DocxStreamError("vertically merged cell without a cell above it")
+            text, span = cells_above[offset]
+        else:
+            text = "\n".join(_paragraph_text(p) for p in cell if p.tag == W_P)
+
+        starts[offset] = (text, span)
+        values.extend([text] * span)
+        offset += span
+    return values, starts
+
+
+def iter_docx_blocks(file_path) -> Iterator[DocxBlock]:
+    """Stream body-level paragraphs and tables of a DOCX file in document order.
+
+    Raises:
+        DocxStreamError: The file needs the python-docx fallback
+        zipfile.BadZipFile, OSError: The file cannot be read at all
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        targets = _read_rels(archive, "_rels/.rels")
+        document_target = targets.get(OFFICE_DOCUMENT_REL)
+        if not document_target:
+            raise DocxStreamError("no main document part")
+        document_path = _resolve_part("", document_target)
+        document_dir, document_name = posixpath.split(document_path)
+
+        part_rels = _read_rels(archive, posixpath.join(document_dir, "_rels", f"{document_name}.rels"))
+        styles_target = part_rels.get(STYLES_REL)
+        styles_path = _resolve_part(document_dir, styles_target) if styles_target else None
+        style_names, default_style = _read_paragraph_styles(archive, styles_path)
+
+        try:
+            data = archive.open(document_path)
+        except KeyError:
+            raise DocxStreamError(f"missing part {document_path}")
+
+        with data:
+            yield from _iter_body_blocks(data, style_names, default_style)
+
+
+def _iter_body_blocks(data, style_names, default_style) -> Iterator[DocxBlock]:
+    # Element stack from the root: document (0), body (1), block (2), row (3)
+    stack = []
+    table = None
+    cells_above = {}
+    try:
+        for event, elem in iterparse(data, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                if len(stack) == 1 and elem.tag != _w("document"):
+                    raise DocxStreamError(f"unexpected root element {elem.tag}")
+                if len(stack) == 3 and elem.tag == W_TBL:
+                    table = DocxTable()
+                    cells_above = {}
+                elif len(stack) == 3 and elem.tag == W_ALT_CHUNK:
+                    raise DocxStreamError("document embeds alternative format content")
+                continue
+
+            stack.pop()
+            depth = len(stack)
+            if depth == 2 and elem.tag == W_P and stack[1].tag == W_BODY:
+                style_id = _paragraph_style_id(elem)
+                style = style_names.get(style_id, default_style) if style_id else default_style
+                yield DocxParagraph(_paragraph_text(elem), style)
+                stack[1].remove(elem)
+            elif depth == 3 and elem.tag == W_TR and table is not None:
+                row, cells_above = _row_cells(elem, cells_above)
+                table.rows.append(row)
+                stack[2].remove(elem)
+            elif depth == 2 and elem.tag == W_TBL and table is not None:
+                yield table
+                table = None
+                stack[1].remove(elem)
+            elif depth == 2 and stack[1].tag == W_BODY:
+                # Section properties, content controls etc. carry no body-level blocks
+                stack[1].remove(elem)
+    except ParseError as e:
+        raise DocxStreamError(f"malformed document.xml: {e}")
+
+
+def _content_from_python_docx(file_path) -> DocxContent:
+    """Build DocxContent with python-docx (slow path for files the stream reader rejects)."""
+    from docx import Document
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    document = Document(file_path)
+    blocks = []
+    for item in document.iter_inner_content():
+        if isinstance(item, Paragraph):
+            style = item.style.name if item.style is not None else None
+            blocks.append(DocxParagraph(item.text, style))
+        elif isinstance(item, Table):
+            table = DocxTable()
+            for row_idx, row in enumerate(item.rows):
+                try:
+                    table.rows.append([cell.text for cell in row.cells])
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable row {row_idx} in {file_path}: {e}")
+            blocks.append(table)
+    return DocxContent(blocks, "python-docx")
+
+
+def load_docx(file_path, stream: bool = True) -> DocxContent:
+    """Read a DOCX file's paragraphs and tables, streaming where possible.
+
+    Args:
+        file_path: Path to the DOCX file
+        stream: Try the iterparse reader first (set False to force python-docx)
+
+    Returns:
+        DocxContent in document order
+
+    Raises:
+        Whatever python-docx raises for files neither reader can open
+    """
+    if stream:
+        try:
+            return DocxContent(list(iter_docx_blocks(file_path)), "stream")
+        except (DocxStreamError, zipfile.BadZipFile, KeyError) as e:
+            logger.info(f"Falling back to python-docx for {file_path}: {e}")
+    return _content_from_python_docx(file_path)
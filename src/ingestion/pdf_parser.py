@@ -6,6 +6,7 @@ from typing import Any, Optional
 
 from src.ingestion.exceptions import CorruptedFileError, UnsupportedFormatError
 from src.ingestion.language_detector import LanguageDetector
+from src.ingestion.section_classifier import classify_section_type
 from src.ingestion.table_extractor import TableExtractor
 from src.models.documents import DocumentMetadata, DocumentSection, ParsedDocument, TableData
 from src.models.enums import DocumentType, Language, SectionType
@@ -227,30 +228,4 @@ class PDFParser:
 
     def _detect_section_type(self, title: str) -> SectionType:
         """Detect section type from title."""
-        title_lower = title.lower()
-
-        # English patterns
-        patterns = {
-            SectionType.EXECUTIVE_SUMMARY: ["executive summary", "summary", "abstract", "ملخص"],
-            SectionType.INTRODUCTION: ["introduction", "background", "مقدمة"],
-            SectionType.SCOPE_OF_WORK: ["scope", "scope of work", "نطاق العمل"],
-            SectionType.METHODOLOGY: ["methodology", "approach", "method", "المنهجية"],
-            SectionType.TECHNICAL_APPROACH: ["technical", "technical approach", "النهج الفني"],
-            SectionType.TIMELINE: ["timeline", "schedule", "الجدول الزمني"],
-            SectionType.TEAM_COMPOSITION: ["team", "personnel", "staff", "فريق العمل"],
-            SectionType.DELIVERABLES: ["deliverables", "outputs", "المخرجات"],
-            SectionType.COST_ESTIMATE: ["cost", "budget", "pricing", "التكلفة"],
-            SectionType.BOQ: ["boq", "bill of quantities", "جدول الكميات"],
-            SectionType.TERMS_AND_CONDITIONS: ["terms", "conditions", "الشروط"],
-            SectionType.APPENDIX: ["appendix", "annex", "الملحق"],
-            SectionType.REFERENCES: ["references", "bibliography", "المراجع"],
-            SectionType.CONCLUSIONS: ["conclusion", "الخلاصة"],
-            SectionType.RECOMMENDATIONS: ["recommendation", "التوصيات"],
-        }
-
-        for section_type, keywords in patterns.items():
-            for keyword in keywords:
-                if keyword in title_lower:
-                    return section_type
-
-        return SectionType.OTHER
+        return SectionType(classify_section_type(title))
@@ -0,0 +1,199 @@
+"""Compiled section-header classifier shared by doc_pipeline and the parsers.
+
+Header rules and section-type keywords are compiled once into combined regular
+expressions, so classifying a line costs one or two regex calls instead of a
+loop over patterns and keyword lists:
+
+- ``matches_header_patterns``: any of the configured header patterns matches
+  (one alternation, each pattern keeping its own flags)
+- ``is_line_header``: all-caps line, section keyword or numbered heading
+- ``section_type``: the first section type (in ``SECTION_TYPE_KEYWORDS`` order)
+  with a keyword anywhere in the title, found with a prefix-trie regex
+
+Section types are returned as ``SectionType`` values (e.g. ``"boq"``) so this
+module does not depend on the pydantic models.
+"""
+
+import re
+from typing import Iterable, Optional
+
+# Bilingual keywords per section type; when a title contains keywords of several
+# types, the type listed first wins
+SECTION_TYPE_KEYWORDS = {
+    "executive_summary": ["executive summary", "summary", "abstract", "ملخص"],
+    "introduction": ["introduction", "background", "مقدمة"],
+    "scope_of_work": ["scope", "scope of work", "نطاق العمل"],
+    "methodology": ["methodology", "approach", "method", "المنهجية"],
+    "technical_approach": ["technical", "technical approach", "النهج الفني"],
+    "timeline": ["timeline", "schedule", "الجدول الزمني"],
+    "team_composition": ["team", "personnel", "staff", "فريق العمل"],
+    "deliverables": ["deliverables", "outputs", "المخرجات"],
+    "cost_estimate": ["cost", "budget", "pricing", "التكلفة"],
+    "boq": ["boq", "bill of quantities", "جدول الكميات"],
+    "terms_and_conditions": ["terms", "conditions", "الشروط"],
+    "appendix": ["appendix", "annex", "الملحق"],
+    "references": ["references", "bibliography", "المراجع"],
+    "conclusions": ["conclusion", "الخلاصة"],
+    "recommendations": ["recommendation", "التوصيات"],
+}
+OTHER_SECTION_TYPE = "other"
+
+# Numbered headings such as "1. Introduction" in extracted PDF text
+NUMBERED_HEADING_PATTERN = r"\d+\.\s+\w"
+
+
+def _scoped(pattern: re.Pattern) -> str:
+    """Wrap a compiled pattern so its flags survive inside an alternation."""
+    flags = ""
+    if pattern.flags & re.IGNORECASE:
+        flags += "i"
+    if pattern.flags & re.MULTILINE:
+        flags += "m"
+    if pattern.flags & re.DOTALL:
+        flags += "s"
+    if pattern.flags & re.VERBOSE:
+        flags += "x"
+    if pattern.flags & re.ASCII:
+        flags += "a"
+    return f"(?{flags}:{pattern.pattern})" if flags else f"(?:{pattern.pattern})"
+
+
+def _combine(patterns: Iterable[re.Pattern]) -> Optional[re.Pattern]:
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    try:
+        return re.compile("|".join(_scoped(pattern) for pattern in patterns))
+    except re.error:
+        # Patterns that cannot share one expression (e.g. clashing group names)
+        return None
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex alternation of ``words`` factored into a prefix trie (longest match first)."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+def _prune_keywords(keyword_rank: dict[str, int]) -> dict[str, int]:
+    """Drop keywords that contain an equally or better ranked keyword.
+
+    Whenever such a keyword occurs, the shorter one occurs too, so it can never
+    change the result; after pruning, the longest keyword at a position is also
+    the best ranked one there.
+    """
+    return {
+        keyword: rank
+        for keyword, rank in keyword_rank.items()
+        if not any(
+            other != keyword and other in keyword and other_rank <= rank
+            for other, other_rank in keyword_rank.items()
+        )
+    }
+
+
+class SectionClassifier:
+    """Classify lines as section headers and titles as section types."""
+
+    def __init__(
+        self,
+        header_patterns: Iterable[re.Pattern] = (),
+        keyword_pattern: Optional[re.Pattern] = None,
+        type_keywords: Optional[dict[str, list[str]]] = None,
+    ):
+        """Compile the classifier.
+
+        Args:
+            header_patterns: Patterns matched at the start of a paragraph (DOCX headers)
+            keyword_pattern: Section keyword pattern for extracted PDF lines
+            type_keywords: Section type -> keywords (defaults to SECTION_TYPE_KEYWORDS)
+        """
+        self.header_patterns = list(header_patterns)
+        self._header_re = _combine(self.header_patterns)
+
+        line_rules = [re.compile(NUMBERED_HEADING_PATTERN)]
+        if keyword_pattern is not None:
+            line_rules.insert(0, keyword_pattern)
+        self._line_re = _combine(line_rules) or line_rules
+
+        type_keywords = SECTION_TYPE_KEYWORDS if type_keywords is None else type_keywords
+        keyword_rank = {}
+        for rank, keywords in enumerate(type_keywords.values()):
+            for keyword in keywords:
+                keyword_rank.setdefault(keyword.lower(), rank)
+        self._keyword_rank = _prune_keywords(keyword_rank)
+        self._types = list(type_keywords)
+        self._type_search = None
+        self._type_scan = None
+        if self._keyword_rank:
+            trie = _trie_pattern(self._keyword_rank)
+            # One trie search rejects titles without keywords; titles with one are
+            # rescanned with a zero-width lookahead so overlapping keywords are seen
+            self._type_search = re.compile(trie)
+            self._type_scan = re.compile(f"(?=({trie}))")
+
+    def matches_header_patterns(self, text: str) -> bool:
+        """True if any header pattern matches at the start of ``text``."""
+        if self._header_re is not None:
+            return self._header_re.match(text) is not None
+        return any(pattern.match(text) for pattern in self.header_patterns)
+
+    def is_line_header(self, line: str) -> bool:
+        """True if a stripped line of extracted text starts a new section.
+
+        A header is an all-caps line of 10-100 characters with at least two
+        words, a line starting with a section keyword, or a numbered heading.
+        """
+        if isinstance(self._line_re, list):
+            if any(pattern.match(line) for pattern in self._line_re):
+                return True
+        elif self._line_re.match(line):
+            return True
+        return 10 <= len(line) <= 100 and line.isupper() and len(line.split()) >= 2
+
+    def section_type(self, title: str) -> str:
+        """Return the section type value for a title (OTHER_SECTION_TYPE if none)."""
+        if self._type_search is None:
+            return OTHER_SECTION_TYPE
+        title = title.lower()
+        first = self._type_search.search(title)
+        if first is None:
+            return OTHER_SECTION_TYPE
+
+        best = self._keyword_rank[first.group()]
+        for match in self._type_scan.finditer(title, first.start() + 1):
+            if best == 0:
+                break
+            best = min(best, self._keyword_rank[match.group(1)])
+        return self._types[best]
+
+
+_default_classifier = None
+
+
+def get_default_classifier() -> SectionClassifier:
+    """Shared classifier with the default section-type keywords."""
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = SectionClassifier()
+    return _default_classifier
+
+
+def classify_section_type(title: str) -> str:
+    """Section type value for a title, using the default keywords."""
+    return get_default_classifier().section_type(title)
@@ -0,0 +1,52 @@
+"""Property-based tests for vectorized OCR text scoring."""
+
+import os
+import sys
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import doc_pipeline
+
+
+def reference_counts(text):
+    """Straightforward per-character counts the vectorized scorer must match."""
+    return {
+        "chars": len(text),
+        "stripped_chars": len(text.strip()),
+        "non_space": sum(1 for c in text if not c.isspace()),
+        "latin": sum(1 for c in text if c.isalpha() and ord(c) < 128),
+        "arabic": sum(1 for c in text if "؀" <= c <= "ۿ"),
+        "digits": sum(1 for c in text if "0" <= c <= "9"),
+        "words": len(text.split()),
+    }
+
+
+ocr_like_text = st.text(
+    alphabet=st.one_of(
+        st.sampled_from(" \t\n\r\x0b\x0c  　​"),
+        st.characters(min_codepoint=0x20, max_codepoint=0x7E),
+        st.characters(min_codepoint=0x0600, max_codepoint=0x06FF),
+        st.characters(),
+    )
+)
+
+
+@given(ocr_like_text)
+def test_count_ocr_text_matches_reference(text):
+    """Vectorized counts equal the per-character definitions for any text."""
+    assert doc_pipeline.count_ocr_text(text) == reference_counts(text)
+
+
+@given(ocr_like_text, ocr_like_text)
+def test_page_counts_sum_like_text(first, second):
+    """Character totals of pages add up, so document scores can be built from pages."""
+    totals = doc_pipeline._sum_ocr_counts(
+        [doc_pipeline.count_ocr_text(first), doc_pipeline.count_ocr_text(second)]
+    )
+    joined = doc_pipeline.count_ocr_text(first + second)
+
+    for key in ("chars", "non_space", "latin", "arabic", "digits"):
+        assert totals[key] == joined[key]
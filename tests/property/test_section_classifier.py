@@ -0,0 +1,77 @@
+"""Property-based tests for the compiled section-header classifier."""
+
+import os
+import re
+import sys
+
+from hypothesis import given
+from hypothesis import strategies as st
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import doc_pipeline
+from src.ingestion.section_classifier import SECTION_TYPE_KEYWORDS, SectionClassifier
+
+
+def reference_section_type(title, type_keywords=SECTION_TYPE_KEYWORDS):
+    """Nested keyword loop the classifier replaced."""
+    title_lower = title.lower()
+    for section_type, keywords in type_keywords.items():
+        for keyword in keywords:
+            if keyword in title_lower:
+                return section_type
+    return "other"
+
+
+def reference_is_line_header(line):
+    """Per-line PDF header checks the classifier replaced."""
+    if line.isupper() and 10 <= len(line) <= 100 and len(line.split()) >= 2:
+        return True
+    if doc_pipeline.CONFIG["SECTION_KEYWORDS_PATTERN"].match(line):
+        return True
+    return re.match(r"^\d+\.\s+\w+", line) is not None
+
+
+KEYWORDS = [keyword for keywords in SECTION_TYPE_KEYWORDS.values() for keyword in keywords]
+HEADER_WORDS = ["SECTION 2", "Introduction", "1. Project Overview", "CHAPTER 3", "EXECUTIVE SUMMARY"]
+
+# Text built from keywords, header fragments and arbitrary characters, so titles
+# often contain several (overlapping) keywords
+title_text = st.lists(
+    st.one_of(
+        st.sampled_from(KEYWORDS + [k.upper() for k in KEYWORDS] + HEADER_WORDS),
+        st.text(max_size=6),
+    ),
+    max_size=6,
+).map("".join)
+
+
+@given(title_text)
+def test_section_type_matches_keyword_loop(title):
+    """The trie scan picks the same section type as the ordered keyword loop."""
+    classifier = SectionClassifier()
+    assert classifier.section_type(title) == reference_section_type(title)
+
+
+@given(title_text)
+def test_line_header_matches_legacy_rules(line):
+    """Combined header rules agree with the separate checks."""
+    classifier = doc_pipeline.get_section_classifier()
+    assert classifier.is_line_header(line) == reference_is_line_header(line)
+    assert classifier.matches_header_patterns(line) == any(
+        pattern.match(line) for pattern in doc_pipeline.CONFIG["HEADER_PATTERNS"]
+    )
+
+
+@given(
+    st.dictionaries(
+        st.sampled_from(["a", "b", "c", "d"]),
+        st.lists(st.text(alphabet="xyz ", min_size=1, max_size=4), min_size=1, max_size=3),
+        min_size=1,
+    ),
+    st.text(alphabet="xyz Y", max_size=20),
+)
+def test_custom_keywords_match_keyword_loop(type_keywords, title):
+    """Keyword precedence holds for arbitrary, heavily overlapping keyword sets."""
+    classifier = SectionClassifier(type_keywords=type_keywords)
+    assert classifier.section_type(title) == reference_section_type(title, type_keywords)
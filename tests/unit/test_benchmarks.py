@@ -0,0 +1,154 @@
+"""Unit tests for the synthetic corpus generator and benchmark runner."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import doc_pipeline
+from benchmarks import corpus, run_benchmarks, table_prefilter
+
+
+# Fixtures
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+# Tests for corpus generation
+def test_corpus_is_reproducible(temp_dir):
+    """The same seed produces the same manifest and extracted text."""
+    first = corpus.generate_corpus(os.path.join(temp_dir, "a"), seed=7, documents=5, pages=3)
+    second = corpus.generate_corpus(os.path.join(temp_dir, "b"), seed=7, documents=5, pages=3)
+    assert first == second
+
+    for entry in first["files"]:
+        left = os.path.join(temp_dir, "a", entry["path"])
+        right = os.path.join(temp_dir, "b", entry["path"])
+        if entry["kind"] in ("docx", "mixed_docx"):
+            assert doc_pipeline.extract_docx_segments(left) == doc_pipeline.extract_docx_segments(right)
+        elif entry["kind"] != "scanned_pdf":
+            assert doc_pipeline.extract_pdf_segments(left) == doc_pipeline.extract_pdf_segments(right)
+
+
+def test_corpus_manifest_describes_files(temp_dir):
+    """Manifest lists every kind with page counts and table pages."""
+    manifest = corpus.generate_corpus(temp_dir, seed=1, documents=4, pages=5,
+                                      kinds=("text_pdf", "scanned_pdf", "docx", "mixed_docx"))
+    assert corpus.load_manifest(temp_dir) == manifest
+    assert [entry["kind"] for entry in manifest["files"]] == [
+        "text_pdf", "scanned_pdf", "docx", "mixed_docx"
+    ]
+    for entry in manifest["files"]:
+        assert os.path.exists(os.path.join(temp_dir, entry["path"]))
+        if entry["path"].endswith(".pdf"):
+            assert entry["pages"] == 5
+            assert entry["table_pages"] and all(1 <= p <= 5 for p in entry["table_pages"])
+
+    scanned = next(e for e in manifest["files"] if e["kind"] == "scanned_pdf")
+    import fitz
+
+    with fitz.open(os.path.join(temp_dir, scanned["path"])) as pdf:
+        assert all(not page.get_text().strip() for page in pdf)
+
+    mixed = next(e for e in manifest["files"] if e["kind"] == "mixed_docx")
+    result = doc_pipeline.extract_docx_segments(os.path.join(temp_dir, mixed["path"]))
+    assert any("المشروع" in text or "تحليل" in text for text in result["segments"].values())
+
+
+def test_text_pdf_tables_match_manifest(temp_dir):
+    """Ruled tables are drawn on exactly the pages recorded in the manifest."""
+    manifest = corpus.generate_corpus(temp_dir, seed=3, documents=1, pages=6, kinds=("text_pdf",))
+    entry = manifest["files"][0]
+    tables = doc_pipeline.extract_tables_from_pdf(os.path.join(temp_dir, entry["path"]))
+    assert sorted({table["page"] for table in tables}) == entry["table_pages"]
+
+
+def test_table_prefilter_matches_manifest(temp_dir):
+    """The table-page prefilter flags exactly the manifest's table pages."""
+    corpus.generate_corpus(temp_dir, seed=5, documents=2, pages=5, kinds=("text_pdf",))
+    results = table_prefilter.run_prefilter_benchmark(temp_dir)
+
+    assert results["pages"] == 10
+    assert results["precision"] == 1.0
+    assert results["recall"] == 1.0
+    assert results["tables_lost"] == 0
+
+
+def test_unknown_corpus_parameter_rejected(temp_dir):
+    """Typos in generator parameters fail loudly."""
+    with pytest.raises(ValueError):
+        corpus.generate_corpus(temp_dir, page=3)
+
+
+# Tests for the benchmark runner
+def test_run_benchmarks_reports_throughput(temp_dir):
+    """Stage and full-pipeline runs report docs/sec, pages/sec and peak RSS."""
+    corpus_dir = os.path.join(temp_dir, "corpus")
+    corpus.generate_corpus(corpus_dir, seed=2, documents=2, pages=2, kinds=("text_pdf", "docx"))
+
+    results = run_benchmarks.run_benchmarks(
+        corpus_dir, stages=["pdf_segments", "ocr", run_benchmarks.FULL_PIPELINE]
+    )
+    stages = results["stages"]
+    assert stages["pdf_segments"]["documents"] == 1
+    assert stages["pdf_segments"]["pages_per_sec"] > 0
+    assert "skipped" in stages["ocr"]
+
+    full = stages[run_benchmarks.FULL_PIPELINE]
+    assert full["documents"] == 2
+    assert full["errors"] == 0
+    assert full["docs_per_sec"] > 0
+    assert full["peak_rss_mb"] is None or full["peak_rss_mb"] > 0
+    assert "pdf_text" in full["stage_seconds"]
+    # Pipeline state went to a scratch directory, not the working tree
+    assert not os.path.exists(os.path.join(corpus_dir, "processing_tracker.db"))
+
+
+def test_compare_to_baseline_flags_regressions():
+    """Slowdowns and memory growth beyond the tolerance are regressions."""
+    baseline = {"stages": {
+        "a": {"docs_per_sec": 10.0, "peak_rss_mb": 100.0},
+        "b": {"docs_per_sec": 10.0, "peak_rss_mb": 100.0},
+        "c": {"docs_per_sec": 10.0, "peak_rss_mb": 100.0},
+    }}
+    results = {"stages": {
+        "a": {"docs_per_sec": 9.5, "peak_rss_mb": 105.0},
+        "b": {"docs_per_sec": 8.0, "peak_rss_mb": 100.0},
+        "c": {"docs_per_sec": 12.0, "peak_rss_mb": 150.0},
+        "d": {"skipped": "OCR not available"},
+    }}
+    rows = {row["stage"]: row for row in run_benchmarks.compare_to_baseline(results, baseline, 0.1)}
+    assert set(rows) == {"a", "b", "c"}
+    assert not rows["a"]["regression"]
+    assert rows["b"]["regression"]
+    assert rows["c"]["regression"]
+    assert rows["b"]["speed_change"] == pytest.approx(-0.2)
+
+
+def test_main_saves_and_compares_baseline(temp_dir, capsys):
+    """--save-baseline writes results that a later run compares against."""
+    corpus_dir = os.path.join(temp_dir, "corpus")
+    corpus.generate_corpus(corpus_dir, seed=4, documents=1, pages=2, kinds=("docx",))
+    baseline_path = os.path.join(temp_dir, "baseline.json")
+    args = ["--corpus-dir", corpus_dir, "--stages", "docx_segments", "--baseline", baseline_path]
+
+    assert run_benchmarks.main(args + ["--save-baseline"]) == 0
+    with open(baseline_path, encoding="utf-8") as handle:
+        saved = json.load(handle)
+    assert saved["stages"]["docx_segments"]["documents"] == 1
+
+    # A baseline ten times faster makes the current run a regression
+    saved["stages"]["docx_segments"]["docs_per_sec"] *= 10
+    with open(baseline_path, "w", encoding="utf-8") as handle:
+        json.dump(saved, handle)
+    assert run_benchmarks.main(args + ["--fail-on-regression"]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
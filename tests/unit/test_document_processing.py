@@ -0,0 +1,422 @@
+"""Unit tests for the document processing pipeline orchestration."""
+
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+from docx import Document
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import doc_pipeline
+
+
+# Fixtures
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+@pytest.fixture
+def isolated_state(temp_dir, monkeypatch):
+    """Point tracker and knowledge base paths at the temporary directory."""
+    monkeypatch.setitem(doc_pipeline.CONFIG, "DB_PATH", os.path.join(temp_dir, "tracker.db"))
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_CACHE_PATH", os.path.join(temp_dir, "ocr.db"))
+    monkeypatch.setattr(doc_pipeline, "_ocr_cache", None)
+    yield temp_dir
+    if doc_pipeline._ocr_cache is not None:
+        doc_pipeline._ocr_cache.close()
+
+
+@pytest.fixture
+def proposals_folder(temp_dir):
+    """Create a folder with a few small DOCX proposals."""
+    folder = os.path.join(temp_dir, "proposals")
+    os.makedirs(folder)
+    for idx in range(3):
+        doc = Document()
+        doc.add_heading("Introduction", 1)
+        doc.add_paragraph(f"Proposal {idx} introduction text.")
+        doc.add_heading("Methodology", 1)
+        doc.add_paragraph(f"Proposal {idx} methodology text.")
+        doc.save(os.path.join(folder, f"proposal_{idx}.docx"))
+    return folder
+
+
+def _without_timestamps(knowledge_base):
+    return {
+        doc_id: {k: v for k, v in doc.items() if k != "processed_at"}
+        for doc_id, doc in knowledge_base.items()
+    }
+
+
+# Tests for parallel ingestion
+def test_extract_document_builds_entry(proposals_folder):
+    """Test that a single document is turned into a knowledge base entry."""
+    file_path = os.path.join(proposals_folder, "proposal_0.docx")
+    entry = doc_pipeline.extract_document(file_path, "proposals")
+
+    assert entry["file_path"] == file_path
+    assert entry["type"] == "proposals"
+    assert entry["format"] == ".docx"
+    assert "Methodology" in entry["segments"]
+    assert "processed_at" in entry
+
+
+def test_extract_document_keeps_large_pdf_sections(temp_dir, monkeypatch):
+    """Test that PDF sections are streamed from the spool and stored without truncation."""
+    import fitz
+
+    pdf_path = os.path.join(temp_dir, "large.pdf")
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Hydrology report")
+    doc.save(pdf_path)
+    doc.close()
+
+    long_section = "rainfall\x00 " * 150_000  # ~1.5M characters
+
+    def fake_iter_pdf_segments(file_path, *args, **kwargs):
+        yield "Content", long_section
+        yield "_metadata", {"extraction_method": "hybrid"}
+
+    monkeypatch.setattr(doc_pipeline, "iter_pdf_segments", fake_iter_pdf_segments)
+    monkeypatch.setattr(
+        doc_pipeline, "extract_pdf_segments", lambda *args, **kwargs: pytest.fail("materialised")
+    )
+
+    entry = doc_pipeline.extract_document(pdf_path, "reports")
+
+    assert entry["segments"]["Content"] == long_section.replace("\x00", "")
+    assert len(entry["segments"]["Content"]) > 1_000_000
+    assert entry["segments"]["_metadata"] == {"extraction_method": "hybrid"}
+
+
+def test_parallel_matches_sequential(isolated_state, proposals_folder):
+    """Test that worker processes produce the same knowledge base as a sequential run."""
+    folders = {"proposals": proposals_folder}
+
+    sequential = doc_pipeline.process_all_documents(folders, force_reprocess=True, workers=1)
+    parallel = doc_pipeline.process_all_documents(folders, force_reprocess=True, workers=2)
+
+    assert list(parallel.keys()) == list(sequential.keys())
+    assert _without_timestamps(parallel) == _without_timestamps(sequential)
+
+
+def test_parallel_records_tracker_in_parent(isolated_state, proposals_folder):
+    """Test that duplicate tracking is still recorded when extraction runs in workers."""
+    folders = {"proposals": proposals_folder}
+
+    doc_pipeline.process_all_documents(folders, workers=2)
+    second_run = doc_pipeline.process_all_documents(folders, workers=2)
+
+    assert second_run == {}
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork", reason="Requires fork start method"
+)
+def test_worker_crash_only_loses_one_file(isolated_state, proposals_folder, monkeypatch):
+    """Test that a worker crash is isolated to the file that caused it."""
+    original = doc_pipeline.extract_docx_segments
+
+    def crashing_extract(file_path):
+        if "proposal_1" in file_path:
+            os._exit(1)
+        return original(file_path)
+
+    monkeypatch.setattr(doc_pipeline, "extract_docx_segments", crashing_extract)
+
+    result = doc_pipeline.process_all_documents(
+        {"proposals": proposals_folder}, force_reprocess=True, workers=2
+    )
+
+    assert "error" in result["proposals_proposal_1"]
+    assert "segments" in result["proposals_proposal_0"]
+    assert "segments" in result["proposals_proposal_2"]
+
+
+# Tests for the duplicate tracker
+def test_tracker_batches_inserts_until_flush(temp_dir):
+    """Test that records are visible immediately but only written per batch."""
+    db_path = os.path.join(temp_dir, "tracker.db")
+    tracker = doc_pipeline.DuplicateTracker(db_path, batch_size=3)
+
+    tracker.record_processed("a.pdf", "hash-a")
+    tracker.record_processed("b.pdf", "hash-b")
+
+    assert tracker.is_duplicate("other.pdf", "hash-a")
+    assert doc_pipeline.DuplicateTracker(db_path).get_record_count() == 0
+
+    tracker.record_processed("c.pdf", "hash-c")
+    assert doc_pipeline.DuplicateTracker(db_path).get_record_count() == 3
+
+    tracker.record_processed("d.pdf", "hash-d")
+    tracker.close()
+    reopened = doc_pipeline.DuplicateTracker(db_path)
+    assert reopened.get_tracked_hash_set() == {"hash-a", "hash-b", "hash-c", "hash-d"}
+    reopened.close()
+
+
+def test_tracker_records_survive_interrupted_run(isolated_state, proposals_folder, monkeypatch):
+    """Test that an abandoned tracker still has every finished file on disk after a crash."""
+    db_path = doc_pipeline.CONFIG["DB_PATH"]
+    tracker = doc_pipeline.DuplicateTracker(db_path, batch_size=100)
+    original = doc_pipeline._iter_extraction_results
+    finished = []
+
+    def interrupted_results(jobs, workers=1):
+        for result in original(jobs, workers):
+            if len(finished) == 2:
+                raise KeyboardInterrupt
+            finished.append(result[0]["file_path"])
+            yield result
+
+    monkeypatch.setattr(doc_pipeline, "_iter_extraction_results", interrupted_results)
+
+    with pytest.raises(KeyboardInterrupt):
+        doc_pipeline.process_all_documents({"proposals": proposals_folder}, dup_tracker=tracker)
+
+    # The tracker is never closed; only what reached the database counts
+    reopened = doc_pipeline.DuplicateTracker(db_path)
+    assert sorted(reopened.get_tracked_file_map()) == sorted(finished)
+    reopened.close()
+
+
+def test_tracker_mirrors_replace_semantics(temp_dir):
+    """Test that in-memory lookups match the table's unique path and hash columns."""
+    tracker = doc_pipeline.DuplicateTracker(os.path.join(temp_dir, "tracker.db"))
+    tracker.record_processed("a.pdf", "hash-1")
+    tracker.record_processed("a.pdf", "hash-2")  # File content changed
+    tracker.record_processed("b.pdf", "hash-2")  # Same content under a new name
+
+    assert tracker.get_tracked_file_map() == {"b.pdf": "hash-2"}
+    assert not tracker.is_duplicate("a.pdf", "hash-1")
+    tracker.close()
+
+    reopened = doc_pipeline.DuplicateTracker(os.path.join(temp_dir, "tracker.db"))
+    assert reopened.get_tracked_file_map() == {"b.pdf": "hash-2"}
+    reopened.close()
+
+
+def test_tracker_migrates_legacy_schema(temp_dir):
+    """Test that databases without stat columns are upgraded in place."""
+    import sqlite3
+
+    db_path = os.path.join(temp_dir, "tracker.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE processed_files (file_path TEXT PRIMARY KEY, file_hash TEXT, "
+        "processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, UNIQUE(file_hash))"
+    )
+    conn.execute("INSERT INTO processed_files (file_path, file_hash) VALUES ('a.pdf', 'hash-a')")
+    conn.commit()
+    conn.close()
+
+    tracker = doc_pipeline.DuplicateTracker(db_path)
+
+    assert tracker.is_duplicate("a.pdf", "hash-a")
+    assert tracker.get_unchanged_hash("a.pdf", (1, 2, 3)) is None
+    tracker.close()
+
+
+# Tests for stat-based change detection
+def test_unchanged_files_are_not_rehashed(isolated_state, proposals_folder, monkeypatch):
+    """Test that an incremental run skips hashing files whose stat is unchanged."""
+    folders = {"proposals": proposals_folder}
+    doc_pipeline.process_all_documents(folders)
+
+    hashed = []
+    original_hash = doc_pipeline.get_file_hash
+
+    def counting_hash(file_path):
+        hashed.append(os.path.basename(str(file_path)))
+        return original_hash(file_path)
+
+    monkeypatch.setattr(doc_pipeline, "get_file_hash", counting_hash)
+
+    assert doc_pipeline.process_all_documents(folders) == {}
+    assert hashed == []
+
+    assert doc_pipeline.process_all_documents(folders, verify_hashes=True) == {}
+    assert len(hashed) == 3
+
+
+def test_modified_file_is_rehashed_and_reprocessed(isolated_state, proposals_folder):
+    """Test that a changed file is detected through its stat signature."""
+    folders = {"proposals": proposals_folder}
+    doc_pipeline.process_all_documents(folders)
+
+    modified = os.path.join(proposals_folder, "proposal_1.docx")
+    doc = Document()
+    doc.add_heading("Introduction", 1)
+    doc.add_paragraph("Revised introduction text.")
+    doc.save(modified)
+
+    result = doc_pipeline.process_all_documents(folders)
+
+    assert list(result.keys()) == ["proposals_proposal_1"]
+
+
+# Tests for state validation
+def test_compute_state_diff_reports_each_category(temp_dir):
+    """Test that tracker/KB differences are split into structured sets."""
+    tracker = doc_pipeline.DuplicateTracker(os.path.join(temp_dir, "tracker.db"))
+    tracker.record_processed("a.pdf", "hash-a")
+    tracker.record_processed("b.pdf", "hash-b")
+    tracker.record_processed("orphan.pdf", "hash-o")
+    knowledge_base = {
+        "knowledge_base": {"hydrological": {}},
+        "reports_a": {"file_path": "a.pdf", "file_hash": "hash-a"},
+        "reports_b": {"file_path": "b.pdf", "file_hash": "stale"},
+        "reports_new": {"file_path": "new.pdf"},
+    }
+
+    diff = doc_pipeline.compute_state_diff(tracker, knowledge_base)
+
+    assert diff == {
+        "missing_in_kb": {"orphan.pdf"},
+        "missing_in_tracker": {"new.pdf"},
+        "hash_mismatch": {"b.pdf"},
+    }
+
+    validation = doc_pipeline.validate_processing_state(tracker, knowledge_base)
+    assert validation["status"] == "error"
+    assert validation["diff"]["hash_mismatch"] == ["b.pdf"]
+    tracker.close()
+
+
+def test_processed_entries_keep_file_hash(isolated_state, proposals_folder):
+    """Test that knowledge base entries carry the hash recorded in the tracker."""
+    knowledge_base = doc_pipeline.process_all_documents({"proposals": proposals_folder})
+    tracker = doc_pipeline.DuplicateTracker()
+
+    diff = doc_pipeline.compute_state_diff(tracker, knowledge_base)
+
+    assert all(entry["file_hash"] for entry in knowledge_base.values())
+    assert diff == {"missing_in_kb": set(), "missing_in_tracker": set(), "hash_mismatch": set()}
+    tracker.close()
+
+
+# Tests for watch mode
+def test_folder_watcher_debounces_changes(proposals_folder):
+    """Test that a file is only reported once its size and mtime have settled."""
+    watcher = doc_pipeline.FolderWatcher({"proposals": proposals_folder}, debounce=5)
+    watcher.set_baseline()
+    new_file = os.path.join(proposals_folder, "upload.docx")
+    Path(os.path.join(proposals_folder, "~$upload.docx")).write_bytes(b"lock")
+
+    Path(new_file).write_bytes(b"partial")
+    assert watcher.poll(now=0) == []
+    with open(new_file, "ab") as f:
+        f.write(b" more bytes")
+    assert watcher.poll(now=4) == []  # Still growing: debounce window restarts
+    assert watcher.poll(now=8) == []
+    assert watcher.poll(now=9) == [new_file]
+    assert watcher.poll(now=20) == []
+
+
+def test_run_watch_mode_ingests_new_upload(isolated_state, proposals_folder, monkeypatch):
+    """Test that a file dropped into a watched folder is persisted and searchable."""
+    import json
+    import threading
+    import time
+
+    kb_path = os.path.join(isolated_state, "knowledge_base.json")
+    monkeypatch.setitem(
+        doc_pipeline.CONFIG, "SEARCH_INDEX_PATH", os.path.join(isolated_state, "search.db")
+    )
+    folders = {"proposals": proposals_folder}
+    stop_event = threading.Event()
+    watcher = threading.Thread(
+        target=doc_pipeline.run_watch_mode,
+        kwargs={
+            "base_folders": folders,
+            "knowledge_base": {"knowledge_base": {"hydrological": {}}},
+            "kb_path": kb_path,
+            "interval": 0.05,
+            "debounce": 0.1,
+            "stop_event": stop_event,
+        },
+    )
+    watcher.start()
+    try:
+        # Existing files are caught up on start
+        deadline = time.monotonic() + 20
+        while not os.path.exists(kb_path) and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        doc = Document()
+        doc.add_heading("Scope of Work", 1)
+        doc.add_paragraph("Wadi crossing culverts for the Siwa road.")
+        doc.save(os.path.join(proposals_folder, "new_upload.docx"))
+
+        results = []
+        while not results and time.monotonic() < deadline:
+            time.sleep(0.05)
+            results = doc_pipeline.search_knowledge_base("Siwa culverts")
+    finally:
+        stop_event.set()
+        watcher.join(timeout=20)
+
+    assert results[0]["doc_id"] == "proposals_new_upload"
+    with open(kb_path, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert "knowledge_base" in saved
+    assert {"proposals_proposal_0", "proposals_new_upload"} <= set(saved)
+
+
+# Tests for pipeline metrics
+def test_stage_timer_records_self_time(monkeypatch):
+    """Test that nested stages are not double counted in the outer stage."""
+    import time
+
+    monkeypatch.setattr(doc_pipeline, "_file_stats", {"stages": {}, "pages": 0})
+    with doc_pipeline.stage_timer("pdf_text"):
+        time.sleep(0.02)
+        with doc_pipeline.stage_timer("ocr"):
+            time.sleep(0.05)
+
+    stages = doc_pipeline._file_stats["stages"]
+    assert stages["ocr"] >= 0.05
+    assert 0.02 <= stages["pdf_text"] < 0.05
+
+
+def test_process_all_documents_collects_stage_metrics(isolated_state, proposals_folder):
+    """Test that per-file timings and run reports are produced for a processing run."""
+    import csv
+    import json
+
+    metrics = doc_pipeline.PipelineMetrics()
+    doc_pipeline.process_all_documents({"proposals": proposals_folder}, workers=2, metrics=metrics)
+    with metrics.run_stage("save"):
+        pass
+    metrics.finish()
+
+    summary = metrics.summary(top_n=2)
+    assert summary["files"] == 3
+    assert summary["megabytes"] > 0
+    assert {"hash", "docx", "save"} <= set(summary["stage_seconds"])
+    assert len(summary["slowest_files"]) == 2
+
+    report_dir = os.path.join(isolated_state, "reports")
+    json_path, csv_path = metrics.write_report(report_dir)
+    with open(json_path, encoding="utf-8") as f:
+        assert json.load(f)["summary"]["files"] == 3
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 3
+    assert all(float(row["docx"]) > 0 for row in rows)
+
+    tracker = doc_pipeline.DuplicateTracker()
+    dashboard = doc_pipeline.create_monitoring_dashboard(
+        {"proposals": proposals_folder}, tracker, {}, report_dir
+    )
+    tracker.close()
+    assert dashboard["performance"]["last_run_seconds"] == summary["wall_seconds"]
@@ -278,3 +278,144 @@ def test_docx_mixed_language_content(temp_dir):
     result = doc_pipeline.extract_docx_segments(doc_path)
     assert "segments" in result
     assert isinstance(result["segments"], dict)
+
+
+# Tests for the streaming DOCX reader
+@pytest.fixture
+def complex_docx_file(temp_dir):
+    """DOCX with merged cells, hyperlinks, breaks and custom styles."""
+    from docx.enum.style import WD_STYLE_TYPE
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    doc_path = os.path.join(temp_dir, "complex.docx")
+    doc = Document()
+    doc.styles.add_style("Proposal Heading", WD_STYLE_TYPE.PARAGRAPH).base_style = doc.styles["Heading 2"]
+    doc.styles.add_style("Emphasis Run", WD_STYLE_TYPE.CHARACTER)
+
+    doc.add_heading("Bill of Quantities", 1)
+    para = doc.add_paragraph("Line one")
+    para.add_run().add_break()
+    para.add_run("after break\tand tab")
+    link = OxmlElement("w:hyperlink")
+    link_run = OxmlElement("w:r")
+    link_text = OxmlElement("w:t")
+    link_text.text = " linked text"
+    link_run.append(link_text)
+    link.append(link_run)
+    para._p.append(link)
+    doc.add_paragraph("")
+    doc.add_paragraph("Custom styled heading", style="Proposal Heading")
+    wrong_type = doc.add_paragraph("Character style id")
+    wrong_type.style = "Normal"
+    wrong_type._p.get_or_add_pPr().get_or_add_pStyle().set(qn("w:val"), "EmphasisRun")  # Not a paragraph style
+
+    table = doc.add_table(rows=4, cols=3)
+    for row_idx, row in enumerate(table.rows):
+        for col_idx, cell in enumerate(row.cells):
+            cell.text = f"r{row_idx}c{col_idx}"
+    table.cell(0, 0).merge(table.cell(0, 2)).text = "Merged header"
+    table.cell(1, 0).merge(table.cell(3, 0)).text = "Spans rows\nsecond paragraph"
+    table.cell(2, 1).text = ""
+    table.cell(2, 2).text = ""
+
+    caption = doc.add_table(rows=1, cols=1)
+    caption.cell(0, 0).text = "Figure 1: Site plan"
+    doc.add_paragraph("1. Project Overview Section")
+    doc.add_paragraph("Closing paragraph.")
+
+    # Paragraph inside a content control: python-docx does not see it either
+    sdt = OxmlElement("w:sdt")
+    sdt_content = OxmlElement("w:sdtContent")
+    sdt_content.append(OxmlElement("w:p"))
+    sdt.append(sdt_content)
+    doc.element.body.insert(0, sdt)
+    assert doc.element.body.find(qn("w:sdt")) is not None
+
+    doc.save(doc_path)
+    return doc_path
+
+
+def test_stream_reader_matches_python_docx(complex_docx_file):
+    """Streamed paragraphs, styles and merged-cell tables equal python-docx output."""
+    from src.ingestion.docx_reader import load_docx
+
+    streamed = load_docx(complex_docx_file)
+    reference = load_docx(complex_docx_file, stream=False)
+
+    assert streamed.source == "stream"
+    assert reference.source == "python-docx"
+    assert streamed.blocks == reference.blocks
+    assert streamed.paragraphs[1].text == "Line one\nafter break\tand tab linked text"
+    assert streamed.tables[0].rows[0] == ["Merged header"] * 3
+    assert [row[0] for row in streamed.tables[0].rows[1:]] == ["Spans rows\nsecond paragraph"] * 3
+
+
+def test_extract_docx_segments_stream_matches_python_docx(complex_docx_file, sample_docx_file, monkeypatch):
+    """extract_docx_segments returns the same result with either reader."""
+    for path in (complex_docx_file, sample_docx_file):
+        streamed = doc_pipeline.extract_docx_segments(path)
+        monkeypatch.setitem(doc_pipeline.CONFIG, "DOCX_STREAM_READER", False)
+        reference = doc_pipeline.extract_docx_segments(path)
+        monkeypatch.setitem(doc_pipeline.CONFIG, "DOCX_STREAM_READER", True)
+        assert streamed == reference
+
+    result = doc_pipeline.extract_docx_segments(complex_docx_file)
+    assert "Bill of Quantities" in result["segments"]
+    assert "1. Project Overview Section" in result["segments"]
+    assert len(result["tables"]) == 1  # Figure caption table skipped
+
+
+def test_stream_reader_falls_back_to_python_docx(temp_dir):
+    """Content the stream reader does not handle is read with python-docx."""
+    import zipfile
+    from src.ingestion.docx_reader import load_docx
+
+    source = os.path.join(temp_dir, "source.docx")
+    doc = Document()
+    doc.add_paragraph("Before chunk")
+    doc.add_paragraph("After chunk")
+    doc.save(source)
+
+    # Embedded alternative-format content (altChunk) is only skipped by python-docx
+    patched = os.path.join(temp_dir, "alt_chunk.docx")
+    with zipfile.ZipFile(source) as src, zipfile.ZipFile(patched, "w") as dst:
+        for item in src.infolist():
+            data = src.read(item.filename)
+            if item.filename == "word/document.xml":
+                data = data.replace(b"<w:sectPr", b'<w:altChunk r:id="rIdChunk"/><w:sectPr', 1)
+            dst.writestr(item, data)
+
+    content = load_docx(patched)
+    assert content.source == "python-docx"
+    assert [p.text for p in content.paragraphs] == ["Before chunk", "After chunk"]
+
+    result = doc_pipeline.extract_docx_segments(patched)
+    assert result["segments"]["Introduction"] == "Before chunk\nAfter chunk"
+
+
+@pytest.mark.parametrize("part", ["word/styles.xml", "word/_rels/document.xml.rels"])
+def test_stream_reader_malformed_part_falls_back(temp_dir, monkeypatch, part):
+    """A malformed styles or relationships part hands the file to the python-docx fallback."""
+    import zipfile
+    from src.ingestion import docx_reader
+
+    source = os.path.join(temp_dir, "source.docx")
+    doc = Document()
+    doc.add_paragraph("Body text")
+    doc.save(source)
+
+    patched = os.path.join(temp_dir, "malformed.docx")
+    with zipfile.ZipFile(source) as src, zipfile.ZipFile(patched, "w") as dst:
+        for item in src.infolist():
+            data = src.read(item.filename)
+            if item.filename == part:
+                data = data[: len(data) // 2]  # Truncated mid-element
+            dst.writestr(item, data)
+
+    with pytest.raises(docx_reader.DocxStreamError):
+        list(docx_reader.iter_docx_blocks(patched))
+
+    fallback = docx_reader.DocxContent([], "python-docx")
+    monkeypatch.setattr(docx_reader, "_content_from_python_docx", lambda path: fallback)
+    assert docx_reader.load_docx(patched) is fallback
@@ -0,0 +1,222 @@
+"""Unit tests for knowledge base storage."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import doc_pipeline
+
+
+# Fixtures
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+@pytest.fixture
+def sample_kb():
+    """Small knowledge base with a static section and bilingual document ids."""
+    return {
+        "knowledge_base": {"hydrological": {"glossary": {"IDF": "Intensity-Duration-Frequency"}}},
+        "proposals_Ras ElHekma Tech.": {
+            "file_path": "proposals/Ras ElHekma Tech.docx",
+            "type": "proposals",
+            "format": ".docx",
+            "segments": {"Introduction": "Hydrology study"},
+            "tables": [],
+            "processed_at": "2026-01-01T00:00:00",
+        },
+        "reports_تقرير الدراسة الهيدرولوجية": {
+            "file_path": "Reports/تقرير الدراسة الهيدرولوجية.pdf",
+            "type": "reports",
+            "format": ".pdf",
+            "segments": {"Content": "مخرات السيول"},
+            "tables": [{"page": 1, "rows": 1, "columns": 2, "data": [["a", "b"]]}],
+            "processed_at": "2026-01-01T00:00:00",
+        },
+    }
+
+
+# Tests for the sharded store
+def test_store_round_trip(temp_dir, sample_kb):
+    """Test that documents written to the store load back unchanged and in order."""
+    store = doc_pipeline.KnowledgeBaseStore(os.path.join(temp_dir, "kb_store"))
+    store.write_documents(sample_kb)
+
+    reopened = doc_pipeline.KnowledgeBaseStore(os.path.join(temp_dir, "kb_store"))
+    assert reopened.load_all() == sample_kb
+    assert reopened.document_ids() == list(sample_kb.keys())
+    assert len(os.listdir(reopened.documents_dir)) == len(sample_kb)
+
+
+def test_store_manifest_summarizes_documents(temp_dir, sample_kb):
+    """Test that the manifest carries file paths so overviews skip the shards."""
+    store = doc_pipeline.KnowledgeBaseStore(os.path.join(temp_dir, "kb_store"))
+    store.write_documents(sample_kb)
+
+    summaries = store.summaries()
+    assert summaries["proposals_Ras ElHekma Tech."]["file_path"] == "proposals/Ras ElHekma Tech.docx"
+    assert summaries["reports_تقرير الدراسة الهيدرولوجية"]["format"] == ".pdf"
+
+
+def test_store_only_rewrites_changed_documents(temp_dir, sample_kb):
+    """Test that incremental writes skip documents whose content did not change."""
+    store = doc_pipeline.KnowledgeBaseStore(os.path.join(temp_dir, "kb_store"))
+    assert store.write_documents(sample_kb) == 3
+
+    sample_kb["proposals_Ras ElHekma Tech."]["segments"]["Introduction"] = "Updated"
+
+    assert store.write_documents(sample_kb) == 1
+    assert store.load_document("proposals_Ras ElHekma Tech.")["segments"]["Introduction"] == "Updated"
+
+
+def test_store_replace_all_removes_stale_documents(temp_dir, sample_kb):
+    """Test that replacing the store contents drops documents no longer present."""
+    store = doc_pipeline.KnowledgeBaseStore(os.path.join(temp_dir, "kb_store"))
+    store.write_documents(sample_kb)
+    del sample_kb["proposals_Ras ElHekma Tech."]
+
+    written, removed = store.replace_all(sample_kb)
+
+    assert (written, removed) == (0, 1)
+    assert store.load_all() == sample_kb
+    assert len(os.listdir(store.documents_dir)) == 2
+
+
+def test_store_export_matches_legacy_json(temp_dir, sample_kb):
+    """Test that the compatibility export is byte-identical to atomic_save_json."""
+    store = doc_pipeline.KnowledgeBaseStore(os.path.join(temp_dir, "kb_store"))
+    store.write_documents(sample_kb)
+    legacy_path = os.path.join(temp_dir, "legacy.json")
+    exported_path = os.path.join(temp_dir, "exported.json")
+
+    doc_pipeline.atomic_save_json(sample_kb, legacy_path)
+    store.export_legacy_json(exported_path)
+
+    with open(legacy_path, encoding="utf-8") as legacy, open(exported_path, encoding="utf-8") as exported:
+        assert exported.read() == legacy.read()
+
+
+def test_store_imports_legacy_json(temp_dir, sample_kb):
+    """Test that a legacy knowledge_base.json seeds the store."""
+    legacy_path = os.path.join(temp_dir, "knowledge_base.json")
+    with open(legacy_path, "w", encoding="utf-8") as f:
+        json.dump(sample_kb, f, ensure_ascii=False)
+
+    store = doc_pipeline.KnowledgeBaseStore(os.path.join(temp_dir, "kb_store"))
+    store.import_legacy_json(legacy_path)
+
+    assert store.load_all() == sample_kb
+
+
+def test_rollback_into_store(temp_dir, sample_kb):
+    """Test that rolling back a store only rewrites differing documents."""
+    store = doc_pipeline.KnowledgeBaseStore(os.path.join(temp_dir, "kb_store"))
+    snapshot_path = os.path.join(temp_dir, "snapshot.json")
+    with open(snapshot_path, "w", encoding="utf-8") as f:
+        json.dump(sample_kb, f, ensure_ascii=False)
+
+    changed = json.loads(json.dumps(sample_kb))
+    changed["reports_تقرير الدراسة الهيدرولوجية"]["segments"]["Content"] = "changed"
+    store.write_documents(changed)
+
+    assert doc_pipeline.rollback_to_snapshot(snapshot_path, store=store)
+    assert store.load_all() == sample_kb
+
+
+# Tests for content-addressed snapshots
+@pytest.fixture
+def ticking_clock(monkeypatch):
+    """Advance datetime.now() by one minute per call so snapshot names never collide."""
+    from datetime import datetime, timedelta
+
+    start = datetime(2026, 1, 1, 12, 0, 0)
+    calls = []
+
+    class TickingDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            calls.append(None)
+            return start + timedelta(minutes=len(calls))
+
+    monkeypatch.setattr(doc_pipeline, "datetime", TickingDatetime)
+
+
+def _object_count(snapshot_dir):
+    return sum(len(files) for _, _, files in os.walk(os.path.join(snapshot_dir, "objects")))
+
+
+def test_snapshots_store_unchanged_documents_once(temp_dir, sample_kb, ticking_clock):
+    """Test that a second snapshot only adds blobs for documents that changed."""
+    snapshot_dir = os.path.join(temp_dir, "snapshots")
+    first = doc_pipeline.create_snapshot(sample_kb, snapshot_dir)
+    sample_kb["proposals_Ras ElHekma Tech."]["segments"]["Introduction"] = "Updated"
+    second = doc_pipeline.create_snapshot(sample_kb, snapshot_dir)
+
+    assert first != second
+    assert _object_count(snapshot_dir) == len(sample_kb) + 1
+
+
+def test_list_snapshots_counts_documents_without_blobs(
+    temp_dir, sample_kb, ticking_clock, monkeypatch
+):
+    """Test that snapshot listings read document counts from manifests only."""
+    snapshot_dir = os.path.join(temp_dir, "snapshots")
+    doc_pipeline.create_snapshot(sample_kb, snapshot_dir)
+    monkeypatch.setattr(
+        doc_pipeline.SnapshotObjectStore, "get", lambda self, content_hash: pytest.fail()
+    )
+
+    snapshots = doc_pipeline.list_snapshots(snapshot_dir)
+
+    assert [snap["documents"] for snap in snapshots] == [3]
+
+
+def test_rollback_manifest_snapshot_to_json(temp_dir, sample_kb, ticking_clock, monkeypatch):
+    """Test that rollback restores the snapshot, decoding only documents that differ."""
+    snapshot_dir = os.path.join(temp_dir, "snapshots")
+    snapshot = doc_pipeline.create_snapshot(sample_kb, snapshot_dir)
+    target = os.path.join(temp_dir, "knowledge_base.json")
+    changed = json.loads(json.dumps(sample_kb))
+    changed["reports_تقرير الدراسة الهيدرولوجية"]["segments"]["Content"] = "changed"
+    changed["proposals_extra"] = {"file_path": "extra.docx"}
+    doc_pipeline.atomic_save_json(changed, target)
+
+    decoded = []
+    original_get = doc_pipeline.SnapshotObjectStore.get
+
+    def counting_get(self, content_hash):
+        decoded.append(content_hash)
+        return original_get(self, content_hash)
+
+    monkeypatch.setattr(doc_pipeline.SnapshotObjectStore, "get", counting_get)
+
+    assert doc_pipeline.rollback_to_snapshot(snapshot, target_path=target)
+    assert doc_pipeline.load_knowledge_base(target) == sample_kb
+    assert len(decoded) == 1
+
+
+def test_rollback_manifest_snapshot_into_store(temp_dir, sample_kb, ticking_clock):
+    """Test that a store rollback rewrites only differing shards and keeps snapshot order."""
+    store = doc_pipeline.KnowledgeBaseStore(os.path.join(temp_dir, "kb_store"))
+    store.write_documents(sample_kb)
+    snapshot = doc_pipeline.create_snapshot({}, os.path.join(temp_dir, "snapshots"), store=store)
+
+    changed = json.loads(json.dumps(sample_kb))
+    del changed["knowledge_base"]
+    changed["proposals_Ras ElHekma Tech."]["segments"]["Introduction"] = "Updated"
+    changed["proposals_extra"] = {"file_path": "extra.docx"}
+    store.replace_all(changed)
+
+    assert doc_pipeline.rollback_to_snapshot(snapshot, store=store)
+    assert store.document_ids() == list(sample_kb.keys())
+    assert store.load_all() == sample_kb
@@ -0,0 +1,965 @@
+"""Unit tests for OCR helpers (Tesseract calls are mocked)."""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import doc_pipeline
+
+
+def make_ocr_data(words, confidence):
+    """Build an image_to_data style dict with one word per entry on a few lines."""
+    data = {
+        "text": [],
+        "conf": [],
+        "block_num": [],
+        "par_num": [],
+        "line_num": [],
+        "left": [],
+        "top": [],
+        "width": [],
+        "height": [],
+    }
+    for idx, word in enumerate(words):
+        data["text"].append(word)
+        data["conf"].append(confidence)
+        data["block_num"].append(1)
+        data["par_num"].append(1)
+        data["line_num"].append(idx // 5)
+        data["left"].append((idx % 5) * 60)
+        data["top"].append((idx // 5) * 20)
+        data["width"].append(50)
+        data["height"].append(15)
+    return data
+
+
+def ocr_content(segments):
+    """Join the text of every section of an extraction result."""
+    return "\n".join(text for section, text in segments.items() if section != "_metadata")
+
+
+# Fixtures
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+@pytest.fixture(autouse=True)
+def isolated_ocr_cache(temp_dir, monkeypatch):
+    """Give every test its own OCR cache database."""
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_CACHE_PATH", os.path.join(temp_dir, "ocr.db"))
+    monkeypatch.setattr(doc_pipeline, "_ocr_cache", None)
+    yield
+    if doc_pipeline._ocr_cache is not None:
+        doc_pipeline._ocr_cache.close()
+
+
+@pytest.fixture(autouse=True)
+def pytesseract_backend(monkeypatch):
+    """OCR through pytesseract, whose calls the tests mock."""
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_BACKEND", "pytesseract")
+    monkeypatch.setattr(doc_pipeline, "_ocr_backend", None)
+
+
+@pytest.fixture
+def page_image():
+    """Blank page image to hand to the (mocked) OCR engine."""
+    img = Image.new("RGB", (200, 200), "white")
+    yield img
+    img.close()
+
+
+@pytest.fixture
+def mock_tesseract(monkeypatch):
+    """Replace image_to_data with a per-PSM canned response and record calls."""
+    calls = []
+    responses = {}
+
+    def fake_image_to_data(image, lang=None, config="", output_type=None):
+        psm = int(config.split("--psm")[1].split()[0])
+        calls.append(psm)
+        return responses[psm]
+
+    monkeypatch.setattr(doc_pipeline.pytesseract, "image_to_data", fake_image_to_data)
+    return calls, responses
+
+
+@pytest.fixture
+def scanned_pdf(temp_dir):
+    """Create an image-only PDF with two pages."""
+    import fitz
+
+    pdf_path = os.path.join(temp_dir, "scanned.pdf")
+    img_path = os.path.join(temp_dir, "page.png")
+    Image.new("RGB", (400, 400), "white").save(img_path)
+    doc = fitz.open()
+    for _ in range(2):
+        page = doc.new_page()
+        page.insert_image(page.rect, filename=img_path)
+    doc.save(pdf_path)
+    doc.close()
+    return pdf_path
+
+
+# Tests for OCR data summarization
+def test_summarize_ocr_data_rebuilds_lines():
+    """Test that words are regrouped into lines and scored."""
+    data = make_ocr_data([f"word{i}" for i in range(7)], 90)
+    data["text"].append("")
+    data["conf"].append(-1)
+    for key in ("block_num", "par_num", "line_num", "left", "top", "width", "height"):
+        data[key].append(0)
+
+    summary = doc_pipeline._summarize_ocr_data(data)
+
+    assert summary["text"] == "word0 word1 word2 word3 word4\nword5 word6"
+    assert summary["word_count"] == 7
+    assert summary["confidence"] == 90
+    assert summary["coverage"] == 1.0
+
+
+# Tests for adaptive retry
+def test_retry_ocr_page_stops_after_confident_mode(mock_tesseract, page_image):
+    """Test that a confident first pass skips the remaining PSM modes."""
+    calls, responses = mock_tesseract
+    responses[6] = make_ocr_data(["clean"] * 20, 95)
+
+    result = doc_pipeline.retry_ocr_page(0, page_image, return_details=True)
+
+    assert calls == [6]
+    assert result["psm"] == 6
+    assert result["confidence"] == 95
+    assert result["attempts"] == 1
+
+
+def test_retry_ocr_page_retries_low_confidence(mock_tesseract, page_image):
+    """Test that low-confidence passes fall through to the next PSM mode."""
+    calls, responses = mock_tesseract
+    responses[6] = make_ocr_data(["noisy"] * 20, 30)
+    responses[3] = make_ocr_data(["clean"] * 20, 92)
+
+    result = doc_pipeline.retry_ocr_page(0, page_image, return_details=True)
+
+    assert calls == [6, 3]
+    assert result["psm"] == 3
+    assert "clean" in result["text"]
+
+
+def test_retry_ocr_page_keeps_best_when_no_mode_is_confident(mock_tesseract, page_image):
+    """Test that the most confidently recognized attempt wins when none clears the bar."""
+    calls, responses = mock_tesseract
+    responses[6] = make_ocr_data(["short"] * 5, 65)
+    responses[3] = make_ocr_data(["longer"] * 30, 65)
+    responses[1] = make_ocr_data(["garbage"] * 30, 20)
+
+    result = doc_pipeline.retry_ocr_page(0, page_image, min_coverage=1.1, return_details=True)
+
+    assert calls == [6, 3, 1]
+    assert result["psm"] == 3
+    assert result["attempts"] == 3
+
+
+def test_retry_ocr_page_returns_text_by_default(mock_tesseract, page_image):
+    """Test backwards-compatible string return value."""
+    calls, responses = mock_tesseract
+    responses[6] = make_ocr_data(["clean"] * 20, 95)
+
+    assert isinstance(doc_pipeline.retry_ocr_page(0, page_image), str)
+
+
+def test_extract_pdf_with_ocr_reports_winning_mode(mock_tesseract, scanned_pdf, monkeypatch):
+    """Test that the winning PSM mode and confidence end up in segment metadata."""
+    calls, responses = mock_tesseract
+    responses[6] = make_ocr_data(["hydrology"] * 40, 88)
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+
+    result = doc_pipeline.extract_pdf_with_ocr(scanned_pdf)
+
+    assert "Error" not in result
+    metadata = result["_metadata"]
+    assert metadata["mean_confidence"] == 88
+    assert [page["psm"] for page in metadata["ocr_pages"]] == [6, 6]
+    assert [page["page"] for page in metadata["ocr_pages"]] == [1, 2]
+
+
+# Tests for OCR quality scoring
+def test_count_ocr_text_classifies_characters():
+    """Test that one translate pass yields whitespace, Latin, Arabic and digit counts."""
+    counts = doc_pipeline.count_ocr_text(" Flow 25 m3/s تصريف\n")
+
+    assert counts["chars"] == 20
+    assert counts["non_space"] == 15
+    assert counts["stripped_chars"] == 18
+    assert (counts["latin"], counts["arabic"], counts["digits"]) == (6, 5, 3)
+    assert counts["words"] == 4
+
+
+def test_validate_ocr_quality_keeps_document_thresholds(temp_dir):
+    """Test that the document gate gives the same verdicts as before."""
+    path = os.path.join(temp_dir, "doc.pdf")
+
+    good = "Hydrological study of the catchment area " * 5
+    assert doc_pipeline.validate_ocr_quality(good, path) == (True, 100, [])
+
+    valid, score, issues = doc_pipeline.validate_ocr_quality("12 34", path)
+    assert (valid, score, len(issues)) == (False, 10, 3)
+
+    counts = doc_pipeline.count_ocr_text(good)
+    assert doc_pipeline.validate_ocr_quality("", path, counts=counts) == (True, 100, [])
+
+
+def test_score_ocr_page_rejects_symbol_noise():
+    """Test that pages of OCR noise are rejected while short real text is kept."""
+    assert doc_pipeline.score_ocr_page("|| ~~ ;; ,, .. -- __ || ~~ ;;")["rejected"]
+    assert doc_pipeline.score_ocr_page("")["rejected"]
+    assert not doc_pipeline.score_ocr_page("دراسة هيدرولوجية لمنطقة المشروع")["rejected"]
+    assert not doc_pipeline.score_ocr_page("Table 4: peak flows 120 m3/s")["rejected"]
+
+
+def test_retry_ocr_page_does_not_accept_confident_garbage(mock_tesseract, page_image):
+    """Test that a confident but garbage attempt neither stops retries nor wins."""
+    calls, responses = mock_tesseract
+    responses[6] = make_ocr_data(["|~;"] * 20, 95)
+    responses[3] = make_ocr_data(["culvert"] * 20, 70)
+    responses[1] = make_ocr_data(["~~"] * 40, 99)
+
+    result = doc_pipeline.retry_ocr_page(0, page_image, return_details=True)
+
+    assert calls == [6, 3, 1]
+    assert result["psm"] == 3
+    assert not result["rejected"]
+    assert result["quality_score"] == 100
+
+
+@pytest.fixture
+def paged_tesseract(monkeypatch):
+    """Return canned image_to_data output per call, cycling through PSM modes per page."""
+    pages = []
+
+    def fake_image_to_data(image, lang=None, config="", output_type=None):
+        return pages.pop(0)
+
+    monkeypatch.setattr(doc_pipeline.pytesseract, "image_to_data", fake_image_to_data)
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_CACHE_ENABLED", False)
+    return pages
+
+
+def test_extract_pdf_with_ocr_drops_rejected_pages(paged_tesseract, scanned_pdf):
+    """Test that garbage pages are left out of the text and listed for retry."""
+    garbage = make_ocr_data(["|~;"] * 20, 40)
+    paged_tesseract.extend([make_ocr_data(["rainfall"] * 40, 90), garbage, garbage, garbage])
+
+    result = doc_pipeline.extract_pdf_with_ocr(scanned_pdf)
+
+    assert "Error" not in result
+    assert "rainfall" in ocr_content(result)
+    assert "|~;" not in ocr_content(result)
+    metadata = result["_metadata"]
+    assert metadata["rejected_pages"] == [2]
+    assert metadata["page_methods"] == [
+        {"start": 1, "end": 1, "method": "ocr"},
+        {"start": 2, "end": 2, "method": "ocr_rejected"},
+    ]
+    assert [page["quality_score"] for page in metadata["ocr_pages"]] == [100, 50]
+
+
+def test_extract_pdf_with_ocr_keeps_long_documents_in_full(paged_tesseract, scanned_pdf):
+    """Test that OCR text is segmented and spooled, never cut to a preview length."""
+    paged_tesseract.extend(
+        [make_ocr_data(["hydrology"] * 1500, 90), make_ocr_data(["catchment"] * 1500, 90)]
+    )
+
+    result = doc_pipeline.extract_pdf_with_ocr(scanned_pdf, memory_limit=2000)
+    content = ocr_content(result)
+
+    assert "Error" not in result
+    assert len(content) > 10000
+    assert content.count("hydrology") == 1500
+    assert content.count("catchment") == 1500
+    assert result["_metadata"]["total_chars"] == len("hydrology " * 1500) + len("catchment " * 1500) - 2
+
+
+def test_ocr_pdf_pages_retries_only_requested_pages(paged_tesseract, scanned_pdf):
+    """Test that single pages can be re-OCRed without touching the rest of the file."""
+    paged_tesseract.append(make_ocr_data(["recovered"] * 10, 92))
+
+    results = doc_pipeline.ocr_pdf_pages(scanned_pdf, [2, 7], psm_modes=[4])
+
+    assert set(results) == {2, 7}
+    assert results[7] is None
+    assert results[2]["psm"] == 4
+    assert "recovered" in results[2]["text"]
+    assert paged_tesseract == []
+
+
+# Tests for tiered-DPI OCR
+@pytest.fixture
+def tiered_tesseract(monkeypatch):
+    """Answer image_to_data by render size: poor text at the fast DPI, good text above it."""
+    calls = []
+
+    def fake_image_to_data(image, lang=None, config="", output_type=None):
+        psm = int(config.split("--psm")[1].split()[0])
+        calls.append((image.width, image.mode, psm))
+        if image.width > 1000:  # Letter-size page rendered above ~120 DPI
+            return make_ocr_data(["catchment"] * 30, 93)
+        return make_ocr_data(["catchrnent"] * 30, fast_confidence[0])
+
+    fast_confidence = [55]
+    monkeypatch.setattr(doc_pipeline.pytesseract, "image_to_data", fake_image_to_data)
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_CACHE_ENABLED", False)
+    return calls, fast_confidence
+
+
+def test_low_confidence_pages_are_redone_at_high_dpi(tiered_tesseract, scanned_pdf):
+    """Poor fast-pass pages are re-rendered at OCR_HIGH_DPI and the better text is kept."""
+    calls, _ = tiered_tesseract
+
+    result = doc_pipeline.extract_pdf_with_ocr(scanned_pdf)
+
+    assert "catchment" in ocr_content(result)
+    assert "catchrnent" not in ocr_content(result)
+    metadata = result["_metadata"]
+    assert metadata["high_dpi_pages"] == [1, 2]
+    assert [page["dpi"] for page in metadata["ocr_pages"]] == [200, 200]
+
+    fast_calls = [call for call in calls if call[0] < 1000]
+    # The fast pass tries one PSM mode per page, in grayscale
+    assert [psm for _, _, psm in fast_calls] == [doc_pipeline.CONFIG["OCR_PSM_MODES"][0]] * 2
+    assert {mode for _, mode, _ in calls} == {"L"}
+
+
+def test_confident_pages_skip_the_high_dpi_pass(tiered_tesseract, scanned_pdf, monkeypatch):
+    """Pages read confidently at the fast DPI are OCRed once."""
+    calls, fast_confidence = tiered_tesseract
+    fast_confidence[0] = 90
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_COLORSPACE", "rgb")
+
+    result = doc_pipeline.extract_pdf_with_ocr(scanned_pdf)
+
+    assert result["_metadata"]["high_dpi_pages"] == []
+    assert [page["dpi"] for page in result["_metadata"]["ocr_pages"]] == [72, 72]
+    assert len(calls) == 2
+    assert {mode for _, mode, _ in calls} == {"RGB"}
+
+
+# Tests for per-page script detection
+@pytest.fixture
+def script_tesseract(monkeypatch):
+    """Mock OSD and OCR, recording the language each OCR call used."""
+    osd_results = []
+    ocr_langs = []
+
+    def fake_image_to_osd(image, config="", output_type=None):
+        result = osd_results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def fake_image_to_data(image, lang=None, config="", output_type=None):
+        ocr_langs.append(lang)
+        return make_ocr_data(["drainage"] * 30, 90)
+
+    monkeypatch.setattr(doc_pipeline.pytesseract, "image_to_osd", fake_image_to_osd)
+    monkeypatch.setattr(doc_pipeline.pytesseract, "image_to_data", fake_image_to_data)
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+    return osd_results, ocr_langs
+
+
+def test_monolingual_pages_use_single_language_models(script_tesseract, scanned_pdf, monkeypatch):
+    """Confidently detected scripts pick ara or eng; weak detections keep ara+eng."""
+    osd_results, ocr_langs = script_tesseract
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_CACHE_ENABLED", False)
+    osd_results.extend([
+        {"script": "Arabic", "script_conf": 6.2},
+        {"script": "Latin", "script_conf": 0.4},
+    ])
+
+    result = doc_pipeline.extract_pdf_with_ocr(scanned_pdf)
+
+    assert ocr_langs == ["ara", "ara+eng"]
+    assert [page["lang"] for page in result["_metadata"]["ocr_pages"]] == ["ara", "ara+eng"]
+
+
+def test_script_decision_is_cached_with_the_page(script_tesseract, scanned_pdf):
+    """A second run reuses the cached script decision without running OSD."""
+    osd_results, ocr_langs = script_tesseract
+    # Both pages render identically, so one detection covers them
+    osd_results.append({"script": "Latin", "script_conf": 9.0})
+
+    doc_pipeline.extract_pdf_with_ocr(scanned_pdf)
+    second = doc_pipeline.extract_pdf_with_ocr(scanned_pdf)
+
+    assert osd_results == []
+    assert [page["lang"] for page in second["_metadata"]["ocr_pages"]] == ["eng", "eng"]
+
+
+def test_missing_osd_model_falls_back_to_all_languages(script_tesseract, scanned_pdf, monkeypatch):
+    """When OSD is unavailable it is tried once and every page uses OCR_LANG."""
+    osd_results, ocr_langs = script_tesseract
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_CACHE_ENABLED", False)
+    osd_results.append(doc_pipeline.pytesseract.TesseractError(1, "Failed loading language 'osd'"))
+
+    doc_pipeline.extract_pdf_with_ocr(scanned_pdf)
+
+    assert osd_results == []
+    assert ocr_langs == ["ara+eng", "ara+eng"]
+
+
+def test_high_dpi_retry_uses_all_languages(script_tesseract, scanned_pdf, monkeypatch):
+    """A page misread with a single-language model is retried with both models."""
+    osd_results, ocr_langs = script_tesseract
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_CACHE_ENABLED", False)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_HIGH_DPI_MIN_CONFIDENCE", 95)
+    osd_results.extend([{"script": "Arabic", "script_conf": 8.0}] * 2)
+
+    doc_pipeline.extract_pdf_with_ocr(scanned_pdf)
+
+    # Per page: fast pass with the detected model, then the high-DPI retry with both
+    assert ocr_langs == ["ara", "ara+eng"] * 2
+
+
+# Tests for the persistent OCR cache
+def test_ocr_cache_round_trip(temp_dir):
+    """Test that stored results come back and hits/misses are counted."""
+    cache = doc_pipeline.OCRResultCache(os.path.join(temp_dir, "cache.db"))
+    key = cache.make_key("abc", "ara+eng", 6, 72)
+
+    assert cache.get(key) is None
+    cache.put(key, {"text": ["مرحبا", "hello"]})
+
+    assert cache.get(key) == {"text": ["مرحبا", "hello"]}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    cache.close()
+
+
+def test_ocr_cache_key_depends_on_ocr_settings():
+    """Test that language, PSM and DPI all change the cache key."""
+    base = doc_pipeline.OCRResultCache.make_key("abc", "ara+eng", 6, 72)
+
+    assert base != doc_pipeline.OCRResultCache.make_key("abc", "eng", 6, 72)
+    assert base != doc_pipeline.OCRResultCache.make_key("abc", "ara+eng", 3, 72)
+    assert base != doc_pipeline.OCRResultCache.make_key("abc", "ara+eng", 6, 300)
+
+
+def test_ocr_cache_evicts_least_recently_used(temp_dir):
+    """Test size-based eviction drops the least recently used entries first."""
+    cache = doc_pipeline.OCRResultCache(os.path.join(temp_dir, "cache.db"), max_bytes=250)
+    payload = {"text": "x" * 80}
+
+    cache.put("first", payload)
+    time.sleep(0.01)
+    cache.put("second", payload)
+    time.sleep(0.01)
+    cache.get("first")  # Touch so "second" becomes least recently used
+    time.sleep(0.01)
+    cache.put("third", payload)
+
+    assert cache.get("second") is None
+    assert cache.get("first") == payload
+    assert cache.get("third") == payload
+    cache.close()
+
+
+def test_ocr_cache_replacing_an_entry_keeps_size_accurate(temp_dir):
+    """Test overwriting a key swaps its size in the running total instead of adding to it."""
+    cache = doc_pipeline.OCRResultCache(os.path.join(temp_dir, "cache.db"), max_bytes=10000)
+
+    cache.put("page", {"text": "x" * 80})
+    cache.put("page", {"text": "x" * 80})
+    cache.put("page", {"text": "x" * 40})
+
+    assert cache.stats()["entries"] == 1
+    assert cache._total_bytes == cache.stats()["size_bytes"]
+    cache.close()
+
+
+def test_reprocessing_scanned_pdf_skips_tesseract(mock_tesseract, scanned_pdf, monkeypatch):
+    """Test that a second OCR run over the same PDF is served from the cache."""
+    calls, responses = mock_tesseract
+    responses[6] = make_ocr_data(["hydrology"] * 40, 88)
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+
+    first = doc_pipeline.extract_pdf_with_ocr(scanned_pdf)
+    calls_after_first = len(calls)
+    second = doc_pipeline.extract_pdf_with_ocr(scanned_pdf)
+
+    assert calls_after_first > 0
+    assert len(calls) == calls_after_first
+    assert ocr_content(second) == ocr_content(first)
+    assert second["_metadata"]["ocr_cache"]["misses"] == 0
+
+
+# Tests for single-pass PDF processing
+def test_process_pdf_document_renders_each_page_once(mock_tesseract, scanned_pdf, monkeypatch):
+    """Test that OCR text extraction and OCR table detection share page renders."""
+    import fitz
+
+    calls, responses = mock_tesseract
+    responses[6] = make_ocr_data(["hydrology"] * 40, 88)
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+    monkeypatch.setattr(
+        doc_pipeline.pytesseract, "image_to_string", lambda *args, **kwargs: "no table here"
+    )
+
+    rendered = []
+    original_get_pixmap = fitz.Page.get_pixmap
+
+    def counting_get_pixmap(page, *args, **kwargs):
+        rendered.append(page.number)
+        return original_get_pixmap(page, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Page, "get_pixmap", counting_get_pixmap)
+
+    result = doc_pipeline.process_pdf_document(scanned_pdf)
+
+    assert "Error" not in result
+    assert "Content" in result["segments"]
+    assert result["tables"] == []
+    assert sorted(rendered) == [0, 1]
+
+
+# Tests for bounding-box OCR table reconstruction
+TABLE_ROWS = [
+    ["Item", "Quantity", "Rate"],
+    ["Culvert pipe", "12", "450"],
+    ["Manhole cover", "", "900"],
+    ["Gravel bedding", "30", "25"],
+]
+
+
+def make_table_ocr_data(rows=TABLE_ROWS, confidence=90):
+    """Build image_to_data output for a paragraph, a grid table and a closing line."""
+    words = [("Drainage", 0, 0), ("works", 70, 0), ("schedule", 130, 0)]
+    for row_idx, row in enumerate(rows):
+        for col_idx, cell in enumerate(row):
+            for word_idx, word in enumerate(cell.split()):
+                words.append((word, col_idx * 200 + word_idx * 70, 40 + row_idx * 25))
+    words += [("Prices", 0, 200), ("exclude", 70, 200), ("tax", 140, 200)]
+
+    data = make_ocr_data([word for word, _, _ in words], confidence)
+    data["left"] = [left for _, left, _ in words]
+    data["top"] = [top for _, _, top in words]
+    data["line_num"] = [top // 20 for _, _, top in words]
+    return data
+
+
+def test_reconstruct_ocr_tables_rebuilds_grid():
+    """Test that word boxes are grouped into rows, cells and aligned columns."""
+    tables = doc_pipeline.reconstruct_ocr_tables(make_table_ocr_data())
+
+    assert tables == [{"rows": 4, "columns": 3, "data": TABLE_ROWS}]
+
+
+def test_reconstruct_ocr_tables_ignores_running_text():
+    """Test that evenly spaced body text and short multi-cell runs are not tables."""
+    assert doc_pipeline.reconstruct_ocr_tables(make_ocr_data(["hydrology"] * 40, 88)) == []
+    assert doc_pipeline.reconstruct_ocr_tables(make_table_ocr_data(TABLE_ROWS[:2])) == []
+    assert doc_pipeline.reconstruct_ocr_tables({"text": [], "conf": []}) == []
+
+
+def test_reconstruct_ocr_tables_is_resolution_independent():
+    """Test that scaling every box (a higher render DPI) gives the same table."""
+    data = make_table_ocr_data()
+    scaled = dict(data, **{key: [v * 3 for v in data[key]] for key in ("left", "top", "width", "height")})
+
+    assert doc_pipeline.reconstruct_ocr_tables(scaled) == doc_pipeline.reconstruct_ocr_tables(data)
+
+
+def test_process_pdf_document_reuses_text_ocr_for_tables(mock_tesseract, scanned_pdf, monkeypatch):
+    """Test that OCR table detection reuses the word boxes of the text OCR pass."""
+    calls, responses = mock_tesseract
+    responses[6] = make_table_ocr_data()
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_CACHE_ENABLED", False)
+
+    result = doc_pipeline.process_pdf_document(scanned_pdf)
+
+    assert "Error" not in result
+    assert calls == [6, 6]
+    assert [table["page"] for table in result["tables"]] == [1, 2]
+    assert result["tables"][0] == {
+        "page": 1,
+        "rows": 4,
+        "columns": 3,
+        "data": TABLE_ROWS,
+        "method": "ocr_fallback",
+    }
+
+
+def test_detect_tables_with_ocr_reuses_cached_ocr_data(mock_tesseract, scanned_pdf, monkeypatch):
+    """Test that table detection without a shared context is served from the OCR cache."""
+    calls, responses = mock_tesseract
+    responses[6] = make_table_ocr_data()
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+
+    doc_pipeline.extract_pdf_with_ocr(scanned_pdf)
+    calls_after_text = len(calls)
+    tables = doc_pipeline.detect_tables_with_ocr(scanned_pdf)
+
+    assert len(calls) == calls_after_text
+    assert [table["data"] for table in tables] == [TABLE_ROWS, TABLE_ROWS]
+
+
+# Tests for per-page text/OCR routing
+@pytest.fixture
+def hybrid_pdf(temp_dir):
+    """Create a PDF with a scanned cover, two text pages and a scanned appendix."""
+    import fitz
+
+    pdf_path = os.path.join(temp_dir, "hybrid.pdf")
+    img_path = os.path.join(temp_dir, "scan.png")
+    Image.new("RGB", (400, 400), "white").save(img_path)
+    doc = fitz.open()
+    for page_idx in range(4):
+        page = doc.new_page()
+        if page_idx in (0, 3):
+            page.insert_image(page.rect, filename=img_path)
+        else:
+            page.insert_text((72, 72), f"{page_idx}. Drainage Design Chapter")
+            for line_idx in range(6):
+                page.insert_text(
+                    (72, 100 + line_idx * 16), f"Culvert sizing notes line {line_idx} page {page_idx + 1}"
+                )
+    doc.save(pdf_path)
+    doc.close()
+    return pdf_path
+
+
+def test_classify_pdf_page_uses_text_density_and_image_coverage(hybrid_pdf, temp_dir):
+    """Test that only sparse, image-covered pages are routed to OCR."""
+    import fitz
+
+    with fitz.open(hybrid_pdf) as doc:
+        methods = [doc_pipeline.classify_pdf_page(page)[0] for page in doc]
+        blank = doc.new_page()
+        assert doc_pipeline.classify_pdf_page(blank) == ("text", "")
+
+    assert methods == ["ocr", "text", "text", "ocr"]
+
+
+def test_extract_pdf_segments_ocrs_only_image_pages(mock_tesseract, hybrid_pdf, monkeypatch):
+    """Test that a text PDF with scanned pages OCRs just those pages."""
+    calls, responses = mock_tesseract
+    responses[6] = make_ocr_data(["appendix"] * 20, 90)
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_CACHE_ENABLED", False)  # Both scans are identical
+
+    result = doc_pipeline.extract_pdf_segments(hybrid_pdf)
+
+    assert calls == [6, 6]
+    assert "Culvert sizing notes line 0 page 2" in result["1. Drainage Design Chapter"]
+    assert "appendix" in result["Content"]
+    assert "appendix" in result["2. Drainage Design Chapter"]
+    metadata = result["_metadata"]
+    assert metadata["extraction_method"] == "hybrid"
+    assert metadata["page_methods"] == [
+        {"start": 1, "end": 1, "method": "ocr"},
+        {"start": 2, "end": 3, "method": "text"},
+        {"start": 4, "end": 4, "method": "ocr"},
+    ]
+    assert [page["page"] for page in metadata["ocr_pages"]] == [1, 4]
+    assert metadata["mean_confidence"] == 90
+
+
+def test_routed_pages_match_across_page_workers(mock_tesseract, hybrid_pdf, monkeypatch):
+    """Test that page-parallel routing produces the same segments and metadata."""
+    calls, responses = mock_tesseract
+    responses[6] = make_ocr_data(["appendix"] * 20, 90)
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "PAGE_PARALLEL_MIN_PAGES", 2)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "PAGE_CHUNK_SIZE", 1)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_CACHE_ENABLED", False)
+
+    sequential = doc_pipeline.extract_pdf_segments(hybrid_pdf, page_workers=1)
+    parallel = doc_pipeline.extract_pdf_segments(hybrid_pdf, page_workers=2)
+
+    assert parallel == sequential
+
+
+def test_page_workers_report_ocr_stage_time(hybrid_pdf, monkeypatch):
+    """Test that OCR run in page worker processes is recorded under the ocr stage."""
+
+    def slow_image_to_data(image, lang=None, config="", output_type=None):
+        time.sleep(0.05)
+        return make_ocr_data(["appendix"] * 20, 90)
+
+    monkeypatch.setattr(doc_pipeline.pytesseract, "image_to_data", slow_image_to_data)
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "PAGE_PARALLEL_MIN_PAGES", 2)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "PAGE_CHUNK_SIZE", 1)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_CACHE_ENABLED", False)
+
+    entry, stats = doc_pipeline.extract_document_with_stats(hybrid_pdf, "proposals", page_workers=2)
+
+    assert "appendix" in entry["segments"]["Content"]
+    # Two scanned pages, each OCRed once in a worker process
+    assert stats["stages"]["ocr"] >= 0.1
+
+
+def test_image_pages_keep_text_layer_without_ocr(hybrid_pdf, monkeypatch):
+    """Test that image-only pages are flagged, not fatal, when OCR is unavailable."""
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: False)
+
+    result = doc_pipeline.extract_pdf_segments(hybrid_pdf)
+
+    assert "Culvert sizing notes line 5 page 3" in result["2. Drainage Design Chapter"]
+    assert [run["method"] for run in result["_metadata"]["page_methods"]] == [
+        "ocr_unavailable", "text", "ocr_unavailable"
+    ]
+    assert result["_metadata"]["ocr_pages"] == []
+
+
+def test_scanned_pdf_is_routed_page_by_page(mock_tesseract, scanned_pdf, monkeypatch):
+    """Test that a PDF without any text page is routed per page and quality-gated."""
+    calls, responses = mock_tesseract
+    responses[6] = make_ocr_data(["hydrology"] * 40, 88)
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+    classified = []
+    original_classify = doc_pipeline.classify_pdf_page
+
+    def counting_classify(page):
+        classified.append(page.number)
+        return original_classify(page)
+
+    monkeypatch.setattr(doc_pipeline, "classify_pdf_page", counting_classify)
+
+    result = doc_pipeline.extract_pdf_segments(scanned_pdf)
+
+    assert classified == [0, 1]
+    assert "hydrology" in result["Content"]
+    metadata = result["_metadata"]
+    assert metadata["extraction_method"] == "ocr"
+    assert metadata["quality_score"] == 100
+    assert metadata["page_methods"] == [{"start": 1, "end": 2, "method": "ocr"}]
+
+
+def test_scanned_pages_read_the_same_with_or_without_text_pages(
+    mock_tesseract, hybrid_pdf, scanned_pdf, monkeypatch
+):
+    """Test that a scanned page's content does not depend on the document's other pages."""
+    calls, responses = mock_tesseract
+    responses[6] = make_ocr_data(["appendix"] * 3000, 90)
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+
+    scanned = doc_pipeline.extract_pdf_segments(scanned_pdf)
+    hybrid = doc_pipeline.extract_pdf_segments(hybrid_pdf)
+
+    # The scanned cover of the hybrid PDF lands in "Content" like the first scanned page
+    assert len(scanned["Content"]) > 10000
+    assert scanned["Content"].count("appendix") == 6000
+    assert hybrid["Content"].count("appendix") == 3000
+
+
+def test_scanned_pdf_fails_document_quality_gate(paged_tesseract, scanned_pdf):
+    """Test that a scanned PDF whose pages are all rejected is an error, not empty content."""
+    garbage = make_ocr_data(["|~;"] * 20, 40)
+    paged_tesseract.extend([garbage] * 8)
+
+    result = doc_pipeline.extract_pdf_segments(scanned_pdf)
+
+    assert result == {"Error": "OCR produced insufficient text content (quality gate failed)"}
+
+
+def test_scanned_pdf_without_ocr_is_an_error(scanned_pdf, monkeypatch):
+    """Test that a scanned PDF cannot be read when OCR is unavailable."""
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: False)
+
+    result = doc_pipeline.extract_pdf_segments(scanned_pdf)
+
+    assert result == {"Error": "OCR not available - cannot extract text from scanned PDF"}
+
+
+# Tests for lazy Tesseract discovery
+@pytest.fixture
+def fake_tesseract(temp_dir, monkeypatch):
+    """Point discovery at a fake executable and count version/language probes."""
+    binary = os.path.join(temp_dir, "tesseract")
+    with open(binary, "w") as f:
+        f.write("#!/bin/sh\n")
+    os.chmod(binary, 0o755)
+
+    probes = []
+
+    def fake_version():
+        probes.append("version")
+        return "5.3.0"
+
+    def fake_languages(*args, **kwargs):
+        probes.append("languages")
+        return ["ara", "eng"]
+
+    monkeypatch.setenv("TESSERACT_PATH", binary)
+    monkeypatch.setitem(
+        doc_pipeline.CONFIG, "TESSERACT_PROBE_CACHE", os.path.join(temp_dir, "probe.json")
+    )
+    monkeypatch.setattr(doc_pipeline.pytesseract, "get_tesseract_version", fake_version)
+    monkeypatch.setattr(doc_pipeline.pytesseract, "get_languages", fake_languages)
+    monkeypatch.setattr(doc_pipeline.pytesseract.pytesseract, "tesseract_cmd", "tesseract")
+    monkeypatch.setattr(doc_pipeline, "_tesseract_probe", None)
+    return binary, probes
+
+
+def test_tesseract_probe_is_lazy_and_cached(fake_tesseract, monkeypatch):
+    """Test that probing happens once and is reused from disk by later processes."""
+    binary, probes = fake_tesseract
+
+    assert doc_pipeline.is_ocr_enabled()
+    assert doc_pipeline.TESSERACT_VERSION == "5.3.0"
+    assert doc_pipeline.is_ocr_enabled()
+    assert probes == ["version", "languages"]
+
+    # A fresh process (simulated by resetting the in-memory probe) reads the disk cache
+    monkeypatch.setattr(doc_pipeline, "_tesseract_probe", None)
+    assert doc_pipeline.get_ocr_engine_info()["languages"] == ["ara", "eng"]
+    assert probes == ["version", "languages"]
+
+
+def test_tesseract_probe_refreshes_when_binary_changes(fake_tesseract, monkeypatch):
+    """Test that upgrading the binary (new mtime) invalidates the cached probe."""
+    binary, probes = fake_tesseract
+    doc_pipeline.is_ocr_enabled()
+
+    stat = os.stat(binary)
+    os.utime(binary, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    monkeypatch.setattr(doc_pipeline, "_tesseract_probe", None)
+    doc_pipeline.is_ocr_enabled()
+
+    assert probes == ["version", "languages", "version", "languages"]
+
+
+def test_import_does_not_probe_or_create_log_file(temp_dir):
+    """Test that importing the module neither shells out nor writes the log file."""
+    import subprocess
+
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import doc_pipeline; "
+        "print(doc_pipeline._tesseract_probe)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code, repo_root],
+        cwd=temp_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert output.strip().splitlines()[-1] == "None"
+    assert not os.path.exists(os.path.join(temp_dir, "document_processing.log"))
+
+
+# Tests for OCR backends
+@pytest.fixture
+def fake_tesserocr(monkeypatch):
+    """Install a minimal in-process engine module that records engine use."""
+    import types
+
+    engines = []
+
+    class FakeAPI:
+        def __init__(self, lang="eng", oem=None, path=None):
+            self.lang = lang
+            self.psm_modes = []
+            self.images = 0
+            self.ended = False
+            engines.append(self)
+
+        def SetPageSegMode(self, psm):
+            self.psm_modes.append(psm)
+
+        def SetImage(self, image):
+            self.images += 1
+
+        def Recognize(self):
+            return True
+
+        def GetTSVText(self, page_number):
+            rows = ["1\t1\t0\t0\t0\t0\t0\t0\t200\t200\t-1\t"]
+            for idx, word in enumerate(["Hydrology", "report", "for", "the", "drainage", "project"]):
+                rows.append(f"5\t1\t1\t1\t1\t{idx + 1}\t{idx * 30}\t10\t25\t12\t91.5\t{word}")
+            return "\n".join(rows) + "\n"
+
+        def GetUTF8Text(self):
+            return "Hydrology report"
+
+        def End(self):
+            self.ended = True
+
+    module = types.ModuleType("tesserocr")
+    module.PyTessBaseAPI = FakeAPI
+    module.OEM = types.SimpleNamespace(DEFAULT=3)
+    monkeypatch.setitem(sys.modules, "tesserocr", module)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_BACKEND", "auto")
+    monkeypatch.setattr(doc_pipeline, "_ocr_backend", None)
+    return engines
+
+
+def test_backend_falls_back_to_pytesseract(monkeypatch):
+    """Without tesserocr the subprocess backend is used."""
+    monkeypatch.setitem(sys.modules, "tesserocr", None)
+    assert doc_pipeline.create_ocr_backend("auto").name == "pytesseract"
+    assert doc_pipeline.create_ocr_backend("tesserocr").name == "pytesseract"
+    with pytest.raises(ImportError):
+        doc_pipeline.create_ocr_backend("tesserocr", fallback=False)
+
+
+def test_in_process_engine_is_reused_across_pages(fake_tesserocr, scanned_pdf, monkeypatch):
+    """One engine per language serves every page and PSM retry of a document."""
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_CACHE_ENABLED", False)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_MIN_CONFIDENCE", 95)  # Forces all PSM modes
+    monkeypatch.setitem(doc_pipeline.CONFIG, "OCR_HIGH_DPI", None)
+
+    result = doc_pipeline.extract_pdf_with_ocr(scanned_pdf)
+    assert "Hydrology report for the drainage project" in ocr_content(result)
+
+    assert len(fake_tesserocr) == 1
+    engine = fake_tesserocr[0]
+    assert engine.lang == doc_pipeline.CONFIG["OCR_LANG"]
+    assert engine.images == 2 * len(doc_pipeline.CONFIG["OCR_PSM_MODES"])
+    assert engine.psm_modes[:3] == doc_pipeline.CONFIG["OCR_PSM_MODES"]
+
+    doc_pipeline.close_ocr_backend()
+    assert engine.ended
+
+
+def test_in_process_data_matches_pytesseract_format(fake_tesserocr, page_image):
+    """image_to_data from the engine has pytesseract's columns and types."""
+    data = doc_pipeline.get_ocr_backend().image_to_data(page_image, "eng", 6)
+    assert data["text"][1:] == ["Hydrology", "report", "for", "the", "drainage", "project"]
+    assert data["conf"][0] == -1 and data["conf"][1] == 91
+    assert data["left"][2] == 30
+    assert doc_pipeline._summarize_ocr_data(data)["word_count"] == 6
+
+
+def test_ocr_backend_benchmark_reports_latency(temp_dir, fake_tesserocr, monkeypatch):
+    """The backend benchmark reports per-page latency for each available backend."""
+    from benchmarks import corpus, ocr_backends
+
+    monkeypatch.setattr(doc_pipeline, "is_ocr_enabled", lambda: True)
+    monkeypatch.setattr(
+        doc_pipeline.pytesseract, "image_to_data",
+        lambda *args, **kwargs: make_ocr_data(["word"] * 10, 90),
+    )
+    corpus.generate_corpus(temp_dir, seed=5, documents=1, pages=2, kinds=("scanned_pdf",))
+
+    results = ocr_backends.run_ocr_backend_benchmark(temp_dir, pages=2)
+    assert results["pages"] == 2
+    for name in ("pytesseract", "tesserocr"):
+        row = results["backends"][name]
+        assert row["pages"] == 2
+        assert row["mean_ms"] >= 0 and row["pages_per_sec"] > 0
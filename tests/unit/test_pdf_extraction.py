@@ -22,6 +22,43 @@ def temp_dir():
     shutil.rmtree(temp_path)
 
 
+@pytest.fixture
+def multipage_pdf(temp_dir):
+    """Create a text PDF whose sections and tables span several pages."""
+    import fitz
+
+    pdf_path = os.path.join(temp_dir, "multipage_report.pdf")
+    doc = fitz.open()
+    for page_idx in range(6):
+        page = doc.new_page()
+        y = 72
+        if page_idx in (0, 3):
+            page.insert_text((72, y), f"{page_idx + 1}. Hydrology Section {page_idx}")
+            y += 20
+        for line_idx in range(5):
+            page.insert_text((72, y), f"Rainfall analysis line {line_idx} on page {page_idx + 1}")
+            y += 16
+        # Simple ruled 3x3 table
+        top = 300
+        for row in range(4):
+            page.draw_line((72, top + row * 20), (372, top + row * 20))
+        for col in range(4):
+            page.draw_line((72 + col * 100, top), (72 + col * 100, top + 60))
+        for row in range(3):
+            for col in range(3):
+                page.insert_text((80 + col * 100, top + 14 + row * 20), f"P{page_idx}R{row}C{col}")
+    doc.save(pdf_path)
+    doc.close()
+    return pdf_path
+
+
+@pytest.fixture
+def small_page_ranges(monkeypatch):
+    """Make page-level parallelism kick in on small test PDFs."""
+    monkeypatch.setitem(doc_pipeline.CONFIG, "PAGE_PARALLEL_MIN_PAGES", 2)
+    monkeypatch.setitem(doc_pipeline.CONFIG, "PAGE_CHUNK_SIZE", 2)
+
+
 # Tests for PDF table extraction
 def test_extract_tables_from_pdf_uses_pdfplumber(temp_dir):
     """Test that PDF table extraction uses pdfplumber."""
@@ -309,3 +346,202 @@ def test_extract_pdf_corrupted_file(temp_dir):
 
     # Should handle gracefully
     assert isinstance(result, dict)
+
+
+# Table prefilter tests
+@pytest.fixture
+def table_layout_pdf(temp_dir):
+    """Create a PDF with a prose page, a ruled table page and an unruled aligned table page."""
+    import fitz
+
+    pdf_path = os.path.join(temp_dir, "table_layouts.pdf")
+    doc = fitz.open()
+    prose = doc.new_page()
+    for line_idx in range(20):
+        prose.insert_text((72, 72 + line_idx * 16), f"Runoff coefficients for catchment {line_idx} are given")
+
+    ruled = doc.new_page()
+    for row in range(4):
+        ruled.draw_line((72, 300 + row * 20), (372, 300 + row * 20))
+    for col in range(4):
+        ruled.draw_line((72 + col * 100, 300), (72 + col * 100, 360))
+    for row in range(3):
+        for col in range(3):
+            ruled.insert_text((80 + col * 100, 314 + row * 20), f"R{row}C{col}")
+
+    unruled = doc.new_page()
+    for row in range(5):
+        for col, cell in enumerate(("Culvert", f"{row + 1}", "m3")):
+            unruled.insert_text((72 + col * 150, 100 + row * 18), cell)
+    doc.save(pdf_path)
+    doc.close()
+    return pdf_path
+
+
+def test_table_candidate_signal_detects_rulings_and_text_grids(table_layout_pdf):
+    """Test that ruled and grid-aligned pages are candidates and prose is not."""
+    import fitz
+
+    with fitz.open(table_layout_pdf) as doc:
+        signals = [doc_pipeline.table_candidate_signal(page) for page in doc]
+
+    assert signals == [None, "rulings", "text_grid"]
+
+
+def test_extract_tables_from_pdf_skips_non_candidate_pages(table_layout_pdf, monkeypatch):
+    """Test that pdfplumber only runs on prefiltered pages unless the prefilter is off."""
+    scanned = []
+    original = doc_pipeline._extract_plumber_page_tables
+
+    def recording_extract(page, page_num):
+        scanned.append(page_num)
+        return original(page, page_num)
+
+    monkeypatch.setattr(doc_pipeline, "_extract_plumber_page_tables", recording_extract)
+
+    tables = doc_pipeline.extract_tables_from_pdf(table_layout_pdf)
+    assert scanned == [1, 2]
+    assert [table["page"] for table in tables] == [2]
+
+    scanned.clear()
+    monkeypatch.setitem(doc_pipeline.CONFIG, "TABLE_PREFILTER", False)
+    assert doc_pipeline.extract_tables_from_pdf(table_layout_pdf) == tables
+    assert scanned == [0, 1, 2]
+
+
+# Page-level parallelism tests
+def test_page_ranges_cover_document_in_order(small_page_ranges):
+    """Test that page ranges are contiguous and cover every page once."""
+    ranges = doc_pipeline._page_ranges(7, 3)
+
+    assert ranges[0][0] == 0
+    assert ranges[-1][1] == 7
+    for (_, prev_end), (next_start, _) in zip(ranges, ranges[1:]):
+        assert prev_end == next_start
+
+
+def test_extract_pdf_segments_page_workers_match_sequential(multipage_pdf, small_page_ranges):
+    """Test that splitting a PDF across processes gives the same segments."""
+    sequential = doc_pipeline.extract_pdf_segments(multipage_pdf, page_workers=1)
+    parallel = doc_pipeline.extract_pdf_segments(multipage_pdf, page_workers=3)
+
+    assert "Error" not in parallel
+    assert list(parallel.keys()) == list(sequential.keys())
+    assert parallel == sequential
+
+
+def test_extract_pdf_segments_stitches_sections_across_ranges(multipage_pdf, small_page_ranges):
+    """Test that a section continuing past a page range boundary stays in one segment."""
+    result = doc_pipeline.extract_pdf_segments(multipage_pdf, page_workers=3)
+
+    section = next(k for k in result if k.startswith("1. Hydrology"))
+    # Section starts on page 1 and continues through page 3 (ranges are 2 pages long)
+    assert "page 1" in result[section]
+    assert "page 3" in result[section]
+    assert "page 4" not in result[section]
+
+
+def test_extract_tables_from_pdf_page_workers_match_sequential(multipage_pdf, small_page_ranges):
+    """Test that page-parallel table extraction keeps tables in page order."""
+    sequential = doc_pipeline.extract_tables_from_pdf(multipage_pdf, page_workers=1)
+    parallel = doc_pipeline.extract_tables_from_pdf(multipage_pdf, page_workers=3)
+
+    assert len(sequential) == 6
+    assert parallel == sequential
+    assert [table["page"] for table in parallel] == [1, 2, 3, 4, 5, 6]
+
+
+# Single-pass processing tests
+def test_process_pdf_document_matches_separate_stages(multipage_pdf):
+    """Test that the shared single-pass context gives the same results as separate calls."""
+    result = doc_pipeline.process_pdf_document(multipage_pdf)
+
+    assert result["segments"] == doc_pipeline.extract_pdf_segments(multipage_pdf)
+    assert result["tables"] == doc_pipeline.extract_tables_from_pdf(multipage_pdf)
+
+
+def test_process_pdf_document_invalid_file(temp_dir):
+    """Test single-pass processing reports errors for unreadable PDFs."""
+    file_path = os.path.join(temp_dir, "corrupted.pdf")
+    with open(file_path, "wb") as f:
+        f.write(b"This is not a valid PDF file")
+
+    result = doc_pipeline.process_pdf_document(file_path)
+
+    assert "Error" in result
+
+
+# Bounded-memory segmentation tests
+@pytest.fixture
+def long_section_pdf(temp_dir):
+    """Create a PDF whose single section is far longer than the old 50,000 character cap."""
+    import fitz
+
+    pdf_path = os.path.join(temp_dir, "long_report.pdf")
+    doc = fitz.open()
+    for page_idx in range(40):
+        page = doc.new_page()
+        y = 40
+        if page_idx == 0:
+            page.insert_text((40, y), "1. Hydrological Analysis")
+            y += 16
+        if page_idx == 30:
+            page.insert_text((40, y), "2. Conclusions and Summary")
+            y += 16
+        while y < 800:
+            page.insert_text((40, y), f"Page {page_idx + 1} runoff coefficient line at y={y} " * 2, fontsize=7)
+            y += 9
+    doc.save(pdf_path)
+    doc.close()
+    return pdf_path
+
+
+def test_section_spool_spills_without_losing_lines(temp_dir):
+    """Test that spilled sections read back exactly as if kept in memory."""
+    with doc_pipeline.SectionSpool(memory_limit=50, spill_dir=temp_dir) as spool:
+        spool.add_section("Empty")
+        for idx in range(20):
+            spool.append("Big", f"big line {idx}")
+            if idx % 5 == 0:
+                spool.append("Small", f"small {idx}")
+
+        assert spool.spilled_sections
+        assert spool.buffered_chars <= 50
+        assert spool.sections() == ["Empty", "Big", "Small"]
+        assert spool.read("Big") == "\n".join(f"big line {idx}" for idx in range(20))
+        assert spool.read("Small") == "small 0\nsmall 5\nsmall 10\nsmall 15"
+        assert spool.read("Empty") == ""
+
+
+def test_extract_pdf_segments_never_truncates(long_section_pdf):
+    """Test that sections over 50,000 characters are kept whole."""
+    result = doc_pipeline.extract_pdf_segments(long_section_pdf)
+
+    section = result["1. Hydrological Analysis"]
+    assert len(section) > 50000
+    assert "truncated" not in section
+    assert "Page 30 runoff" in section
+    assert "Page 31 runoff" in result["2. Conclusions and Summary"]
+
+
+def test_extract_pdf_segments_memory_limit_matches_unbounded(long_section_pdf, small_page_ranges):
+    """Test that a tiny memory ceiling spills to disk but yields identical segments."""
+    unbounded = doc_pipeline.extract_pdf_segments(long_section_pdf, memory_limit=10**9)
+    bounded = doc_pipeline.extract_pdf_segments(long_section_pdf, memory_limit=4096)
+    parallel = doc_pipeline.extract_pdf_segments(long_section_pdf, memory_limit=4096, page_workers=3)
+
+    assert bounded == unbounded
+    assert parallel == unbounded
+
+
+def test_iter_pdf_segments_streams_sections(long_section_pdf, temp_dir):
+    """Test that the streaming iterator yields the same pairs as the dict API."""
+    pairs = list(doc_pipeline.iter_pdf_segments(long_section_pdf, memory_limit=4096))
+
+    assert dict(pairs) == doc_pipeline.extract_pdf_segments(long_section_pdf)
+    assert [section for section, _ in pairs][0] == "Content"
+
+    bad_path = os.path.join(temp_dir, "broken.pdf")
+    with open(bad_path, "wb") as f:
+        f.write(b"not a pdf")
+    assert list(doc_pipeline.iter_pdf_segments(bad_path))[0][0] == "Error"
@@ -0,0 +1,121 @@
+"""Unit tests for the full-text search index."""
+
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import doc_pipeline
+
+
+# Fixtures
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for test files."""
+    temp_path = tempfile.mkdtemp()
+    yield temp_path
+    shutil.rmtree(temp_path)
+
+
+@pytest.fixture
+def search_index(temp_dir):
+    """Search index backed by a temporary database."""
+    index = doc_pipeline.SearchIndex(os.path.join(temp_dir, "search.db"))
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def sample_kb():
+    """Knowledge base with English and Arabic documents."""
+    return {
+        "knowledge_base": {"hydrological": {"glossary": {"IDF": "should not be indexed"}}},
+        "proposals_Ras ElHekma": {
+            "file_path": "proposals/Ras ElHekma.docx",
+            "segments": {
+                "Methodology": "Rainfall analysis using IDF curves for the 100 year storm.",
+                "Introduction": "Hydrology study for the coastal road.",
+            },
+            "tables": [
+                {"page": 3, "data": [["Return period", "Intensity"], ["100", "42 mm/hr"]]}
+            ],
+        },
+        "reports_Manfalut": {
+            "file_path": "Reports/تقرير منفلوط.pdf",
+            "segments": {"Content": "تصميم مخرات السيول وحماية الطريق من الأمطار"},
+            "tables": [],
+        },
+    }
+
+
+# Tests for indexing and search
+def test_search_finds_segments_and_tables(search_index, sample_kb):
+    """Test that segment text and table cells are both searchable."""
+    search_index.index_documents(sample_kb)
+
+    segment_hits = search_index.search("IDF curves")
+    table_hits = search_index.search("42 mm")
+
+    assert [hit["doc_id"] for hit in segment_hits] == ["proposals_Ras ElHekma"]
+    assert segment_hits[0]["location"] == "Section: Methodology"
+    assert "[IDF]" in segment_hits[0]["snippet"]
+    assert table_hits[0]["location"] == "Table 1 (page 3)"
+
+
+def test_search_normalizes_arabic(search_index, sample_kb):
+    """Test that diacritics and alef variants do not affect matching."""
+    search_index.index_documents(sample_kb)
+
+    plain = search_index.search("مخرات السيول")
+    with_diacritics = search_index.search("مَخْرات السُّيول")
+    alef_variant = search_index.search("الامطار")
+
+    assert [hit["doc_id"] for hit in plain] == ["reports_Manfalut"]
+    assert [hit["doc_id"] for hit in with_diacritics] == ["reports_Manfalut"]
+    assert [hit["doc_id"] for hit in alef_variant] == ["reports_Manfalut"]
+    assert plain[0]["file_path"] == "Reports/تقرير منفلوط.pdf"
+
+
+def test_index_is_incremental(search_index, sample_kb):
+    """Test that unchanged documents are skipped and changed ones replace old chunks."""
+    assert search_index.index_documents(sample_kb) == 2
+    assert search_index.index_documents(sample_kb) == 0
+
+    sample_kb["proposals_Ras ElHekma"]["segments"]["Methodology"] = "Rational method runoff."
+
+    assert search_index.index_documents(sample_kb) == 1
+    assert search_index.search("IDF curves") == []
+    assert search_index.search("rational method")[0]["doc_id"] == "proposals_Ras ElHekma"
+
+
+def test_sync_removes_deleted_documents(search_index, sample_kb):
+    """Test that syncing drops documents no longer in the knowledge base."""
+    search_index.index_documents(sample_kb)
+    del sample_kb["reports_Manfalut"]
+
+    assert search_index.sync(sample_kb) == (0, 1)
+    assert search_index.search("السيول") == []
+
+
+def test_search_treats_query_operators_as_text(search_index, sample_kb):
+    """Test that FTS syntax characters in user queries do not raise."""
+    search_index.index_documents(sample_kb)
+
+    assert search_index.search('IDF* "curves(') != []
+    assert search_index.search("***") == []
+
+
+def test_search_knowledge_base_api(temp_dir, sample_kb):
+    """Test the module-level search helper."""
+    index_path = os.path.join(temp_dir, "search.db")
+    index = doc_pipeline.SearchIndex(index_path)
+    index.index_documents(sample_kb)
+    index.close()
+
+    results = doc_pipeline.search_knowledge_base("coastal road", index_path=index_path)
+
+    assert results[0]["location"] == "Section: Introduction"
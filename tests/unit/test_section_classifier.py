@@ -0,0 +1,73 @@
+"""Unit tests for the shared section-header classifier."""
+
+import os
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import doc_pipeline
+from benchmarks import section_classifier as classifier_benchmark
+from src.ingestion.section_classifier import SectionClassifier, classify_section_type
+
+
+# Tests for section types
+@pytest.mark.parametrize(
+    "title, expected",
+    [
+        ("Technical Approach and Methodology", "methodology"),
+        ("Bill of Quantities", "boq"),
+        ("ملخص تنفيذي", "executive_summary"),
+        ("جدول الكميات", "boq"),
+        ("Project Team Costs", "team_composition"),
+        ("Site Photographs", "other"),
+        ("", "other"),
+    ],
+)
+def test_classify_section_type(title, expected):
+    """Titles map to the first matching section type, bilingually."""
+    assert classify_section_type(title) == expected
+
+
+# Tests for header detection
+def test_header_patterns_keep_their_flags():
+    """Case-insensitive and case-sensitive patterns combine without changing meaning."""
+    classifier = SectionClassifier(
+        header_patterns=[re.compile(r"^scope$", re.IGNORECASE), re.compile(r"^\d+\.\s+[A-Z]\w+$")]
+    )
+    assert classifier.matches_header_patterns("SCOPE")
+    assert classifier.matches_header_patterns("2. Deliverables")
+    assert not classifier.matches_header_patterns("2. deliverables")
+
+
+def test_line_header_rules():
+    """All-caps, keyword and numbered lines are headers; body text is not."""
+    classifier = doc_pipeline.get_section_classifier()
+    assert classifier.is_line_header("HYDROLOGICAL ANALYSIS")
+    assert classifier.is_line_header("Methodology and approach")
+    assert classifier.is_line_header("3. Results")
+    assert not classifier.is_line_header("ABC DEF")  # Too short for an all-caps header
+    assert not classifier.is_line_header("The catchment drains to the wadi.")
+
+
+def test_pipeline_classifier_follows_config(monkeypatch):
+    """Replacing CONFIG patterns rebuilds the shared classifier."""
+    default = doc_pipeline.get_section_classifier()
+    assert doc_pipeline.get_section_classifier() is default
+
+    monkeypatch.setitem(doc_pipeline.CONFIG, "HEADER_PATTERNS", [re.compile(r"^Annex [A-Z]$")])
+    custom = doc_pipeline.get_section_classifier()
+    assert custom is not default
+    assert custom.matches_header_patterns("Annex B")
+    assert not custom.matches_header_patterns("INTRODUCTION")
+
+
+# Tests for the micro-benchmark
+def test_classifier_benchmark_reports_speed():
+    """The micro-benchmark checks agreement and reports lines/sec per operation."""
+    results = classifier_benchmark.run_classifier_benchmark(lines=2000, repeat=1)
+    assert set(results["operations"]) == {"line_header", "header_patterns", "section_type"}
+    for row in results["operations"].values():
+        assert row["compiled_lines_per_sec"] > 0